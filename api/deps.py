@@ -5,17 +5,30 @@ All data-fetching logic lives here — the trading_engine library stays loader-a
 """
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from datetime import date
+from functools import lru_cache
 from typing import Annotated
 
 from fastapi import Depends, HTTPException
 
+from trading_engine.data.async_loader import load_many
+from trading_engine.data.cache import CachedLoader
+from trading_engine.data.chunked import ChunkedLoader
+from trading_engine.data.parquet_loader import ParquetLoader
+from trading_engine.data.single_flight import SingleFlight
+from trading_engine.data.vnstock_loader import LatencyTracker, VNStockLoader
 from trading_engine.data.yfinance_loader import YFinanceLoader
+from trading_engine.factors.cache import CachedFactor, FactorCache
 from trading_engine.factors.moving_average import MovingAverageRatio
 from trading_engine.strategy.buy_and_hold import BuyAndHold
 from trading_engine.strategy.factor_threshold import FactorThresholdStrategy
 from trading_engine.types import DataLoadError, DataLoader, Portfolio, PriceFrame, Strategy, StrategySlot
 
+from api.price_cache import PriceFrameCache
 from api.schemas.backtest import (
     BuyAndHoldConfig,
     PriceVsMAConfig,
@@ -24,12 +37,58 @@ from api.schemas.backtest import (
 
 
 def get_loader(source: str) -> DataLoader:
-    """Return the appropriate DataLoader for the requested source."""
+    """Return the appropriate DataLoader for the requested source.
+
+    When FETCH_CHUNK_YEARS is set, long ranges are fetched as parallel
+    year-sized chunks.  When PRICE_CACHE_DIR is set, the loader is wrapped in
+    a CachedLoader so repeat requests only fetch the bars missing from the
+    on-disk store (including chunks that failed on an earlier request).
+    """
+    loader = _build_loader(source)
+    if isinstance(loader, ParquetLoader):
+        return loader  # local files: nothing to chunk or cache
+    chunk_years = os.environ.get("FETCH_CHUNK_YEARS")
+    if chunk_years:
+        loader = ChunkedLoader(loader, chunk_years=int(chunk_years))
+    cache_dir = os.environ.get("PRICE_CACHE_DIR")
+    if cache_dir:
+        return CachedLoader(loader, cache_dir, namespace=source)
+    return loader
+
+
+# Opt-in hedging for vnstock: fire the fallback source once the primary has
+# been silent this many seconds (unset = sequential primary-then-fallback).
+VNSTOCK_HEDGE_AFTER_SECONDS = os.environ.get("VNSTOCK_HEDGE_AFTER_SECONDS")
+
+# Per-source vnstock latency, shared by every request's loader and reported
+# by GET /health.
+vnstock_latency = LatencyTracker()
+
+# Root of the local Parquet data lake (the nightly export) for source="parquet".
+PARQUET_DIR = os.environ.get("PARQUET_DIR")
+
+
+@lru_cache(maxsize=None)
+def _parquet_loader(path: str) -> ParquetLoader:
+    """One loader per lake, so dataset discovery and the catalog are reused
+    until the next export rewrites the catalog."""
+    return ParquetLoader(path)
+
+
+def _build_loader(source: str) -> DataLoader:
     if source == "yfinance":
         return YFinanceLoader()
     if source == "vnstock":
-        from trading_engine.data.vnstock_loader import VnStockLoader
-        return VnStockLoader()
+        return VNStockLoader(
+            hedge_after=float(VNSTOCK_HEDGE_AFTER_SECONDS) if VNSTOCK_HEDGE_AFTER_SECONDS else None,
+            latency=vnstock_latency,
+        )
+    if source == "parquet":
+        if not PARQUET_DIR:
+            raise HTTPException(
+                status_code=400, detail="Parquet source is not configured (set PARQUET_DIR)"
+            )
+        return _parquet_loader(PARQUET_DIR)
     raise HTTPException(status_code=400, detail=f"Unsupported data source: {source!r}")
 
 
@@ -43,7 +102,7 @@ def build_strategy(config: StrategyConfig) -> Strategy:
             length=config.ma_length,
         )
         return FactorThresholdStrategy(
-            factor=factor,
+            factor=CachedFactor(factor, factor_cache),
             threshold=0.0,
             buy_lag=config.buy_lag,
             sell_lag=config.sell_lag,
@@ -64,22 +123,110 @@ def build_portfolio(
     )
 
 
+# Concurrency cap and per-symbol timeout for multi-symbol fetches.
+FETCH_MAX_CONCURRENCY = int(os.environ.get("FETCH_MAX_CONCURRENCY", "8"))
+FETCH_TIMEOUT_SECONDS = float(os.environ.get("FETCH_TIMEOUT_SECONDS", "60"))
+
+# Process-wide PriceFrame cache shared by all requests (0 MB disables it).
+PRICE_MEMORY_CACHE_MB = int(os.environ.get("PRICE_MEMORY_CACHE_MB", "256"))
+price_cache = PriceFrameCache(max_bytes=PRICE_MEMORY_CACHE_MB * 1024 * 1024)
+
+# Process-wide factor results shared by strategies and /factors endpoints,
+# keyed by factor parameters + bar content (0 MB disables it).
+FACTOR_MEMORY_CACHE_MB = int(os.environ.get("FACTOR_MEMORY_CACHE_MB", "128"))
+factor_cache = FactorCache(max_bytes=FACTOR_MEMORY_CACHE_MB * 1024 * 1024)
+
+# In-flight loads keyed by (source, symbol, start, end), shared by all requests.
+inflight: SingleFlight[PriceFrame] = SingleFlight()
+
+
 def fetch_prices(
     symbols: list[str],
     start: date,
     end: date,
     source: str,
+    max_concurrency: int | None = None,
+    timeout: float | None = None,
 ) -> dict[str, PriceFrame]:
-    """Fetch price data for all symbols. Raises 422 on partial or total failure."""
-    loader = get_loader(source)
-    prices: dict[str, PriceFrame] = {}
-    errors: list[str] = []
-
+    """Fetch price data for all symbols. Raises 422 on partial or total failure.
+
+    Symbols already in price_cache are served from memory, and symbols that
+    another request is already loading wait for that load instead of issuing
+    their own.  The rest are loaded concurrently (at most max_concurrency in
+    flight, each bounded by timeout seconds).  A failed or timed-out symbol
+    is reported the same way as a DataLoadError.
+    """
+    cached: dict[str, PriceFrame] = {}
+    failures: dict[str, DataLoadError] = {}
+    missing: list[str] = []
     for symbol in symbols:
         try:
-            prices[symbol] = loader.load(symbol, start, end)
+            pf = price_cache.get(source, symbol, start, end)
         except DataLoadError as e:
-            errors.append(f"{symbol}: {e}")
+            failures[symbol] = e
+            continue
+        if pf is None:
+            missing.append(symbol)
+        else:
+            cached[symbol] = pf
+
+    # Coalesce with identical loads already in flight: the first request for
+    # a key leads (fetches), later ones follow (wait for the leader's result).
+    leading: dict[str, Future[PriceFrame]] = {}
+    following: dict[str, Future[PriceFrame]] = {}
+    for symbol in missing:
+        future, is_leader = inflight.claim((source, symbol, start, end))
+        (leading if is_leader else following)[symbol] = future
+
+    loaded: dict[str, PriceFrame] = {}
+    try:
+        if leading:
+            loader = get_loader(source)
+            loaded, load_failures = asyncio.run(load_many(
+                loader,
+                list(leading),
+                start,
+                end,
+                max_concurrency=max_concurrency or FETCH_MAX_CONCURRENCY,
+                timeout=timeout or FETCH_TIMEOUT_SECONDS,
+            ))
+            for symbol, pf in loaded.items():
+                price_cache.put(source, symbol, start, end, pf)
+                leading[symbol].set_result(pf)
+            for symbol, e in load_failures.items():
+                price_cache.put_error(source, symbol, start, end, e)
+                leading[symbol].set_exception(e)
+            failures.update(load_failures)
+    except BaseException as e:
+        for future in leading.values():
+            if not future.done():
+                future.set_exception(e)
+        raise
+    finally:
+        # Followers must never wait on a future that will not be resolved.
+        for symbol, future in leading.items():
+            if not future.done():
+                future.set_exception(DataLoadError(f"No result for {symbol}"))
+            inflight.release((source, symbol, start, end))
+
+    for symbol, future in following.items():
+        try:
+            loaded[symbol] = future.result(timeout=timeout or FETCH_TIMEOUT_SECONDS)
+        except DataLoadError as e:
+            failures[symbol] = e
+        except FutureTimeoutError:
+            failures[symbol] = DataLoadError(f"Timed out waiting for in-flight load of {symbol}")
+
+    # PriceFrame defines __len__, so `cached.get(symbol) or ...` would
+    # treat an empty frame as a miss.
+    prices: dict[str, PriceFrame] = {}
+    for symbol in symbols:
+        pf = cached.get(symbol)
+        if pf is None:
+            pf = loaded.get(symbol)
+        if pf is not None:
+            prices[symbol] = pf
+    errors = [f"{symbol}: {e}" for symbol, e in failures.items()]
 
     if errors and not prices:
         raise HTTPException(
@@ -88,7 +235,6 @@ def fetch_prices(
         )
     if errors:
         # Partial success — still proceed, surface warnings in logs
-        import logging
         logging.getLogger(__name__).warning("Partial load failures: %s", errors)
 
     return prices
@@ -11,6 +11,7 @@ from __future__ import annotations
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from api.deps import vnstock_latency
 from api.routes import backtest, events, factors, fundamentals, sweep
 
 app = FastAPI(
@@ -35,4 +36,5 @@ app.include_router(fundamentals.router)
 
 @app.get("/health")
 def health() -> dict:
-    return {"status": "ok"}
+    """Liveness, plus per-source vnstock latency (count, errors, p50/p95/p99)."""
+    return {"status": "ok", "vnstock_latency": vnstock_latency.summary()}
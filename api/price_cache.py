@@ -0,0 +1,151 @@
+"""In-process PriceFrame cache shared by every API request.
+
+Clicking through the tabs for one ticker fires /backtest/analyze,
+/factors/rarity and /events/new-low-episodes back to back; this cache lets
+them share one loaded PriceFrame instead of downloading it three times.
+
+- Keyed by (source, symbol); any sub-range of a cached range is served as a
+  slice of the cached frame without another fetch.
+- Bounded by total bytes with LRU eviction.
+- Entries whose range reaches today expire after a short TTL, since today's
+  bar is still moving.
+- Symbols that just failed with DataLoadError are remembered briefly so a
+  bad ticker is not re-fetched on every click.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Callable
+
+from trading_engine.types import DataLoadError, PriceFrame
+
+
+@dataclass
+class _Entry:
+    start: date
+    end: date
+    frame: PriceFrame
+    nbytes: int
+    expires_at: float | None   # None = never (range ends before today)
+
+
+class PriceFrameCache:
+    """Thread-safe LRU cache of PriceFrames with range subsumption.
+
+    Args:
+        max_bytes: Upper bound on the summed size of cached frames.
+        today_ttl: Seconds an entry covering today stays valid.
+        negative_ttl: Seconds a DataLoadError is remembered for.
+        max_errors: Upper bound on remembered failures; the oldest go first.
+        clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        today_ttl: float = 300.0,
+        negative_ttl: float = 60.0,
+        max_errors: int = 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.today_ttl = today_ttl
+        self.negative_ttl = negative_ttl
+        self.max_errors = max_errors
+        self._clock = clock
+        self._entries: OrderedDict[tuple[str, str], _Entry] = OrderedDict()
+        # Insertion-ordered, and every entry has the same TTL, so the first
+        # entry is always the next to expire.
+        self._errors: OrderedDict[tuple[str, str, date, date], tuple[float, DataLoadError]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def get(self, source: str, symbol: str, start: date, end: date) -> PriceFrame | None:
+        """Return the cached frame for [start, end], or None on a miss.
+
+        Raises:
+            DataLoadError: If this exact request failed within negative_ttl.
+        """
+        now = self._clock()
+        with self._lock:
+            failed = self._errors.get((source, symbol, start, end))
+            if failed is not None:
+                if failed[0] > now:
+                    raise failed[1]
+                del self._errors[(source, symbol, start, end)]
+
+            key = (source, symbol)
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at <= now:
+                self._drop(key)
+                return None
+            if not (entry.start <= start and end <= entry.end):
+                return None
+            self._entries.move_to_end(key)
+
+        pf = entry.frame
+        if (start, end) == (entry.start, entry.end):
+            return pf
+        sliced = pf.slice(start, end)
+        return sliced if len(sliced) else None
+
+    def put(self, source: str, symbol: str, start: date, end: date, frame: PriceFrame) -> None:
+        """Cache frame as the answer for [start, end].
+
+        An existing entry is only replaced when the new range is not already
+        subsumed by it, so a narrow fetch never evicts a wide one.
+        """
+        nbytes = int(frame.data.memory_usage(index=True, deep=False).sum())
+        if nbytes > self.max_bytes:
+            return
+        expires_at = self._clock() + self.today_ttl if end >= date.today() else None
+
+        key = (source, symbol)
+        with self._lock:
+            self._errors.pop((source, symbol, start, end), None)
+            existing = self._entries.get(key)
+            if existing is not None:
+                if existing.start <= start and end <= existing.end:
+                    return
+                self._drop(key)
+            self._entries[key] = _Entry(start, end, frame, nbytes, expires_at)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def put_error(self, source: str, symbol: str, start: date, end: date, error: DataLoadError) -> None:
+        """Remember a failed load for negative_ttl seconds.
+
+        Expired failures are pruned here rather than only on a matching get(),
+        so a stream of distinct bad requests cannot grow the map unbounded.
+        """
+        now = self._clock()
+        key = (source, symbol, start, end)
+        with self._lock:
+            self._errors.pop(key, None)
+            self._errors[key] = (now + self.negative_ttl, error)
+            while self._errors:
+                oldest = next(iter(self._errors.values()))
+                if oldest[0] > now and len(self._errors) <= self.max_errors:
+                    break
+                self._errors.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._errors.clear()
+            self._bytes = 0
+
+    def _drop(self, key: tuple[str, str]) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.nbytes
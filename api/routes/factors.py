@@ -3,6 +3,10 @@
 POST /factors/analyze   — time-series percentile breakdown for one symbol
 POST /factors/universe  — cross-sectional breadth across N symbols
 POST /factors/regime    — regime labels derived from cross-sectional breadth
+POST /factors/rarity    — zone rarity analysis for one symbol
+
+Every endpoint also accepts factor_type="expression" with a custom factor
+expression, e.g. "zscore(close, 20)" (see trading_engine.factors.expression).
 """
 from __future__ import annotations
 
@@ -15,9 +19,11 @@ from trading_engine.factors.distance_from_peak import DistanceFromPeak
 from trading_engine.factors.donchian import DonchianChannel
 from trading_engine.factors.moving_average import DistanceFromMovingAverage, MovingAverageRatio
 from trading_engine.factors.ahr999 import AHR999
+from trading_engine.factors.cache import CachedFactor
+from trading_engine.factors.expression import ExpressionFactor
 from trading_engine.types import Factor
 
-from api.deps import fetch_prices
+from api.deps import factor_cache, fetch_prices
 import pandas as pd
 
 from api.schemas.factor import (
@@ -38,7 +44,13 @@ from api.utils import date_key
 router = APIRouter(prefix="/factors", tags=["factors"])
 
 
-def _build_factor(factor_type: str, period: int, ma_type: str, std_dev: float = 2.0) -> Factor:
+def _build_factor(
+    factor_type: str,
+    period: int,
+    ma_type: str,
+    std_dev: float = 2.0,
+    expression: str | None = None,
+) -> Factor:
     if factor_type == "moving_average":
         return MovingAverageRatio(ma_type=ma_type.upper(), length=period)
     if factor_type == "distance_from_ma":
@@ -51,6 +63,15 @@ def _build_factor(factor_type: str, period: int, ma_type: str, std_dev: float =
         return DistanceFromPeak(window=period)
     if factor_type == "ahr999":
         return AHR999()
+    if factor_type == "expression":
+        if not expression:
+            raise HTTPException(
+                status_code=400, detail="factor_type 'expression' requires an expression"
+            )
+        try:
+            return ExpressionFactor(expression)
+        except FactorComputeError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
     raise HTTPException(status_code=400, detail=f"Unknown factor type: {factor_type!r}")
 
 
@@ -66,7 +87,12 @@ def analyze_factor_endpoint(req: FactorRequest) -> FactorAnalysisResponse:
         raise HTTPException(status_code=422, detail=f"No data for symbol {req.symbol!r}")
 
     try:
-        factor = _build_factor(req.factor_type, req.period, req.ma_type, req.std_dev)
+        factor = CachedFactor(
+            _build_factor(
+                req.factor_type, req.period, req.ma_type, req.std_dev, req.expression
+            ),
+            factor_cache,
+        )
         factor_series = factor.compute(prices[req.symbol])
         result = analyze_factor(factor_series)
     except (FactorComputeError, InsufficientDataError) as exc:
@@ -90,7 +116,12 @@ def analyze_universe_endpoint(req: CrossSectionalRequest) -> CrossSectionalRespo
         req.data_source,
     )
     try:
-        factor = _build_factor(req.factor_type, req.period, req.ma_type)
+        factor = CachedFactor(
+            _build_factor(
+                req.factor_type, req.period, req.ma_type, expression=req.expression
+            ),
+            factor_cache,
+        )
         result = analyze_universe(
             factor=factor,
             universe=req.symbols,
@@ -118,7 +149,12 @@ def detect_regime_endpoint(req: RegimeRequest) -> RegimeResponse:
         req.data_source,
     )
     try:
-        factor = _build_factor(req.factor_type, req.period, req.ma_type)
+        factor = CachedFactor(
+            _build_factor(
+                req.factor_type, req.period, req.ma_type, expression=req.expression
+            ),
+            factor_cache,
+        )
         cross = analyze_universe(
             factor=factor,
             universe=req.symbols,
@@ -150,7 +186,12 @@ def rarity_analysis_endpoint(req: RarityRequest) -> RarityAnalysisResponse:
         raise HTTPException(status_code=422, detail=f"No data for symbol {req.symbol!r}")
 
     try:
-        factor = _build_factor(req.factor_type, req.period, req.ma_type, req.std_dev)
+        factor = CachedFactor(
+            _build_factor(
+                req.factor_type, req.period, req.ma_type, req.std_dev, req.expression
+            ),
+            factor_cache,
+        )
         series = factor.compute(prices[req.symbol])
         result = zone_rarity_analysis(
             series=series,
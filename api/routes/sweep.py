@@ -4,9 +4,11 @@ from __future__ import annotations
 from fastapi import APIRouter
 
 from trading_engine import run_comparison
-from trading_engine.types import BacktestConfig
+from trading_engine.factors.bank import FactorBank
+from trading_engine.factors.cache import CachedFactor, factor_key
+from trading_engine.types import BacktestConfig, PriceFrame
 
-from api.deps import build_strategy, fetch_prices
+from api.deps import build_strategy, factor_cache, fetch_prices
 from api.schemas.backtest import SweepErrorItem, SweepRequest, SweepResponse, SweepResultItem
 from api.utils import date_key
 
@@ -32,6 +34,7 @@ def run_sweep(req: SweepRequest) -> SweepResponse:
         for s in req.strategies
     ]
 
+    _prime_factor_cache(configs, prices)
     report = run_comparison(configs=configs, prices=prices, max_workers=req.max_workers)
 
     results = []
@@ -59,3 +62,34 @@ def run_sweep(req: SweepRequest) -> SweepResponse:
     ]
 
     return SweepResponse(results=results, errors=errors)
+
+
+def _prime_factor_cache(configs: list[BacktestConfig], prices: dict[str, PriceFrame]) -> None:
+    """Compute each factor family of the sweep as one bank per symbol.
+
+    The strategies' CachedFactors then find their columns in factor_cache
+    instead of computing one parameter set at a time.
+    """
+    families: dict[type, dict] = {}
+    for config in configs:
+        factor = getattr(config.strategy, "factor", None)
+        if not isinstance(factor, CachedFactor):
+            continue
+        try:
+            key = factor_key(factor.factor)
+        except TypeError:
+            continue
+        families.setdefault(type(factor.factor), {})[key] = factor.factor
+
+    # Every sweep config covers the same symbols and date range.
+    first = configs[0]
+    for factors in families.values():
+        if len(factors) < 2:
+            continue  # nothing to share
+        for symbol in first.symbols:
+            if symbol not in prices:
+                continue
+            # The exact bars run_comparison will slice, so fingerprints match.
+            frame = prices[symbol].slice(first.start, first.end)
+            if len(frame):
+                FactorBank(list(factors.values()), frame).publish(factor_cache)
@@ -44,7 +44,7 @@ class BacktestRequest(BaseModel):
     strategy: StrategyConfig
     initial_capital: float = 10_000.0
     max_leverage: float = 1.0
-    data_source: Literal["yfinance", "vnstock", "csv"] = "yfinance"
+    data_source: Literal["yfinance", "vnstock", "csv", "parquet"] = "yfinance"
 
     @model_validator(mode="after")
     def check_symbols_non_empty(self) -> "BacktestRequest":
@@ -75,7 +75,7 @@ class SweepRequest(BaseModel):
     strategies: list[StrategyConfig]
     initial_capital: float = 10_000.0
     max_leverage: float = 1.0
-    data_source: Literal["yfinance", "vnstock", "csv"] = "yfinance"
+    data_source: Literal["yfinance", "vnstock", "csv", "parquet"] = "yfinance"
     max_workers: int = 4
 
     @model_validator(mode="after")
@@ -111,7 +111,7 @@ class AnalyzeRequest(BaseModel):
     symbol: str
     strategy: StrategyConfig
     initial_capital: float = 10_000.0
-    data_source: Literal["yfinance", "vnstock", "csv"] = "yfinance"
+    data_source: Literal["yfinance", "vnstock", "csv", "parquet"] = "yfinance"
     start: date | None = None   # defaults to 2000-01-01 in the route
     end: date | None = None     # defaults to today in the route
 
@@ -12,7 +12,7 @@ from api.schemas.common import DateRange
 class NewLowEpisodesRequest(BaseModel):
     symbols: list[str] = Field(min_length=1)
     date_range: DateRange
-    data_source: Literal["yfinance", "vnstock", "csv"] = "yfinance"
+    data_source: Literal["yfinance", "vnstock", "csv", "parquet"] = "yfinance"
     quick_recovery_sessions: int = Field(default=2, ge=0)
     forward_horizons: list[int] = Field(default_factory=lambda: [5, 10, 20, 50, 100, 150, 200])
     lookback_sessions: int = Field(default=50, ge=2)
@@ -15,6 +15,7 @@ CommonFactorType: TypeAlias = Literal[
     "bollinger",
     "donchian",
     "distance_from_peak",
+    "expression",
 ]
 RarityFactorType: TypeAlias = Literal[
     "moving_average",
@@ -23,6 +24,7 @@ RarityFactorType: TypeAlias = Literal[
     "donchian",
     "distance_from_peak",
     "ahr999",
+    "expression",
 ]
 
 
@@ -35,7 +37,9 @@ class FactorRequest(BaseModel):
     ma_type: Literal["sma", "ema", "wma"] = "sma"
     # Bollinger-specific
     std_dev: float = 2.0
-    data_source: Literal["yfinance", "vnstock", "csv"] = "yfinance"
+    # factor_type="expression", e.g. "close / sma(close, 50) - 1"
+    expression: str | None = None
+    data_source: Literal["yfinance", "vnstock", "csv", "parquet"] = "yfinance"
 
 
 class FactorAnalysisResponse(BaseModel):
@@ -52,8 +56,9 @@ class CrossSectionalRequest(BaseModel):
     factor_type: CommonFactorType
     period: int = 20
     ma_type: Literal["sma", "ema", "wma"] = "sma"
+    expression: str | None = None
     threshold: float = 0.0
-    data_source: Literal["yfinance", "vnstock", "csv"] = "yfinance"
+    data_source: Literal["yfinance", "vnstock", "csv", "parquet"] = "yfinance"
 
 
 class CrossSectionalResponse(BaseModel):
@@ -70,10 +75,11 @@ class RegimeRequest(BaseModel):
     factor_type: CommonFactorType
     period: int = 20
     ma_type: Literal["sma", "ema", "wma"] = "sma"
+    expression: str | None = None
     threshold: float = 0.0
     lower_threshold: float = 0.4
     upper_threshold: float = 0.6
-    data_source: Literal["yfinance", "vnstock", "csv"] = "yfinance"
+    data_source: Literal["yfinance", "vnstock", "csv", "parquet"] = "yfinance"
 
 
 class RegimeResponse(BaseModel):
@@ -90,7 +96,8 @@ class RarityRequest(BaseModel):
     period: int = 200
     ma_type: Literal["sma", "ema", "wma"] = "sma"
     std_dev: float = 2.0
-    data_source: Literal["yfinance", "vnstock", "csv"] = "yfinance"
+    expression: str | None = None
+    data_source: Literal["yfinance", "vnstock", "csv", "parquet"] = "yfinance"
     zones: list[int] = DEFAULT_RARITY_ZONES
     quick_recovery_days: int = DEFAULT_QR_DAYS
     recovery_mode: Literal["price", "factor"] = "price"
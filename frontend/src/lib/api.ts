@@ -35,7 +35,7 @@ function errorMessage(err: unknown, status: number): string {
 
 export type FactorType = "distance_from_peak" | "distance_from_ma" | "moving_average" | "bollinger" | "donchian" | "ahr999"
 export type MaType = "sma" | "ema" | "wma"
-export type DataSource = "yfinance" | "vnstock" | "csv"
+export type DataSource = "yfinance" | "vnstock" | "csv" | "parquet"
 export type RarityRecoveryMode = "price" | "factor"
 
 // ── Rarity Analysis ──────────────────────────────────────────────────────────
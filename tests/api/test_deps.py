@@ -0,0 +1,119 @@
+"""Tests for api/deps.py fetch_prices: memory cache and request coalescing."""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+import api.deps as deps
+import api.main as main
+from api.price_cache import PriceFrameCache
+from trading_engine.data import SingleFlight
+from trading_engine.data.vnstock_loader import LatencyTracker
+from trading_engine.types import DataLoadError
+
+from tests.api.test_price_cache import _frame
+
+
+@pytest.fixture
+def fresh_state(monkeypatch):
+    monkeypatch.setattr(deps, "price_cache", PriceFrameCache())
+    monkeypatch.setattr(deps, "inflight", SingleFlight())
+
+
+class TestFetchPricesUsesCache:
+    def test_repeat_request_does_not_refetch(self, monkeypatch, fresh_state):
+        calls: list[str] = []
+
+        class _Loader:
+            def load(self, symbol, start, end):
+                calls.append(symbol)
+                if symbol == "BAD":
+                    raise DataLoadError("unknown symbol")
+                return _frame(symbol)
+
+        monkeypatch.setattr(deps, "_build_loader", lambda source: _Loader())
+
+        first = deps.fetch_prices(["AAA", "BAD"], date(2020, 1, 1), date(2020, 4, 9), "yfinance")
+        second = deps.fetch_prices(["AAA", "BAD"], date(2020, 2, 1), date(2020, 3, 1), "yfinance")
+
+        assert sorted(calls) == ["AAA", "BAD", "BAD"]  # BAD range differs, so not negative-cached
+        assert list(first) == ["AAA"]
+        assert second["AAA"].data.index[0] == pd.Timestamp("2020-02-01")
+
+
+class TestFetchPricesCoalescing:
+    def test_concurrent_identical_requests_share_one_load(self, monkeypatch, fresh_state):
+        # Disable the memory cache so only coalescing can dedupe the loads.
+        monkeypatch.setattr(deps, "price_cache", PriceFrameCache(max_bytes=0))
+        calls: list[str] = []
+        gate = threading.Event()
+
+        class _Loader:
+            def load(self, symbol, start, end):
+                calls.append(symbol)
+                gate.wait(timeout=5)
+                return _frame(symbol)
+
+        monkeypatch.setattr(deps, "_build_loader", lambda source: _Loader())
+
+        results = []
+
+        def _request():
+            results.append(deps.fetch_prices(["SPY"], date(2020, 1, 1), date(2020, 4, 9), "yfinance"))
+
+        threads = [threading.Thread(target=_request) for _ in range(10)]
+        for t in threads:
+            t.start()
+        time.sleep(0.2)
+        gate.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert calls == ["SPY"]
+        assert len(results) == 10
+        assert all(r["SPY"] is results[0]["SPY"] for r in results)
+
+    def test_followers_see_leader_failure(self, monkeypatch, fresh_state):
+        gate = threading.Event()
+
+        class _Loader:
+            def load(self, symbol, start, end):
+                gate.wait(timeout=5)
+                raise DataLoadError("vendor down")
+
+        monkeypatch.setattr(deps, "_build_loader", lambda source: _Loader())
+        outcomes = []
+
+        def _request():
+            try:
+                deps.fetch_prices(["SPY"], date(2020, 1, 1), date(2020, 4, 9), "yfinance")
+            except Exception as e:  # HTTPException 422
+                outcomes.append(getattr(e, "status_code", None))
+
+        threads = [threading.Thread(target=_request) for _ in range(3)]
+        for t in threads:
+            t.start()
+        time.sleep(0.2)
+        gate.set()
+        for t in threads:
+            t.join(timeout=5)
+
+        assert outcomes == [422, 422, 422]
+
+
+class TestHealth:
+    def test_reports_vnstock_latency(self, monkeypatch):
+        tracker = LatencyTracker()
+        monkeypatch.setattr(main, "vnstock_latency", tracker)
+        assert main.health() == {"status": "ok", "vnstock_latency": {}}
+
+        tracker.record("KBS", 0.5, ok=True)
+        tracker.record("KBS", 1.5, ok=False)
+        latency = main.health()["vnstock_latency"]
+        assert latency["KBS"]["count"] == 2
+        assert latency["KBS"]["errors"] == 1
+        assert latency["KBS"]["p50"] == pytest.approx(1.0)
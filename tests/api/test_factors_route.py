@@ -11,6 +11,7 @@ from trading_engine.factors import (
     DistanceFromMovingAverage,
     DonchianChannel,
     DistanceFromPeak,
+    ExpressionFactor,
     MovingAverageRatio,
 )
 
@@ -27,6 +28,20 @@ class TestBuildFactor:
         assert isinstance(_build_factor("donchian", 20, "sma"), DonchianChannel)
         assert isinstance(_build_factor("distance_from_peak", 200, "sma"), DistanceFromPeak)
 
+    def test_expression_factor(self):
+        factor = _build_factor("expression", 20, "sma", expression="zscore(close, 20)")
+        assert isinstance(factor, ExpressionFactor)
+        assert factor.name == "(close - sma(close, 20)) / std(close, 20)"
+
+    def test_expression_errors_are_400(self):
+        from fastapi import HTTPException
+        with pytest.raises(HTTPException) as missing:
+            _build_factor("expression", 20, "sma")
+        assert missing.value.status_code == 400
+        with pytest.raises(HTTPException, match="Unknown function") as invalid:
+            _build_factor("expression", 20, "sma", expression="eval('1')")
+        assert invalid.value.status_code == 400
+
     def test_unknown_factor_still_rejected(self):
         from fastapi import HTTPException
         with pytest.raises(HTTPException):
@@ -58,3 +73,12 @@ class TestRarityRequestSchema:
             ma_type="sma",
         )
         assert req.factor_type == "distance_from_ma"
+
+    def test_accepts_expression(self):
+        req = RarityRequest(
+            symbol="MSFT",
+            date_range={"start": "2000-01-01", "end": "2024-01-01"},
+            factor_type="expression",
+            expression="close / ema(close, 100) - 1",
+        )
+        assert req.expression == "close / ema(close, 100) - 1"
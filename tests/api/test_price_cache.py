@@ -0,0 +1,91 @@
+"""Tests for api/price_cache.py."""
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from api.price_cache import PriceFrameCache
+from trading_engine.types import DataLoadError, PriceFrame
+
+
+def _frame(symbol: str = "AAA", start: str = "2020-01-01", days: int = 100) -> PriceFrame:
+    idx = pd.date_range(start, periods=days, freq="D", name="date")
+    close = [float(i) for i in range(days)]
+    df = pd.DataFrame(
+        {"open": close, "high": close, "low": close, "close": close},
+        index=idx,
+    )
+    return PriceFrame(symbol=symbol, data=df, source="fake")
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestPriceFrameCache:
+    def test_sub_range_served_from_wider_entry(self):
+        cache = PriceFrameCache()
+        cache.put("yf", "AAA", date(2020, 1, 1), date(2020, 4, 9), _frame())
+        pf = cache.get("yf", "AAA", date(2020, 2, 1), date(2020, 2, 10))
+        assert pf is not None
+        assert pf.data.index[0] == pd.Timestamp("2020-02-01")
+        assert len(pf.data) == 10
+
+    def test_wider_range_is_a_miss(self):
+        cache = PriceFrameCache()
+        cache.put("yf", "AAA", date(2020, 2, 1), date(2020, 3, 1), _frame())
+        assert cache.get("yf", "AAA", date(2020, 1, 1), date(2020, 3, 1)) is None
+
+    def test_lru_eviction_respects_byte_bound(self):
+        one = _frame().data.memory_usage(index=True).sum()
+        cache = PriceFrameCache(max_bytes=int(one * 2.5))
+        for sym in ("A", "B"):
+            cache.put("yf", sym, date(2020, 1, 1), date(2020, 4, 9), _frame(sym))
+        cache.get("yf", "A", date(2020, 1, 1), date(2020, 4, 9))  # A is now most recent
+        cache.put("yf", "C", date(2020, 1, 1), date(2020, 4, 9), _frame("C"))
+
+        assert cache.get("yf", "B", date(2020, 1, 1), date(2020, 4, 9)) is None
+        assert cache.get("yf", "A", date(2020, 1, 1), date(2020, 4, 9)) is not None
+        assert cache.nbytes <= cache.max_bytes
+
+    def test_today_entries_expire_after_ttl(self):
+        clock = _Clock()
+        cache = PriceFrameCache(today_ttl=10, clock=clock)
+        today = date.today()
+        start = today - timedelta(days=99)
+        cache.put("yf", "AAA", start, today, _frame(start=str(start)))
+        assert cache.get("yf", "AAA", start, today) is not None
+        clock.now = 11
+        assert cache.get("yf", "AAA", start, today) is None
+
+    def test_negative_caching(self):
+        clock = _Clock()
+        cache = PriceFrameCache(negative_ttl=5, clock=clock)
+        cache.put_error("yf", "BAD", date(2020, 1, 1), date(2020, 2, 1), DataLoadError("nope"))
+        with pytest.raises(DataLoadError, match="nope"):
+            cache.get("yf", "BAD", date(2020, 1, 1), date(2020, 2, 1))
+        clock.now = 6
+        assert cache.get("yf", "BAD", date(2020, 1, 1), date(2020, 2, 1)) is None
+
+    def test_expired_failures_are_pruned_on_put_error(self):
+        clock = _Clock()
+        cache = PriceFrameCache(negative_ttl=5, clock=clock)
+        for i in range(100):
+            cache.put_error("yf", f"BAD{i}", date(2020, 1, 1), date(2020, 2, 1), DataLoadError("nope"))
+        clock.now = 6
+        cache.put_error("yf", "LAST", date(2020, 1, 1), date(2020, 2, 1), DataLoadError("nope"))
+        assert list(cache._errors) == [("yf", "LAST", date(2020, 1, 1), date(2020, 2, 1))]
+
+    def test_failures_are_capped(self):
+        cache = PriceFrameCache(negative_ttl=60, max_errors=3, clock=_Clock())
+        for i in range(5):
+            cache.put_error("yf", f"BAD{i}", date(2020, 1, 1), date(2020, 2, 1), DataLoadError("nope"))
+        assert [key[1] for key in cache._errors] == ["BAD2", "BAD3", "BAD4"]
+        assert cache.get("yf", "BAD0", date(2020, 1, 1), date(2020, 2, 1)) is None
+
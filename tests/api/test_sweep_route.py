@@ -0,0 +1,42 @@
+"""Tests for api/routes/sweep.py factor-bank priming."""
+from __future__ import annotations
+
+from datetime import date
+
+from api import deps
+from api.routes.sweep import _prime_factor_cache
+from api.schemas.backtest import BuyAndHoldConfig, PriceVsMAConfig
+from trading_engine.factors import FactorCache
+from trading_engine.types import BacktestConfig
+
+from tests.trading_engine.conftest import make_price_frame
+
+
+class TestPrimeFactorCache:
+    def test_sweep_strategies_hit_banked_columns(self, monkeypatch):
+        cache = FactorCache()
+        monkeypatch.setattr(deps, "factor_cache", cache)
+        monkeypatch.setattr("api.routes.sweep.factor_cache", cache)
+
+        prices = {"SPY": make_price_frame("SPY", days=400)}
+        configs = [
+            BacktestConfig(
+                strategy=deps.build_strategy(s),
+                symbols=["SPY"],
+                start=date(2020, 1, 1),
+                end=date(2021, 3, 1),
+            )
+            for s in [
+                PriceVsMAConfig(ma_length=20),
+                PriceVsMAConfig(ma_length=50),
+                BuyAndHoldConfig(),
+            ]
+        ]
+
+        _prime_factor_cache(configs, prices)
+        assert len(cache) == 2
+
+        sliced = prices["SPY"].slice(configs[0].start, configs[0].end)
+        for config in configs[:2]:
+            config.strategy.factor.compute(sliced)
+        assert (cache.hits, cache.misses) == (2, 0)
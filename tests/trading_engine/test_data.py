@@ -6,15 +6,43 @@ Network-dependent tests (YFinance, VNStock) are marked skip by default.
 """
 from __future__ import annotations
 
+import asyncio
+import json
 import os
 import tempfile
-from datetime import date
+import threading
+import time
+from datetime import date, timedelta
 
+import numpy as np
 import pandas as pd
 import pytest
 
-from trading_engine.data import CSVLoader, YFinanceLoader
-from trading_engine.types import DataLoadError, PriceFrame
+from trading_engine.data import (
+    CachedLoader,
+    ChunkedLoader,
+    CoalescingLoader,
+    CSVLoader,
+    ParquetLoader,
+    SyntheticLoader,
+    VNStockLoader,
+    YFinanceLoader,
+    load_many,
+)
+from trading_engine.data.calendars import lunar_new_year, trading_days
+from trading_engine.data.chunked import year_chunks
+from trading_engine.factor_analysis import analyze_cross_section
+from trading_engine.factors import MovingAverageRatio
+from trading_engine.types import (
+    DataLoader,
+    DataLoadError,
+    NoDataError,
+    PartialLoadError,
+    PriceFrame,
+    PricePanel,
+)
+
+from tests.trading_engine.conftest import make_price_frame
 
 
 # =============================================================================
@@ -50,6 +78,104 @@ class TestPriceFrame:
         assert "close" in pf.data.columns
 
 
+class TestPriceFrameArrays:
+    def test_slice_returns_views(self):
+        pf = make_price_frame("SPY", days=300)
+        sliced = pf.slice(date(2020, 3, 2), date(2020, 3, 31))
+        expected = pf.data.loc["2020-03-02":"2020-03-31"]
+
+        assert len(sliced) == len(expected)
+        assert np.shares_memory(sliced.close, pf.close)
+        assert sliced.data["close"].tolist() == expected["close"].tolist()
+        assert sliced.data.index.equals(expected.index)
+
+    def test_slice_outside_range_is_empty(self):
+        pf = make_price_frame("SPY", days=50)
+        assert len(pf.slice(date(2030, 1, 1), date(2030, 2, 1))) == 0
+
+    def test_from_arrays_builds_data_lazily(self):
+        dates = np.arange(18262, 18272, dtype=np.int64)  # 2020-01-01 onwards
+        close = np.linspace(1.0, 2.0, 10)
+        pf = PriceFrame.from_arrays(
+            "AAA", dates, {"open": close, "high": close, "low": close, "close": close}, "test"
+        )
+        assert pf._data is None
+        assert pf.data.index[0] == pd.Timestamp("2020-01-01")
+        assert np.shares_memory(pf.data["close"].to_numpy(), close)
+
+    def test_fingerprint_is_content_addressed(self):
+        pf = make_price_frame("SPY", days=300)
+        rebuilt = PriceFrame.from_arrays(
+            "OTHER", pf.dates.copy(), {c: pf.column(c).copy() for c in pf.data.columns}, "csv"
+        )
+        assert rebuilt.fingerprint() == pf.fingerprint()
+        # Equal bars reached through different slices agree; different bars differ.
+        a = pf.slice(date(2020, 3, 2), date(2020, 3, 31))
+        b = pf.slice(date(2020, 2, 29), date(2020, 3, 31))
+        assert a.fingerprint() == b.fingerprint()
+        assert a.fingerprint() != pf.fingerprint()
+
+    def test_tail_is_last_bars_as_views(self):
+        pf = make_price_frame("SPY", days=300)
+        last = pf.tail(20)
+        assert len(last) == 20
+        assert last.data.index.equals(pf.data.index[-20:])
+        assert np.shares_memory(last.close, pf.close)
+        assert len(pf.tail(1000)) == 300 and len(pf.tail(0)) == 0
+
+    def test_from_arrays_missing_columns_raises(self):
+        with pytest.raises(ValueError, match="missing columns"):
+            PriceFrame.from_arrays("AAA", np.arange(3), {"close": np.ones(3)}, "test")
+
+    def test_unsorted_input_is_sorted_before_slicing(self):
+        df = make_price_frame("SPY", days=20).data.iloc[::-1]
+        pf = PriceFrame(symbol="SPY", data=df, source="test")
+        sliced = pf.slice(date(2020, 1, 6), date(2020, 1, 10))
+        assert sliced.data.index.is_monotonic_increasing
+        assert len(sliced) == 5
+
+
+# =============================================================================
+# [A2] PricePanel — aligned multi-symbol prices
+# =============================================================================
+
+class TestPricePanel:
+    def _prices(self):
+        return {
+            "AAA": make_price_frame("AAA", days=30, start="2020-01-01"),
+            "BBB": make_price_frame("BBB", days=20, start="2020-01-15", seed=7),
+        }
+
+    def test_union_calendar_and_validity(self):
+        prices = self._prices()
+        panel = PricePanel.from_frames(prices)
+        expected = prices["AAA"].data.index.union(prices["BBB"].data.index)
+
+        assert panel.index.equals(expected)
+        assert panel.values.shape == (5, len(expected), 2)
+        assert panel.valid[:, 0].sum() == 30
+        assert panel.valid[:, 1].sum() == 20
+        assert np.isnan(panel.field("close")[~panel.valid]).all()
+
+    def test_to_frame_matches_reindexed_close(self):
+        prices = self._prices()
+        panel = PricePanel.from_frames(prices, fields=("close",))
+        expected = pd.DataFrame({s: pf.data["close"] for s, pf in prices.items()})
+        pd.testing.assert_frame_equal(
+            panel.to_frame("close"), expected, check_names=False, check_freq=False
+        )
+
+    def test_rows_marks_off_calendar_dates(self):
+        panel = PricePanel.from_frames(self._prices(), fields=())
+        idx = pd.DatetimeIndex(["2020-01-01", "2020-01-04", "2020-01-06"])  # Sat in the middle
+        assert panel.rows(idx).tolist() == [0, -1, 3]
+
+    def test_missing_symbols_are_skipped(self):
+        panel = PricePanel.from_frames(self._prices(), ["AAA", "ZZZ"])
+        assert panel.symbols == ["AAA"]
+        assert "ZZZ" not in panel
+
+
 # =============================================================================
 # [B] CSV loader
 # =============================================================================
@@ -103,6 +229,373 @@ class TestCSVLoader:
                 # Date range outside the data
                 loader.load("AAPL", date(2025, 1, 1), date(2025, 12, 31))
 
+    def test_sidecar_reused_until_csv_changes(self, tmp_path, monkeypatch):
+        import trading_engine.data.csv_loader as mod
+
+        self._write_csv(str(tmp_path), "AAPL", rows=50)
+        parses = []
+        real_read_csv = pd.read_csv
+        monkeypatch.setattr(mod.pd, "read_csv", lambda *a, **k: parses.append(a) or real_read_csv(*a, **k))
+
+        CSVLoader(base_dir=tmp_path).load("AAPL", date(2020, 1, 1), date(2020, 12, 31))
+        pf = CSVLoader(base_dir=tmp_path).load("AAPL", date(2020, 1, 6), date(2020, 1, 10))
+        assert len(parses) == 1
+        assert pf.data.index[0] == pd.Timestamp("2020-01-06")
+        assert pf.data.index[-1] == pd.Timestamp("2020-01-10")
+        assert pf.data["close"].tolist() == [102.0] * 5
+
+        path = tmp_path / "data_AAPL.csv"
+        df = pd.read_csv(path)
+        df["close"] = 110.0
+        df.to_csv(path, index=False)
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+
+        pf = CSVLoader(base_dir=tmp_path).load("AAPL", date(2020, 1, 1), date(2020, 12, 31))
+        assert len(parses) == 3  # our own read_csv above + one rebuild
+        assert (pf.data["close"] == 110.0).all()
+
+    def test_manifest_picks_up_new_files(self, tmp_path):
+        self._write_csv(str(tmp_path), "AAPL")
+        loader = CSVLoader(base_dir=tmp_path)
+        loader.load("AAPL", date(2020, 1, 1), date(2020, 12, 31))
+        self._write_csv(str(tmp_path), "MSFT")
+        pf = loader.load("MSFT", date(2020, 1, 1), date(2020, 12, 31))
+        assert pf.symbol == "MSFT"
+
+    def test_manifest_picks_up_newer_and_renamed_files(self, tmp_path):
+        self._write_csv(str(tmp_path), "AAPL", rows=10)
+        loader = CSVLoader(base_dir=tmp_path)
+        assert len(loader.load("AAPL", date(2020, 1, 1), date(2020, 12, 31)).data) == 10
+
+        def touch_dir():
+            st = tmp_path.stat()
+            os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+        # A newer export sorts after the old one and wins.
+        self._write_csv(str(tmp_path), "AAPL_v2", rows=20)
+        touch_dir()
+        assert len(loader.load("AAPL", date(2020, 1, 1), date(2020, 12, 31)).data) == 20
+
+        # The resolved file is renamed away: the old one is found again.
+        os.rename(tmp_path / "data_AAPL_v2.csv", tmp_path / "old_AAPL.csv.bak")
+        assert len(loader.load("AAPL", date(2020, 1, 1), date(2020, 12, 31)).data) == 10
+
+    def test_first_parses_of_different_files_overlap(self, tmp_path, monkeypatch):
+        import trading_engine.data.csv_loader as mod
+
+        self._write_csv(str(tmp_path), "AAPL")
+        self._write_csv(str(tmp_path), "MSFT")
+        aapl_parsing, msft_parsed = threading.Event(), threading.Event()
+        real_parse = mod._parse_csv
+
+        def parse(filepath):
+            if "AAPL" in filepath.stem:
+                aapl_parsing.set()
+                assert msft_parsed.wait(timeout=5), "MSFT parse blocked behind AAPL"
+            df = real_parse(filepath)
+            if "MSFT" in filepath.stem:
+                msft_parsed.set()
+            return df
+
+        monkeypatch.setattr(mod, "_parse_csv", parse)
+        loader = CSVLoader(base_dir=tmp_path)
+        errors = []
+
+        def load_aapl():
+            try:
+                loader.load("AAPL", date(2020, 1, 1), date(2020, 12, 31))
+            except BaseException as e:  # surfaced by the test thread
+                errors.append(e)
+
+        aapl = threading.Thread(target=load_aapl)
+        aapl.start()
+        assert aapl_parsing.wait(timeout=5)
+        loader.load("MSFT", date(2020, 1, 1), date(2020, 12, 31))
+        aapl.join()
+        assert not errors
+
+
+# =============================================================================
+# [B2] CachedLoader — on-disk store with incremental range top-up
+# =============================================================================
+
+class _CountingLoader:
+    """In-memory DataLoader that records every (start, end) it is asked for."""
+
+    def __init__(self, rows: int = 300):
+        dates = pd.date_range("2020-01-01", periods=rows, freq="B")
+        close = [100.0 + i for i in range(rows)]
+        self.df = pd.DataFrame(
+            {"open": close, "high": close, "low": close, "close": close, "volume": [1.0] * rows},
+            index=pd.DatetimeIndex(dates, name="date"),
+        )
+        self.calls: list[tuple[date, date]] = []
+
+    def load(self, symbol: str, start: date, end: date) -> PriceFrame:
+        self.calls.append((start, end))
+        df = self.df.loc[str(start):str(end)]
+        if df.empty:
+            raise NoDataError(f"No data for {symbol}")
+        return PriceFrame(symbol=symbol, data=df, source="fake")
+
+
+class TestCachedLoader:
+    def test_second_load_hits_store(self, tmp_path):
+        inner = _CountingLoader()
+        loader = CachedLoader(inner, tmp_path)
+        first = loader.load("AAA", date(2020, 2, 1), date(2020, 6, 30))
+        second = CachedLoader(inner, tmp_path).load("AAA", date(2020, 3, 1), date(2020, 5, 31))
+
+        assert len(inner.calls) == 1
+        assert second.source == "fake"
+        pd.testing.assert_series_equal(
+            second.data["close"],
+            first.data["close"].loc["2020-03-01":"2020-05-31"],
+            check_freq=False,
+            check_index_type=False,
+        )
+
+    def test_only_missing_edges_are_fetched(self, tmp_path):
+        inner = _CountingLoader()
+        loader = CachedLoader(inner, tmp_path)
+        loader.load("AAA", date(2020, 3, 1), date(2020, 6, 30))
+        pf = loader.load("AAA", date(2020, 2, 1), date(2020, 8, 31))
+
+        assert inner.calls[1:] == [
+            (date(2020, 2, 1), date(2020, 3, 1)),
+            (date(2020, 6, 30), date(2020, 8, 31)),
+        ]
+        expected = inner.df.loc["2020-02-01":"2020-08-31", "close"]
+        assert pf.data["close"].tolist() == expected.tolist()
+        assert pf.data.index.is_monotonic_increasing
+
+    def test_empty_edges_are_recorded_as_covered(self, tmp_path):
+        inner = _CountingLoader()
+        inner.df = inner.df.loc["2020-01-06":]  # listed Monday 2020-01-06
+        loader = CachedLoader(inner, tmp_path)
+        loader.load("AAA", date(2020, 1, 4), date(2020, 7, 4))
+        # Head before the listing; tail over a weekend (Sat 07-04 to Sun 07-05).
+        first = loader.load("AAA", date(2019, 6, 1), date(2020, 7, 5))
+        second = loader.load("AAA", date(2019, 6, 1), date(2020, 7, 5))
+
+        assert len(inner.calls) == 3
+        assert second.data["close"].tolist() == first.data["close"].tolist()
+        assert first.data.index[0] == pd.Timestamp("2020-01-06")
+
+    def test_invalidate_forces_refetch(self, tmp_path):
+        inner = _CountingLoader()
+        loader = CachedLoader(inner, tmp_path)
+        loader.load("AAA", date(2020, 2, 1), date(2020, 6, 30))
+        loader.invalidate("AAA")
+        loader.load("AAA", date(2020, 2, 1), date(2020, 6, 30))
+        assert len(inner.calls) == 2
+
+    def test_empty_range_raises_data_load_error(self, tmp_path):
+        loader = CachedLoader(_CountingLoader(), tmp_path)
+        loader.load("AAA", date(2020, 2, 1), date(2020, 6, 30))
+        with pytest.raises(DataLoadError):
+            loader.load("AAA", date(2030, 1, 1), date(2030, 6, 30))
+
+
+# =============================================================================
+# [B3] load_many — bounded-concurrency async fetching
+# =============================================================================
+
+class _SlowLoader:
+    """Blocking loader that sleeps per call and tracks peak concurrency."""
+
+    def __init__(self, delay: float = 0.05, fail: set[str] | None = None):
+        self.delay = delay
+        self.fail = fail or set()
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def load(self, symbol: str, start: date, end: date) -> PriceFrame:
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            time.sleep(self.delay)
+            if symbol in self.fail:
+                raise DataLoadError(f"boom {symbol}")
+            return _CountingLoader(rows=5).load(symbol, start, end)
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+class TestLoadMany:
+    def test_respects_concurrency_cap_and_order(self):
+        loader = _SlowLoader()
+        symbols = [f"S{i}" for i in range(10)]
+        prices, errors = asyncio.run(
+            load_many(loader, symbols, date(2020, 1, 1), date(2020, 1, 31), max_concurrency=3)
+        )
+        assert list(prices) == symbols
+        assert not errors
+        assert 1 < loader.peak <= 3
+
+    def test_partial_failure_is_collected(self):
+        loader = _SlowLoader(fail={"BAD"})
+        prices, errors = asyncio.run(
+            load_many(loader, ["OK", "BAD"], date(2020, 1, 1), date(2020, 1, 31))
+        )
+        assert list(prices) == ["OK"]
+        assert isinstance(errors["BAD"], DataLoadError)
+
+    def test_timeout_reported_as_data_load_error(self):
+        loader = _SlowLoader(delay=0.5)
+        prices, errors = asyncio.run(
+            load_many(loader, ["SLOW"], date(2020, 1, 1), date(2020, 1, 31), timeout=0.05)
+        )
+        assert not prices
+        assert "Timed out" in str(errors["SLOW"])
+
+    def test_batch_loader_batches_share_semaphore_and_timeout(self):
+        class _SlowBatchLoader(_SlowLoader):
+            BATCH_SIZE = 2
+
+            def load_many(self, symbols, start, end):
+                if "SLOW" in symbols:
+                    time.sleep(0.5)
+                prices = {s: self.load(s, start, end) for s in symbols}
+                return prices, {}
+
+        loader = _SlowBatchLoader()
+        symbols = ["A", "B", "C", "D", "SLOW", "E"]
+        prices, errors = asyncio.run(
+            load_many(loader, symbols, date(2020, 1, 1), date(2020, 1, 31),
+                      max_concurrency=2, timeout=0.3)
+        )
+        assert list(prices) == ["A", "B", "C", "D"]
+        assert list(errors) == ["SLOW", "E"]
+        assert "Timed out" in str(errors["E"])
+        assert loader.peak == 2
+
+
+# =============================================================================
+# [B4] CoalescingLoader — single-flight deduplication
+# =============================================================================
+
+class TestCoalescingLoader:
+    def test_concurrent_identical_loads_hit_vendor_once(self):
+        inner = _SlowLoader(delay=0.2)
+        loader = CoalescingLoader(inner)
+        results = []
+
+        async def _fan_out():
+            return await load_many(loader, ["SPY"], date(2020, 1, 1), date(2020, 1, 31))
+
+        threads = [
+            threading.Thread(target=lambda: results.append(asyncio.run(_fan_out())))
+            for _ in range(5)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert inner.peak == 1
+        frames = [prices["SPY"] for prices, _ in results]
+        assert all(f is frames[0] for f in frames)
+
+    def test_sequential_loads_are_not_cached(self):
+        inner = _CountingLoader()
+        loader = CoalescingLoader(inner)
+        loader.load("AAA", date(2020, 2, 1), date(2020, 3, 1))
+        loader.load("AAA", date(2020, 2, 1), date(2020, 3, 1))
+        assert len(inner.calls) == 2
+
+
+# =============================================================================
+# [B5] ChunkedLoader — parallel year-sized chunks
+# =============================================================================
+
+class _FlakyLoader(_CountingLoader):
+    """Counting loader whose chunks starting in `fail_years` fail `times` times."""
+
+    def __init__(self, fail_years: set[int], times: int, rows: int = 1000):
+        super().__init__(rows=rows)
+        self.fail_years = fail_years
+        self.remaining = {y: times for y in fail_years}
+        self._lock = threading.Lock()
+
+    def load(self, symbol, start, end):
+        with self._lock:
+            if self.remaining.get(start.year, 0) > 0:
+                self.remaining[start.year] -= 1
+                self.calls.append((start, end))
+                raise DataLoadError(f"timeout {start.year}")
+        return super().load(symbol, start, end)
+
+
+class TestChunkedLoader:
+    def test_year_chunks_overlap_by_one_day(self):
+        chunks = year_chunks(date(2020, 6, 1), date(2022, 3, 1))
+        assert chunks == [
+            (date(2020, 6, 1), date(2021, 1, 1)),
+            (date(2021, 1, 1), date(2022, 1, 1)),
+            (date(2022, 1, 1), date(2022, 3, 1)),
+        ]
+
+    def test_stitched_frame_matches_single_fetch(self):
+        inner = _CountingLoader(rows=1000)
+        pf = ChunkedLoader(inner).load("AAA", date(2020, 3, 1), date(2023, 6, 30))
+        expected = inner.df.loc["2020-03-01":"2023-06-30"]
+        assert len(inner.calls) == 4
+        assert pf.data.index.is_unique
+        assert pf.data["close"].tolist() == expected["close"].tolist()
+
+    def test_only_failed_chunks_are_retried(self):
+        inner = _FlakyLoader(fail_years={2021}, times=1)
+        pf = ChunkedLoader(inner).load("AAA", date(2020, 3, 1), date(2022, 6, 30))
+        assert [c[0].year for c in inner.calls].count(2021) == 2
+        assert [c[0].year for c in inner.calls].count(2020) == 1
+        assert pf.data.index[-1] <= pd.Timestamp("2022-06-30")
+
+    def test_persistent_gap_raises_partial_and_cache_keeps_prefix(self, tmp_path):
+        inner = _FlakyLoader(fail_years={2022}, times=3)
+        loader = CachedLoader(ChunkedLoader(inner), tmp_path)
+        with pytest.raises(PartialLoadError) as exc:
+            loader.load("AAA", date(2020, 3, 1), date(2023, 6, 30))
+        assert exc.value.covered == (date(2020, 3, 1), date(2022, 1, 1))
+
+        # Next request only re-fetches from the failed chunk onwards.
+        inner.calls.clear()
+        pf = loader.load("AAA", date(2020, 3, 1), date(2023, 6, 30))
+        assert min(c[0] for c in inner.calls) == date(2022, 1, 1)
+        expected = inner.df.loc["2020-03-01":"2023-06-30", "close"]
+        assert pf.data["close"].tolist() == expected.tolist()
+
+    def test_leading_empty_chunks_are_pre_listing_history(self):
+        inner = _CountingLoader(rows=300)  # data starts 2020-01-01
+        pf = ChunkedLoader(inner).load("AAA", date(2017, 1, 1), date(2020, 6, 30))
+        assert pf.data.index[0] == pd.Timestamp("2020-01-01")
+
+    def test_trailing_empty_chunks_are_delisted_history(self):
+        inner = _CountingLoader(rows=300)  # delisted 2021-02-23
+        pf = ChunkedLoader(inner).load("AAA", date(2020, 3, 1), date(2024, 6, 30))
+        expected = inner.df.loc["2020-03-01":"2024-06-30", "close"]
+        assert pf.data["close"].tolist() == expected.tolist()
+        assert len(inner.calls) == 5  # empty chunks are not retried
+
+    def test_empty_last_chunk_with_exclusive_end(self):
+        class _ExclusiveEndLoader(_CountingLoader):
+            def load(self, symbol, start, end):
+                return super().load(symbol, start, end - timedelta(days=1))
+
+        inner = _ExclusiveEndLoader(rows=1500)
+        inner.df = inner.df[inner.df.index.dayofyear != 1]  # New Year closed
+        pf = ChunkedLoader(inner).load("AAA", date(2022, 3, 1), date(2024, 1, 2))
+        assert pf.data.index[-1] == pd.Timestamp("2023-12-29")
+        assert len(inner.calls) == 3
+
+    def test_all_chunks_empty_raises_no_data(self):
+        inner = _CountingLoader(rows=300)
+        with pytest.raises(NoDataError):
+            ChunkedLoader(inner).load("AAA", date(2022, 1, 1), date(2024, 6, 30))
+
 
 # =============================================================================
 # [C] YFinanceLoader (network — skipped by default)
@@ -163,3 +656,316 @@ class TestYFinanceColumnNormalization:
         # Columns must be unique and close must be a 1-D Series
         assert pf.data.columns.is_unique
         assert isinstance(pf.data["close"], pd.Series)
+
+
+# =============================================================================
+# [C3] YFinanceLoader.load_many — batched multi-ticker download (mocked)
+# =============================================================================
+
+class TestYFinanceLoadMany:
+    def _multi_frame(self, tickers: list[str]) -> pd.DataFrame:
+        idx = pd.date_range("2023-01-02", periods=4, freq="B")
+        cols = pd.MultiIndex.from_product(
+            [["Close", "High", "Low", "Open", "Volume"], tickers],
+            names=["Price", "Ticker"],
+        )
+        df = pd.DataFrame(1.0, index=idx, columns=cols)
+        for i, t in enumerate(tickers):
+            df[("Close", t)] = 10.0 * (i + 1)
+        if "DEAD" in tickers:
+            df.loc[:, (slice(None), "DEAD")] = float("nan")
+        return df
+
+    def test_splits_batches_into_price_frames(self, monkeypatch):
+        import trading_engine.data.yfinance_loader as mod
+
+        calls: list[list[str]] = []
+
+        def _fake_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            return self._multi_frame([t.upper() for t in tickers])
+
+        monkeypatch.setattr(mod.yf, "download", _fake_download)
+        loader = YFinanceLoader(session=object())
+        loader.BATCH_SIZE = 2
+        prices, errors = loader.load_many(["aaa", "BBB", "DEAD"], date(2023, 1, 1), date(2023, 1, 31))
+
+        assert calls == [["aaa", "BBB"], ["DEAD"]]
+        assert set(prices) == {"aaa", "BBB"}
+        assert prices["BBB"].data["close"].iloc[0] == 20.0
+        assert prices["aaa"].data.columns.is_unique
+        assert isinstance(errors["DEAD"], DataLoadError)
+
+    def test_fetch_path_prefers_batch_loader(self, monkeypatch):
+        import trading_engine.data.yfinance_loader as mod
+
+        calls: list[list[str]] = []
+
+        def _fake_download(tickers, **kwargs):
+            calls.append(list(tickers))
+            return self._multi_frame(list(tickers))
+
+        monkeypatch.setattr(mod.yf, "download", _fake_download)
+        prices, errors = asyncio.run(
+            load_many(YFinanceLoader(session=object()), ["A", "B", "C"], date(2023, 1, 1), date(2023, 1, 31))
+        )
+        assert len(calls) == 1
+        assert list(prices) == ["A", "B", "C"]
+        assert not errors
+
+
+# =============================================================================
+# [D] VNStockLoader hedged requests (no network — vnstock.Quote faked)
+# =============================================================================
+
+class TestVNStockHedging:
+    def _install_fake_vnstock(self, monkeypatch, behaviour: dict[str, tuple[float, bool]]):
+        """behaviour: source -> (delay seconds, returns data?)."""
+        import sys
+        import types
+
+        calls: list[str] = []
+
+        class _Quote:
+            def __init__(self, symbol, source):
+                self.source = source
+
+            def history(self, start, end, interval):
+                calls.append(self.source)
+                delay, has_data = behaviour[self.source]
+                time.sleep(delay)
+                if not has_data:
+                    return pd.DataFrame()
+                return pd.DataFrame({
+                    "time": pd.date_range("2024-01-01", periods=3),
+                    "open": [1.0, 2, 3], "high": [1.0, 2, 3], "low": [1.0, 2, 3],
+                    "close": [1.0, 2, 3], "volume": [10.0, 10, 10],
+                    "src": [self.source] * 3,
+                })
+
+        monkeypatch.setitem(sys.modules, "vnstock", types.SimpleNamespace(Quote=_Quote))
+        return calls
+
+    def test_slow_primary_is_hedged(self, monkeypatch):
+        calls = self._install_fake_vnstock(monkeypatch, {"KBS": (1.0, True), "VCI": (0.0, True)})
+        loader = VNStockLoader(hedge_after=0.05)
+        began = time.perf_counter()
+        pf = loader.load("fpt", date(2024, 1, 1), date(2024, 1, 31))
+        assert time.perf_counter() - began < 0.8
+        assert calls == ["KBS", "VCI"]
+        assert pf.symbol == "FPT"
+        assert set(loader.latency.summary()) >= {"VCI"}
+
+    def test_fast_primary_is_not_hedged(self, monkeypatch):
+        calls = self._install_fake_vnstock(monkeypatch, {"KBS": (0.0, True), "VCI": (0.0, True)})
+        VNStockLoader(hedge_after=0.5).load("FPT", date(2024, 1, 1), date(2024, 1, 31))
+        assert calls == ["KBS"]
+
+    def test_empty_primary_falls_back_immediately(self, monkeypatch):
+        calls = self._install_fake_vnstock(monkeypatch, {"KBS": (0.0, False), "VCI": (0.0, True)})
+        pf = VNStockLoader(hedge_after=10.0).load("FPT", date(2024, 1, 1), date(2024, 1, 31))
+        assert calls == ["KBS", "VCI"]
+        assert len(pf.data) == 3
+
+    def test_all_sources_empty_raises(self, monkeypatch):
+        self._install_fake_vnstock(monkeypatch, {"KBS": (0.0, False), "VCI": (0.0, False)})
+        for hedge in (None, 0.01):
+            with pytest.raises(NoDataError, match="No data for FPT"):
+                VNStockLoader(hedge_after=hedge).load("FPT", date(2024, 1, 1), date(2024, 1, 31))
+
+    def test_source_errors_are_not_reported_as_no_data(self, monkeypatch):
+        import sys
+        import types
+
+        class _Quote:
+            def __init__(self, symbol, source):
+                pass
+
+            def history(self, start, end, interval):
+                raise ConnectionError("reset")
+
+        monkeypatch.setitem(sys.modules, "vnstock", types.SimpleNamespace(Quote=_Quote))
+        with pytest.raises(DataLoadError, match="reset") as exc:
+            VNStockLoader().load("FPT", date(2024, 1, 1), date(2024, 1, 31))
+        assert not isinstance(exc.value, NoDataError)
+
+    def test_chunked_suspended_ticker_is_not_retried(self, monkeypatch):
+        import sys
+        import types
+
+        calls: list[tuple[str, str]] = []
+        bars = pd.DataFrame({"time": pd.bdate_range("2019-01-01", "2021-06-30")})
+        for col in ("open", "high", "low", "close", "volume"):
+            bars[col] = 10.0
+
+        class _Quote:
+            def __init__(self, symbol, source):
+                self.source = source
+
+            def history(self, start, end, interval):
+                calls.append((self.source, start))
+                return bars[(bars["time"] >= start) & (bars["time"] <= end)]
+
+        monkeypatch.setitem(sys.modules, "vnstock", types.SimpleNamespace(Quote=_Quote))
+        pf = ChunkedLoader(VNStockLoader()).load("FPT", date(2019, 1, 1), date(2023, 12, 31))
+
+        assert pf.data.index[-1] == pd.Timestamp("2021-06-30")
+        assert len(pf.data) == len(bars)
+        # Chunks with data: one KBS call each; empty chunks: KBS then VCI, once.
+        assert len(calls) == 3 + 2 * 2
+
+
+# =============================================================================
+# [E] SyntheticLoader + exchange calendars
+# =============================================================================
+
+class TestTradingCalendars:
+    def test_us_calendar_skips_nyse_holidays(self):
+        days = trading_days(date(2020, 1, 1), date(2020, 12, 31), "us")
+        closed = {
+            "2020-01-01", "2020-01-20", "2020-02-17", "2020-04-10", "2020-05-25",
+            "2020-07-03", "2020-09-07", "2020-11-26", "2020-12-25",
+        }
+        as_str = {str(d) for d in days.astype("datetime64[D]")}
+        assert len(days) == 253
+        assert not closed & as_str
+
+    @pytest.mark.parametrize(
+        "year, tet",
+        [(1985, date(1985, 1, 21)), (1996, date(1996, 2, 19)), (2007, date(2007, 2, 17)),
+         (2015, date(2015, 2, 19)), (2024, date(2024, 2, 10)), (2025, date(2025, 1, 29))],
+    )
+    def test_lunar_new_year(self, year, tet):
+        assert lunar_new_year(year) == tet
+
+    def test_vn_calendar_closes_tet_week(self):
+        days = trading_days(date(2024, 2, 1), date(2024, 2, 29), "vn")
+        as_str = [str(d) for d in days.astype("datetime64[D]")]
+        assert "2024-02-07" in as_str and "2024-02-15" in as_str
+        assert not any("2024-02-08" <= d <= "2024-02-14" for d in as_str)
+
+
+class TestSyntheticLoader:
+    def test_implements_protocol_and_frame_shape(self):
+        loader = SyntheticLoader(seed=1)
+        assert isinstance(loader, DataLoader)
+        pf = loader.load("AAA", date(2020, 1, 1), date(2020, 12, 31))
+        assert list(pf.data.columns) == ["open", "high", "low", "close", "volume"]
+        assert pf.data.index.name == "date"
+        assert len(pf.data) == 253
+        assert (pf.data["high"] >= pf.data[["open", "close"]].max(axis=1)).all()
+        assert (pf.data["low"] <= pf.data[["open", "close"]].min(axis=1)).all()
+
+    @pytest.mark.parametrize("model", ["gbm", "jump"])
+    def test_sub_range_matches_wider_request(self, model):
+        loader = SyntheticLoader(seed=3, model=model)
+        wide = loader.load("AAA", date(2000, 1, 1), date(2010, 12, 31)).data
+        narrow = loader.load("AAA", date(2004, 3, 1), date(2004, 9, 30)).data
+        pd.testing.assert_frame_equal(narrow, wide.loc["2004-03-01":"2004-09-30"])
+
+    def test_reproducible_and_seed_dependent(self):
+        args = ("AAA", date(2020, 1, 1), date(2020, 6, 30))
+        a = SyntheticLoader(seed=7).load(*args).data
+        b = SyntheticLoader(seed=7).load(*args).data
+        c = SyntheticLoader(seed=8).load(*args).data
+        pd.testing.assert_frame_equal(a, b)
+        assert not a["close"].equals(c["close"])
+
+    def test_universe_feeds_cross_section(self):
+        loader = SyntheticLoader(seed=0, calendar="vn")
+        universe = SyntheticLoader.universe(25)
+        prices = {s: loader.load(s, date(2019, 1, 1), date(2020, 12, 31)) for s in universe}
+        result = analyze_cross_section(MovingAverageRatio(length=50), universe, prices, threshold=1.0)
+        assert result.ranks.shape[1] == 25
+
+    def test_range_before_origin_raises(self):
+        loader = SyntheticLoader(origin=date(2000, 1, 1))
+        with pytest.raises(DataLoadError, match="No data"):
+            loader.load("AAA", date(1990, 1, 1), date(1995, 1, 1))
+
+
+# =============================================================================
+# [F] ParquetLoader — local data lake (requires pyarrow)
+# =============================================================================
+
+def _export_parquet(root, symbol: str, days: int, years=None) -> None:
+    """Write symbol's bars as hive partitions root/symbol=X/year=Y (all years by default)."""
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    df = make_price_frame(symbol, days=days).data.reset_index(names="date")
+    df["year"] = df["date"].dt.year
+    for year, part in df.groupby("year"):
+        if years is not None and year not in years:
+            continue
+        out = root / f"symbol={symbol}" / f"year={year}"
+        out.mkdir(parents=True)
+        table = pa.Table.from_pandas(part.drop(columns="year"), preserve_index=False)
+        pq.write_table(table, out / "part-0.parquet")
+
+
+class TestParquetLoader:
+    @pytest.fixture
+    def lake(self, tmp_path):
+        _export_parquet(tmp_path, "AAA", days=400)
+        _export_parquet(tmp_path, "BBB", days=100)
+        return tmp_path
+
+    def test_loads_only_requested_range(self, lake):
+        pf = ParquetLoader(lake).load("AAA", date(2020, 6, 1), date(2021, 2, 26))
+        expected = make_price_frame("AAA", days=400).data.loc["2020-06-01":"2021-02-26"]
+        assert pf.source == "parquet"
+        assert pf.data.index.equals(expected.index.rename("date"))
+        assert pf.data["close"].tolist() == expected["close"].tolist()
+
+    def test_catalog_round_trip(self, lake):
+        loader = ParquetLoader(lake)
+        built = loader.build_catalog()
+        assert built["BBB"].bars == 100
+        assert built["AAA"].first_date == date(2020, 1, 1)
+
+        fresh = ParquetLoader(lake)
+        assert fresh.symbols() == ["AAA", "BBB"]
+        assert fresh.catalog()["AAA"] == built["AAA"]
+
+    def test_catalog_rejects_without_reading_data(self, lake, monkeypatch):
+        ParquetLoader(lake).build_catalog()
+        loader = ParquetLoader(lake)
+        monkeypatch.setattr(loader, "_open", lambda: pytest.fail("data files opened"))
+        with pytest.raises(DataLoadError, match="not in the Parquet catalog"):
+            loader.load("ZZZ", date(2020, 1, 1), date(2020, 12, 31))
+        with pytest.raises(DataLoadError, match="history is"):
+            loader.load("BBB", date(2024, 1, 1), date(2024, 12, 31))
+
+    def test_missing_catalog_is_an_error_only_when_asked_for(self, lake):
+        loader = ParquetLoader(lake)
+        with pytest.raises(DataLoadError, match="build_catalog"):
+            loader.symbols()
+        assert len(loader.load("BBB", date(2020, 1, 1), date(2020, 2, 28)).data) > 0
+
+    def test_catalog_validation_needs_no_pyarrow(self, tmp_path):
+        (tmp_path / "_catalog.json").write_text(json.dumps({
+            "version": 1,
+            "symbols": {"AAA": {"first_date": "2020-01-01", "last_date": "2020-12-31", "bars": 262}},
+        }))
+        loader = ParquetLoader(tmp_path)
+        assert loader.symbols() == ["AAA"]
+        with pytest.raises(DataLoadError, match="not in the Parquet catalog"):
+            loader.load("ZZZ", date(2020, 1, 1), date(2020, 6, 30))
+        with pytest.raises(DataLoadError, match="history is"):
+            loader.load("AAA", date(2021, 1, 1), date(2021, 6, 30))
+
+    def test_long_lived_loader_sees_next_export(self, lake):
+        ParquetLoader(lake).build_catalog()  # the export job
+        loader = ParquetLoader(lake)         # the server's loader
+        assert loader.symbols() == ["AAA", "BBB"]
+        assert len(loader.load("AAA", date(2020, 1, 1), date(2021, 12, 31)).data) == 400
+
+        # Next night: a new symbol and a new year partition for AAA.
+        _export_parquet(lake, "CCC", days=50)
+        _export_parquet(lake, "AAA", days=600, years={2022})
+        ParquetLoader(lake).build_catalog()
+
+        assert loader.symbols() == ["AAA", "BBB", "CCC"]
+        assert len(loader.load("CCC", date(2020, 1, 1), date(2020, 12, 31)).data) == 50
+        pf = loader.load("AAA", date(2022, 1, 1), date(2022, 12, 31))
+        assert pf.data.index[0].year == 2022
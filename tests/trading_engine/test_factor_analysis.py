@@ -19,6 +19,7 @@ from trading_engine.types import (
     FactorSeries,
     InsufficientDataError,
     PriceFrame,
+    PricePanel,
 )
 
 from tests.trading_engine.conftest import make_price_frame
@@ -244,6 +245,65 @@ class TestAnalyzeCrossSection:
         result_zero = analyze_cross_section(factor, list(prices_dict.keys()), prices_dict, threshold=0.0)
         pd.testing.assert_series_equal(result_none.breadth, result_zero.breadth)
 
+    def test_ragged_universe_aligns_on_union_calendar(self):
+        prices = {
+            "AAA": make_price_frame("AAA", days=120),
+            "BBB": make_price_frame("BBB", days=80, start="2020-03-02", seed=5),
+        }
+        factor = MovingAverageRatio(length=20)
+        result = analyze_cross_section(factor, ["AAA", "BBB", "MISSING"], prices, threshold=1.0)
+
+        expected = pd.DataFrame(
+            {s: factor.compute(pf).values for s, pf in prices.items()}
+        ).dropna(how="all")
+        assert result.ranks.index.equals(expected.index)
+        pd.testing.assert_series_equal(
+            result.counts_above, expected.gt(1.0).sum(axis=1),
+            check_names=False, check_freq=False,
+        )
+        pd.testing.assert_series_equal(
+            result.universe_median, expected.median(axis=1),
+            check_names=False, check_freq=False,
+        )
+
+    def test_prebuilt_panel_gives_same_result(self, prices_dict):
+        factor = MovingAverageRatio(length=20)
+        universe = list(prices_dict.keys())
+        panel = PricePanel.from_frames(prices_dict, fields=("close",))
+        with_panel = analyze_cross_section(factor, universe, prices_dict, panel=panel)
+        without = analyze_cross_section(factor, universe, prices_dict)
+        pd.testing.assert_frame_equal(with_panel.ranks, without.ranks)
+        pd.testing.assert_series_equal(with_panel.breadth, without.breadth)
+
+
+    def test_panel_path_matches_per_symbol_path(self):
+        class SeriesOnly:
+            """The same factor without compute_panel: forces the per-symbol loop."""
+
+            def __init__(self, factor):
+                self.factor = factor
+
+            def compute(self, prices):
+                return self.factor.compute(prices)
+
+        data = make_price_frame("CCC", days=200, seed=3).data
+        prices = {
+            "AAA": make_price_frame("AAA", days=200),
+            "BBB": make_price_frame("BBB", days=120, start="2020-03-02", seed=5),
+            "CCC": PriceFrame("CCC", data.drop(data.index[60:75]), "test"),
+        }
+        universe = list(prices)
+        factor = MovingAverageRatio(length=20)
+        for panel in (None, PricePanel.from_frames(prices, fields=())):
+            fast = analyze_cross_section(factor, universe, prices, threshold=0.01, panel=panel)
+            slow = analyze_cross_section(
+                SeriesOnly(factor), universe, prices, threshold=0.01, panel=panel
+            )
+            assert fast.factor_name == slow.factor_name
+            pd.testing.assert_frame_equal(fast.ranks, slow.ranks)
+            pd.testing.assert_series_equal(fast.counts_above, slow.counts_above)
+            pd.testing.assert_series_equal(fast.universe_median, slow.universe_median)
+
 
 class TestDetectRegime:
     def _breadth(self, values: list[float]) -> pd.Series:
@@ -4,9 +4,12 @@ Gate: from trading_engine.factors import MovingAverageRatio
 """
 from __future__ import annotations
 
+import json
+
 import numpy as np
 import pandas as pd
 import pytest
+from scipy import stats
 
 from trading_engine.factors import (
     AHR999,
@@ -16,9 +19,23 @@ from trading_engine.factors import (
     DistanceFromPeak,
     MovingAverage,
     MovingAverageRatio,
+    RollingPercentile,
 )
+from trading_engine.factors import CachedFactor, ExpressionFactor, FactorBank, FactorCache, kernels
+from trading_engine.factors import expression as ex
+from trading_engine.factors import tail
+from trading_engine.factors.cache import factor_key
+from trading_engine.factors.moving_average import MovingAverageStream
 from trading_engine.factors.moving_average import compute_ma
-from trading_engine.types import FactorComputeError, FactorSeries, PriceFrame
+from trading_engine.types import (
+    FactorComputeError,
+    FactorPanel,
+    FactorSeries,
+    PanelFactor,
+    PriceFrame,
+    PricePanel,
+    StreamingFactor,
+)
 
 from tests.trading_engine.conftest import make_price_frame
 
@@ -59,6 +76,110 @@ class TestComputeMA:
             compute_ma(s, "SMA", 0)
 
 
+# =============================================================================
+# [F2] Rolling-window kernels
+# =============================================================================
+
+class TestKernels:
+    """Kernels must reproduce pandas rolling (and the naive WMA) bar for bar."""
+
+    def _random_walk(self, n: int = 700, seed: int = 7) -> np.ndarray:
+        rng = np.random.default_rng(seed)
+        return 100 * np.exp(np.cumsum(rng.normal(0, 0.02, n)))
+
+    @pytest.mark.parametrize("window", [1, 2, 5, 20, 200, 700])
+    def test_matches_pandas_rolling(self, window):
+        x = self._random_walk()
+        rolling = pd.Series(x).rolling(window)
+        np.testing.assert_allclose(kernels.rolling_sum(x, window), rolling.sum(), rtol=1e-12)
+        np.testing.assert_allclose(kernels.sma(x, window), rolling.mean(), rtol=1e-12)
+        np.testing.assert_allclose(kernels.rolling_max(x, window), rolling.max())
+        np.testing.assert_allclose(kernels.rolling_min(x, window), rolling.min())
+
+    @pytest.mark.parametrize("window", [2, 5, 20, 200, 700])
+    def test_std_matches_two_pass(self, window):
+        # Exact reference: pandas' online variance drifts by ~1e-6 on short windows.
+        x = self._random_walk()
+        expected = np.full(len(x), np.nan)
+        expected[window - 1:] = np.lib.stride_tricks.sliding_window_view(x, window).std(
+            axis=1, ddof=1
+        )
+        np.testing.assert_allclose(kernels.rolling_std(x, window), expected, rtol=1e-10)
+
+    @pytest.mark.parametrize("window", [1, 3, 10, 200])
+    def test_wma_matches_weighted_dot(self, window):
+        x = self._random_walk()
+        weights = np.arange(1, window + 1, dtype=float)
+        expected = pd.Series(x).rolling(window).apply(
+            lambda w: np.dot(w, weights) / weights.sum(), raw=True
+        )
+        np.testing.assert_allclose(kernels.wma(x, window), expected, rtol=1e-12)
+
+    def test_nan_blanks_only_windows_containing_it(self):
+        x = self._random_walk(100)
+        x[[0, 40, 41, 97]] = np.nan
+        for window in (1, 5, 30):
+            rolling = pd.Series(x).rolling(window)
+            np.testing.assert_allclose(kernels.sma(x, window), rolling.mean(), rtol=1e-12)
+            np.testing.assert_allclose(kernels.rolling_max(x, window), rolling.max())
+            np.testing.assert_allclose(
+                kernels.rolling_std(x, window), rolling.std(), rtol=1e-7, atol=1e-9
+            )
+
+    def test_std_of_flat_window_is_exactly_zero(self):
+        x = np.concatenate([self._random_walk(30), np.full(30, 123.456)])
+        assert (kernels.rolling_std(x, 10)[-21:] == 0.0).all()
+
+    def test_long_history_keeps_precision(self):
+        """No drift from a global cumsum over 30 years of bars at high price levels."""
+        x = self._random_walk(30 * 365) * 1e4
+        window = 200
+        expected = np.lib.stride_tricks.sliding_window_view(x, window).mean(axis=1)
+        np.testing.assert_allclose(kernels.sma(x, window)[window - 1:], expected, rtol=1e-13)
+
+    def test_short_series_is_all_nan(self):
+        assert np.isnan(kernels.sma(np.arange(3.0), 5)).all()
+
+    def test_invalid_window_raises(self):
+        with pytest.raises(FactorComputeError):
+            kernels.sma(np.arange(5.0), 0)
+
+    @pytest.mark.parametrize(
+        "kernel",
+        [kernels.rolling_sum, kernels.sma, kernels.wma, kernels.rolling_std,
+         kernels.rolling_max, kernels.rolling_min],
+    )
+    def test_2d_rolls_each_column(self, kernel):
+        matrix = np.column_stack([self._random_walk(300, seed) for seed in range(4)])
+        matrix[:40, 1] = np.nan  # late listing
+        matrix[150, 2] = np.nan
+        expected = np.column_stack([kernel(matrix[:, j], 20) for j in range(4)])
+        np.testing.assert_allclose(kernel(matrix, 20), expected, rtol=1e-13)
+
+    def test_3d_input_raises(self):
+        with pytest.raises(FactorComputeError):
+            kernels.rolling_max(np.ones((3, 3, 3)), 2)
+
+    def test_factors_unchanged(self):
+        """Factors built on kernels equal their pandas formulations."""
+        pf = make_price_frame("TEST", days=400)
+        close, high, low = pf.data["close"], pf.data["high"], pf.data["low"]
+
+        sma, upper, lower = BollingerBands(20, 2.0).compute_bands(pf)
+        std = close.rolling(20).std()
+        pd.testing.assert_series_equal(sma, close.rolling(20).mean(), rtol=1e-12)
+        pd.testing.assert_series_equal(upper, close.rolling(20).mean() + 2 * std, rtol=1e-6)
+        pd.testing.assert_series_equal(lower, close.rolling(20).mean() - 2 * std, rtol=1e-6)
+
+        up, down = DonchianChannel(20, 10).compute_channels(pf)
+        pd.testing.assert_series_equal(up, high.rolling(20).max().shift(1))
+        pd.testing.assert_series_equal(down, low.rolling(10).min().shift(1))
+
+        peak = DistanceFromPeak(window=60).compute(pf).values
+        expected = (close / close.rolling(60).max() - 1).dropna()
+        pd.testing.assert_series_equal(peak, expected)
+
+
 # =============================================================================
 # [G] MovingAverageRatio
 # =============================================================================
@@ -208,3 +329,567 @@ class TestAHR999:
         factor = AHR999()
         with pytest.raises(FactorComputeError, match="Need at least 200"):
             factor.compute(pf)
+
+
+# =============================================================================
+# [I] FactorCache
+# =============================================================================
+
+class _CountingFactor:
+    """MovingAverageRatio that counts how often it is really computed."""
+
+    calls = 0  # on the class: instance attributes are part of the cache key
+
+    def __init__(self, length: int = 20):
+        self.length = length
+
+    def compute(self, prices: PriceFrame) -> FactorSeries:
+        type(self).calls += 1
+        return MovingAverageRatio("SMA", self.length).compute(prices)
+
+
+class TestFactorCache:
+    def test_hit_on_same_factor_and_bars(self, price_frame):
+        cache = FactorCache()
+        first = cache.compute(MovingAverageRatio("SMA", 50), price_frame)
+        second = cache.compute(MovingAverageRatio("SMA", 50), price_frame)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        pd.testing.assert_series_equal(first.values, second.values)
+        pd.testing.assert_series_equal(
+            first.values, MovingAverageRatio("SMA", 50).compute(price_frame).values
+        )
+
+    def test_keyed_by_content_not_frame_object(self, price_frame):
+        cache = FactorCache()
+        copy = PriceFrame(price_frame.symbol, price_frame.data.copy(), "csv")
+        cache.compute(DistanceFromPeak(60), price_frame)
+        cache.compute(DistanceFromPeak(60), copy)
+        assert cache.hits == 1
+
+    def test_parameters_and_class_are_part_of_the_key(self, price_frame):
+        cache = FactorCache()
+        cache.compute(MovingAverageRatio("SMA", 50), price_frame)
+        cache.compute(MovingAverageRatio("EMA", 50), price_frame)
+        cache.compute(MovingAverageRatio("SMA", 20), price_frame)
+        cache.compute(DistanceFromMovingAverage("SMA", 50), price_frame)
+        assert (cache.hits, cache.misses, len(cache)) == (0, 4, 4)
+
+    def test_cached_factor_is_transparent(self, price_frame):
+        cache = FactorCache()
+        _CountingFactor.calls = 0
+        inner = _CountingFactor()
+        wrapped = CachedFactor(inner, cache)
+        wrapped.compute(price_frame)
+        wrapped.compute(price_frame)
+        assert inner.calls == 1
+        assert wrapped.length == 20  # attributes forwarded to the factor
+
+        bands = CachedFactor(BollingerBands(20), cache)
+        assert bands.context(price_frame)["upper_band"] > 0
+
+    def test_lru_eviction_under_memory_bound(self, price_frame):
+        one = MovingAverageRatio("SMA", 10).compute(price_frame).values
+        size = int(one.memory_usage(index=True, deep=False))
+        cache = FactorCache(max_bytes=2 * size + 1)
+        for length in (10, 11, 12):  # similar sizes: only two fit
+            cache.compute(MovingAverageRatio("SMA", length), price_frame)
+        assert cache.evictions == 1
+        assert cache.nbytes <= cache.max_bytes
+
+        cache.compute(MovingAverageRatio("SMA", 10), price_frame)  # was evicted
+        assert cache.misses == 4
+
+    def test_errors_are_not_cached(self):
+        cache = FactorCache()
+        short = make_price_frame("SHORT", days=30)
+        for _ in range(2):
+            with pytest.raises(FactorComputeError):
+                cache.compute(MovingAverageRatio("SMA", 50), short)
+        assert len(cache) == 0
+
+    def test_returned_metadata_is_private(self, price_frame):
+        cache = FactorCache()
+        cache.compute(MovingAverageRatio("SMA", 50), price_frame).metadata["x"] = 1
+        assert "x" not in cache.compute(MovingAverageRatio("SMA", 50), price_frame).metadata
+
+    def test_unkeyable_factor_is_computed_uncached(self, price_frame):
+        class WithCallback:
+            def __init__(self):
+                self.transform = lambda s: s
+
+            def compute(self, prices):
+                return MovingAverageRatio("SMA", 20).compute(prices)
+
+        with pytest.raises(TypeError):
+            factor_key(WithCallback())
+        cache = FactorCache()
+        cache.compute(WithCallback(), price_frame)
+        assert len(cache) == 0
+
+
+# =============================================================================
+# [J] compute_panel — whole-universe factors
+# =============================================================================
+
+def _ragged_universe() -> dict[str, PriceFrame]:
+    """Late listing, a suspension gap and a different holiday calendar."""
+    full = make_price_frame("AAA", days=400, seed=1)
+    gapped = make_price_frame("CCC", days=400, seed=3).data
+    other_calendar = make_price_frame("DDD", days=400, seed=4).data
+    return {
+        "AAA": full,
+        "BBB": make_price_frame("BBB", days=250, start="2020-06-01", seed=2),
+        "CCC": PriceFrame("CCC", gapped.drop(gapped.index[150:170]), "test"),
+        "DDD": PriceFrame("DDD", other_calendar.iloc[np.arange(400) % 7 != 3], "test"),
+    }
+
+
+PANEL_FACTORS = [
+    MovingAverage("SMA", 30),
+    MovingAverage("EMA", 30),
+    MovingAverage("WMA", 30),
+    MovingAverageRatio("SMA", 50),
+    DistanceFromMovingAverage("EMA", 20),
+    BollingerBands(20, 2.0),
+    DonchianChannel(20, 10),
+    DistanceFromPeak(60),
+    AHR999(),
+]
+
+
+class TestComputePanel:
+    @pytest.mark.parametrize("factor", PANEL_FACTORS, ids=lambda f: type(f).__name__)
+    def test_matches_per_symbol_compute(self, factor):
+        prices = _ragged_universe()
+        panel = PricePanel.from_frames(prices, fields=factor.panel_fields)
+
+        assert isinstance(factor, PanelFactor)
+        result = factor.compute_panel(panel)
+        assert isinstance(result, FactorPanel)
+        assert result.values.shape == (len(panel.dates), 4)
+
+        expected = pd.DataFrame(
+            {s: factor.compute(pf).values for s, pf in prices.items()}
+        ).reindex(panel.index)
+        assert result.name == factor.compute(prices["AAA"]).name
+        pd.testing.assert_frame_equal(
+            result.to_frame(), expected, rtol=1e-9, check_freq=False, check_names=False
+        )
+
+    def test_short_symbol_raises_like_compute(self):
+        prices = _ragged_universe()
+        prices["NEW"] = make_price_frame("NEW", days=30, start="2021-06-01")
+        panel = PricePanel.from_frames(prices, fields=("close",))
+        with pytest.raises(FactorComputeError, match="Need at least 50 bars.*NEW"):
+            MovingAverageRatio("SMA", 50).compute_panel(panel)
+
+    def test_cached_factor_exposes_compute_panel(self):
+        wrapped = CachedFactor(MovingAverageRatio("SMA", 50), FactorCache())
+        assert isinstance(wrapped, PanelFactor)
+
+
+# =============================================================================
+# [K] FactorBank — parameter grids in one pass
+# =============================================================================
+
+BANK_GRIDS = [
+    (MovingAverage, dict(ma_type=["SMA", "EMA", "WMA"], length=[1, 7, 64, 200, 257])),
+    (MovingAverageRatio, dict(ma_type=["SMA", "WMA"], length=[2, 5, 50, 128, 300, 600])),
+    (DistanceFromMovingAverage, dict(ma_type="SMA", length=[10, 50])),
+    (DistanceFromPeak, dict(window=[1, 3, 60, 252, 600])),
+    (DonchianChannel, dict(entry_length=[1, 20, 55], exit_length=[5, 10])),
+    (BollingerBands, dict(period=[10, 20])),  # no bank implementation: per-parameter fallback
+]
+
+
+class TestFactorBank:
+    @pytest.mark.parametrize("factor_cls, grid", BANK_GRIDS, ids=lambda v: getattr(v, "__name__", ""))
+    def test_columns_match_compute(self, factor_cls, grid, price_frame):
+        bank = FactorBank.grid(factor_cls, price_frame, **grid)
+        assert bank.values.shape == (len(price_frame), len(bank))
+
+        for i, factor in enumerate(bank.factors):
+            if max(getattr(factor, a, 0) for a in ("length", "window", "entry_length")) > len(price_frame):
+                with pytest.raises(FactorComputeError, match="Need at least"):
+                    bank.column(i)
+                continue
+            expected = factor.compute(price_frame)
+            result = bank.column(i)
+            assert (result.name, result.metadata) == (expected.name, expected.metadata)
+            pd.testing.assert_series_equal(result.values, expected.values, rtol=1e-12, atol=1e-12)
+
+    def test_long_high_priced_history_keeps_precision(self):
+        prices = np.geomspace(0.05, 100_000, 9000)  # BTC-like range
+        df = pd.DataFrame(
+            {"open": prices, "high": prices, "low": prices, "close": prices},
+            index=pd.date_range("2000-01-01", periods=len(prices)),
+        )
+        pf = PriceFrame("BTC", df, "test")
+        bank = FactorBank.grid(MovingAverage, pf, ma_type=["SMA", "WMA"], length=[3, 200, 1000])
+        for i, factor in enumerate(bank.factors):
+            pd.testing.assert_series_equal(
+                bank.column(i).values, factor.compute(pf).values, rtol=1e-13
+            )
+
+    def test_position_by_factor(self, price_frame):
+        bank = FactorBank.grid(MovingAverageRatio, price_frame, ma_type="SMA", length=range(5, 50))
+        i = bank.position(MovingAverageRatio("SMA", 20))
+        assert bank.factors[i].length == 20
+        assert bank.column(CachedFactor(MovingAverageRatio("SMA", 20), FactorCache())).name == "SMA(20) Ratio"
+        with pytest.raises(KeyError):
+            bank.position(MovingAverageRatio("EMA", 20))
+
+    def test_publish_serves_cached_factors(self, price_frame):
+        cache = FactorCache()
+        FactorBank.grid(MovingAverageRatio, price_frame, ma_type="SMA", length=[20, 50]).publish(cache)
+        assert len(cache) == 2
+
+        result = CachedFactor(MovingAverageRatio("SMA", 50), cache).compute(price_frame)
+        assert (cache.hits, cache.misses) == (1, 0)
+        pd.testing.assert_series_equal(
+            result.values, MovingAverageRatio("SMA", 50).compute(price_frame).values, rtol=1e-12
+        )
+
+    def test_mixed_classes_raise(self, price_frame):
+        with pytest.raises(FactorComputeError, match="one factor class"):
+            FactorBank([MovingAverage(), DistanceFromPeak()], price_frame)
+
+
+# =============================================================================
+# [L] Factor streams — O(1) per-bar updates
+# =============================================================================
+
+def _bar(pf: PriceFrame, i: int) -> dict:
+    return {
+        "date": pf.dates[i],
+        "close": pf.close[i],
+        "high": pf.column("high")[i],
+        "low": pf.column("low")[i],
+    }
+
+
+def _panel_rows(panel: PricePanel, start: int, stop: int) -> PricePanel:
+    return PricePanel(
+        dates=panel.dates[start:stop],
+        symbols=panel.symbols,
+        fields=panel.fields,
+        values=panel.values[:, start:stop],
+        valid=panel.valid[start:stop],
+    )
+
+
+class TestFactorStream:
+    @pytest.mark.parametrize("factor", PANEL_FACTORS, ids=lambda f: type(f).__name__)
+    def test_updates_match_compute(self, factor):
+        pf = make_price_frame("TEST", days=700)
+        expected = factor.compute(pf).values.reindex(pf.data.index)
+
+        assert isinstance(factor, StreamingFactor)
+        stream = factor.stream()
+        stream.init(pf.slice(pf.data.index[0].date(), pf.data.index[249].date()))
+        values = []
+        for i in range(250, len(pf)):
+            if i == 400:  # survives a JSON round trip mid-stream
+                stream = type(stream).from_state(json.loads(json.dumps(stream.state())))
+            values.append(stream.update(_bar(pf, i)))
+
+        np.testing.assert_allclose(values, expected.iloc[250:], rtol=1e-10, atol=1e-12)
+
+    @pytest.mark.parametrize("factor", PANEL_FACTORS, ids=lambda f: type(f).__name__)
+    def test_panel_updates_match_compute(self, factor):
+        prices = _ragged_universe()
+        panel = PricePanel.from_frames(prices)
+        expected = pd.DataFrame(
+            {s: factor.compute(pf).values for s, pf in prices.items()}
+        ).reindex(panel.index)
+
+        stream = factor.stream()
+        stream.init(_panel_rows(panel, 0, 220))
+        values = [
+            stream.update({
+                "date": panel.dates[t],
+                **{f: panel.field(f)[t] for f in ("close", "high", "low")},
+            })
+            for t in range(220, len(panel.dates))
+        ]
+        np.testing.assert_allclose(
+            np.array(values), expected.to_numpy()[220:], rtol=1e-10, atol=1e-12
+        )
+
+    def test_long_high_priced_history_keeps_precision(self):
+        prices = np.geomspace(0.05, 100_000, 6000)
+        df = pd.DataFrame(
+            {"open": prices, "high": prices, "low": prices, "close": prices},
+            index=pd.date_range("2005-01-01", periods=len(prices)),
+        )
+        pf = PriceFrame("BTC", df, "test")
+        for factor in (MovingAverage("SMA", 200), MovingAverage("WMA", 50), BollingerBands(20)):
+            stream = factor.stream()
+            stream.init(pf.slice(df.index[0].date(), df.index[299].date()))
+            values = [stream.update(_bar(pf, i)) for i in range(300, len(pf))]
+            np.testing.assert_allclose(values, factor.compute(pf).values.iloc[-len(values):], rtol=1e-9)
+
+    def test_degenerate_window_is_nan_where_compute_raises(self):
+        df = pd.DataFrame(
+            {"open": 100.0, "high": 100.0, "low": 100.0, "close": 100.0},
+            index=pd.date_range("2020-01-01", periods=60),
+        )
+        pf = PriceFrame("FLAT", df, "test")
+        with pytest.raises(FactorComputeError, match="band width is zero"):
+            BollingerBands(20).compute(pf)
+        stream = BollingerBands(20).stream()
+        stream.init(pf)
+        assert np.isnan(stream.update({"close": 100.0}))
+        assert not np.isnan(stream.update({"close": 101.0}))
+
+    def test_missing_bar_leaves_symbol_untouched(self):
+        prices = {s: make_price_frame(s, days=100, seed=i) for i, s in enumerate(["A", "B"])}
+        stream = MovingAverage("SMA", 10).stream()
+        stream.init(PricePanel.from_frames(prices))
+        before = stream.state()
+
+        out = stream.update({"close": np.array([np.nan, 50.0])})
+        assert np.isnan(out[0]) and not np.isnan(out[1])
+        after = stream.state()["arrays"]["window"]
+        assert after["count"][0] == before["arrays"]["window"]["count"][0]
+
+    def test_invalid_use_raises(self, price_frame):
+        stream = MovingAverage("SMA", 10).stream()
+        with pytest.raises(FactorComputeError, match="init"):
+            stream.update({"close": 1.0})
+        stream.init(price_frame)
+        with pytest.raises(FactorComputeError, match="missing 'close'"):
+            stream.update({"high": 1.0})
+        with pytest.raises(FactorComputeError, match="2 values for 1 symbols"):
+            stream.update({"close": [1.0, 2.0]})
+        ahr = AHR999().stream()
+        ahr.init(price_frame)
+        with pytest.raises(FactorComputeError, match="need a 'date'"):
+            ahr.update({"close": 1.0})
+        peak = DistanceFromPeak(20).stream()
+        peak.init(price_frame)
+        with pytest.raises(FactorComputeError, match="not MovingAverageStream"):
+            MovingAverageStream.from_state(peak.state())
+        with pytest.raises(FactorComputeError, match="Unknown MA type"):
+            MovingAverage("HMA", 10).stream()
+
+
+# =============================================================================
+# [M] Factor expressions — shared nodes
+# =============================================================================
+
+class TestExpression:
+    @pytest.mark.parametrize("text", [
+        "close / sma(close, 50) - 1",
+        "zscore(close, 20)",
+        "-(close - 1) ** 2 / 3",
+        "close - open - (high - low)",
+        "log(close / shift(close, 1))",
+        "rank(ema(close, 10) - wma(close, 30), 60)",
+    ])
+    def test_text_round_trips(self, text):
+        node = ex.parse(text)
+        assert ex.parse(str(node)) == node
+
+    def test_equal_subexpressions_are_one_node(self):
+        bands = BollingerBands(20, 2.0).band_nodes()
+        z = ex.parse("zscore(close, 20)")
+        graph = ex.Graph([*bands, z])
+        rolling = [n for n in graph.nodes if n.op in ex.ROLLING]
+        assert sorted(str(n) for n in rolling) == ["sma(close, 20)", "std(close, 20)"]
+
+    def test_matches_equivalent_factor(self, price_frame):
+        result = ExpressionFactor("close / sma(close, 50) - 1").compute(price_frame)
+        expected = MovingAverageRatio("SMA", 50).compute(price_frame)
+        pd.testing.assert_series_equal(result.values, expected.values, check_names=False)
+        assert result.name == "close / sma(close, 50) - 1"
+
+    def test_intermediates_cached_across_calls(self, price_frame):
+        cache = ex.NodeCache()
+        graph = ex.Graph(BollingerBands(20, 2.0).band_nodes())
+        first = graph.evaluate(price_frame, cache)
+        assert (cache.hits, cache.misses) == (0, 5)  # sma, std, std * 2, upper, lower
+        second = ex.Graph([ex.parse("zscore(close, 20)")]).evaluate(price_frame, cache)
+        assert cache.hits == 2  # sma and std reused
+        sma = ex.parse("sma(close, 20)")
+        assert second[sma] is first[sma]
+        assert not second[sma].flags.writeable
+
+    def test_bollinger_compute_and_bands_share_windows(self, price_frame, monkeypatch):
+        calls = []
+        original = ex.ROLLING["std"]
+        monkeypatch.setitem(ex.ROLLING, "std", lambda v, w: calls.append(w) or original(v, w))
+        monkeypatch.setattr(ex, "intermediates", ex.NodeCache())
+
+        factor = BollingerBands(21, 2.0)
+        factor.compute(price_frame)
+        factor.compute_bands(price_frame)
+        ExpressionFactor("zscore(close, 21)").compute(price_frame)
+        assert calls == [21]
+
+    def test_panel_matches_per_symbol(self):
+        prices = _ragged_universe()
+        factor = ExpressionFactor("zscore(close, 20) * rank(high, 30)")
+        assert isinstance(factor, PanelFactor)
+        assert factor.panel_fields == ("high", "close")
+        panel = PricePanel.from_frames(prices, fields=factor.panel_fields)
+        expected = pd.DataFrame(
+            {s: factor.compute(pf).values for s, pf in prices.items()}
+        ).reindex(panel.index)
+        pd.testing.assert_frame_equal(
+            factor.compute_panel(panel).to_frame(), expected,
+            rtol=1e-9, check_freq=False, check_names=False,
+        )
+
+    def test_context_and_intermediates(self, price_frame):
+        factor = ExpressionFactor("zscore(close, 20)")
+        context = factor.context(price_frame)
+        assert context["expression"] == "(close - sma(close, 20)) / std(close, 20)"
+        assert context["sma(close, 20)"] == pytest.approx(price_frame.close[-20:].mean())
+        series = factor.intermediates(price_frame)
+        assert "std(close, 20)" in series and len(series["std(close, 20)"]) == len(price_frame)
+
+    def test_factor_cache_keys_on_expression(self, price_frame):
+        cache = FactorCache()
+        CachedFactor(ExpressionFactor("sma(close, 5)"), cache).compute(price_frame)
+        CachedFactor(ExpressionFactor("sma(close,5)"), cache).compute(price_frame)
+        CachedFactor(ExpressionFactor("sma(close, 6)"), cache).compute(price_frame)
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    @pytest.mark.parametrize("text, match", [
+        ("__import__('os')", "Unknown function"),
+        ("close.real", "Unsupported syntax"),
+        ("close[0]", "Unsupported syntax"),
+        ("sma(close, 1.5)", "positive integer"),
+        ("sma(close)", "Wrong arguments"),
+        ("1 + 2", "does not read any price field"),
+        ("price", "Unknown price field"),
+        ("close +", "Invalid factor expression"),
+        ("close + " * 200 + "1", "longer than"),
+        ("close * 1" + "0" * 400, "too large"),
+        ("sma(close, 1" + "0" * 400 + ")", "too large"),
+    ])
+    def test_rejects_invalid_text(self, text, match):
+        with pytest.raises(FactorComputeError, match=match):
+            ex.parse(text)
+
+    def test_const_too_large_for_float(self):
+        with pytest.raises(FactorComputeError, match="too large"):
+            ex.const(10 ** 400)
+
+    def test_division_by_zero_raises(self, price_frame):
+        with pytest.raises(FactorComputeError, match="infinite"):
+            ExpressionFactor("close / (close - close)").compute(price_frame)
+
+
+# =============================================================================
+# [N] compute_tail — latest values without the full history
+# =============================================================================
+
+TAIL_FACTORS = PANEL_FACTORS + [
+    MovingAverage("EMA", 200),
+    MovingAverageRatio("WMA", 37),
+    BollingerBands(33, 1.5),
+    DonchianChannel(55, 27),
+]
+
+
+class TestComputeTail:
+    @pytest.mark.parametrize("factor", TAIL_FACTORS, ids=lambda f: type(f).__name__)
+    @pytest.mark.parametrize("k", [1, 5, 250])
+    def test_matches_full_compute_exactly(self, factor, k):
+        pf = make_price_frame("TEST", days=2000)
+        full = factor.compute(pf)
+        result = factor.compute_tail(pf, k)
+        assert (result.name, result.metadata) == (full.name, full.metadata)
+        pd.testing.assert_series_equal(result.values, full.values.iloc[-k:], check_exact=True)
+
+    def test_reads_only_the_warm_up(self):
+        pf = make_price_frame("TEST", days=2000)
+        recent = tail.tail_frame(pf, 1, 200, 200)
+        assert 200 <= len(recent) < 400
+        assert (len(pf) - len(recent)) % 200 == 0  # kernel blocks stay aligned
+
+    def test_donchian_reads_only_its_longest_channel(self):
+        pf = make_price_frame("TEST", days=2000)
+        recent = DonchianChannel(55, 27)._tail_frame(pf, 5)
+        assert len(recent) == 5 + 55  # channels of the bars before each bar
+
+    def test_short_history_raises_like_compute(self):
+        pf = make_price_frame("TEST", days=100)
+        with pytest.raises(FactorComputeError, match="Need at least 200 bars"):
+            MovingAverageRatio("SMA", 200).compute_tail(pf)
+        with pytest.raises(FactorComputeError, match="k >= 1"):
+            MovingAverageRatio("SMA", 20).compute_tail(pf, 0)
+
+    def test_generic_fallback(self, price_frame):
+        factor = ExpressionFactor("zscore(close, 20)")
+        result = tail.compute_tail(factor, price_frame, 3)
+        pd.testing.assert_series_equal(result.values, factor.compute(price_frame).values.iloc[-3:])
+        assert len(tail.compute_tail(DistanceFromPeak(60), price_frame, 3).values) == 3
+
+    def test_context_uses_the_tail(self, price_frame):
+        context = MovingAverageRatio("SMA", 50).context(price_frame)
+        full_ma = compute_ma(price_frame.data["close"], "SMA", 50)
+        assert context["ma_value"] == float(full_ma.iloc[-1])
+
+
+# =============================================================================
+# [O] RollingPercentile — point-in-time percentile rank
+# =============================================================================
+
+def _naive_percentiles(values: pd.Series, window: int | None, min_periods: int) -> pd.Series:
+    out = np.full(len(values), np.nan)
+    for t in range(min_periods - 1, len(values)):
+        start = 0 if window is None else max(0, t - window + 1)
+        out[t] = stats.percentileofscore(values.iloc[start:t + 1], values.iloc[t])
+    return pd.Series(out, index=values.index).dropna()
+
+
+class TestRollingPercentile:
+    @pytest.mark.parametrize("window", [20, 250, None])
+    def test_matches_percentileofscore_per_bar(self, price_frame, window):
+        # DistanceFromPeak is 0 at every new high: plenty of ties.
+        values = DistanceFromPeak(20).compute(price_frame).values
+        result = RollingPercentile(DistanceFromPeak(20), window).compute(price_frame)
+        expected = _naive_percentiles(values, window, 2 if window is None else window)
+        pd.testing.assert_series_equal(result.values, expected, check_names=False, atol=1e-9)
+        assert result.name == f"Percentile(DistFromPeak(20), {window or 'expanding'})"
+
+    @pytest.mark.parametrize("window", [60, None])
+    def test_no_look_ahead(self, price_frame, window):
+        factor = RollingPercentile(MovingAverageRatio("SMA", 20), window)
+        full = factor.compute(price_frame).values
+        prefix = factor.compute(price_frame.slice(price_frame.data.index[0], price_frame.data.index[300])).values
+        pd.testing.assert_series_equal(prefix, full.loc[:prefix.index[-1]])
+
+    def test_min_periods(self, price_frame):
+        result = RollingPercentile(MovingAverageRatio("SMA", 20), 100, min_periods=10)
+        values = result.compute(price_frame).values
+        assert len(values) == len(price_frame) - 19 - 9
+        with pytest.raises(FactorComputeError, match="Need at least 1000 values"):
+            RollingPercentile(MovingAverageRatio("SMA", 20), 1000).compute(price_frame)
+        with pytest.raises(FactorComputeError, match="min_periods"):
+            RollingPercentile(MovingAverageRatio("SMA", 20), 10, min_periods=20).compute(price_frame)
+
+    def test_compute_panel_matches_compute(self):
+        universe = _ragged_universe()
+        panel = PricePanel.from_frames(universe)
+        factor = RollingPercentile(MovingAverageRatio("SMA", 20), 100)
+        assert isinstance(factor, PanelFactor)
+        assert not isinstance(RollingPercentile(_NoPanel()), PanelFactor)
+        frame = factor.compute_panel(panel).to_frame()
+        for symbol, prices in universe.items():
+            expected = factor.compute(prices).values
+            np.testing.assert_allclose(frame[symbol].dropna().to_numpy(), expected.to_numpy())
+
+    def test_cache_key_includes_wrapped_factor(self):
+        a = RollingPercentile(MovingAverageRatio("SMA", 20), 100)
+        b = RollingPercentile(MovingAverageRatio("SMA", 50), 100)
+        assert factor_key(a) != factor_key(b)
+
+
+class _NoPanel:
+    def compute(self, prices: PriceFrame) -> FactorSeries:
+        return MovingAverageRatio("SMA", 20).compute(prices)
@@ -204,6 +204,27 @@ class TestRunComparison:
         report = run_comparison(configs, prices_dict)
         assert len(report.results) == len(report.configs)
 
+    def test_shared_universe_sweep_matches_one_at_a_time(self, prices_dict):
+        """Configs over the same symbols and dates run as one batch."""
+        configs = [
+            BacktestConfig(
+                strategy=FactorThresholdStrategy(
+                    factor=MovingAverageRatio(ma_type="SMA", length=length),
+                ),
+                symbols=["AAPL", "MSFT"],
+                start=date(2020, 1, 1),
+                end=date(2021, 12, 31),
+            )
+            for length in (10, 20, 50)
+        ]
+        from trading_engine.performance.comparison import _run_single
+        report = run_comparison(configs, prices_dict, max_workers=2)
+        assert report.configs == configs
+        for config, result in zip(configs, report.results):
+            single, error = _run_single(config, prices_dict)
+            assert error is None
+            pd.testing.assert_series_equal(result.equity_curve, single.equity_curve)
+
 
 # =============================================================================
 # [AL] TradeDistribution buckets
@@ -1,6 +1,7 @@
 """Tests for trading_engine/portfolio/ — Layer 5 validation gate.
 
 Gate: from trading_engine import run_portfolio
+from trading_engine.portfolio import run_portfolios
 Key verifications:
 - Correct NAV on known price series
 - max_leverage enforcement
@@ -14,6 +15,8 @@ import pandas as pd
 import pytest
 
 from trading_engine import run_portfolio
+from trading_engine.portfolio import run_portfolios
+from trading_engine.portfolio.nav import asset_returns, leverage_scale, simulate_nav
 from trading_engine.strategy.base import BaseStrategy
 from trading_engine.types import (
     Portfolio,
@@ -106,6 +109,39 @@ class TestRunPortfolioNAV:
         result = run_portfolio(portfolio, prices_dict)
         assert result.equity_curve.iloc[0] == pytest.approx(5_000.0)
 
+    def _two_symbol_prices(self) -> dict[str, PriceFrame]:
+        prices = self._flat_prices("SPY", n=20, start_price=100.0, daily_return=0.01)
+        prices.update(self._flat_prices("AAPL", n=20, start_price=100.0, daily_return=-0.02))
+        return prices
+
+    def test_weights_matched_to_closes_by_symbol(self):
+        """Weight columns in a different order than the prices."""
+        class _Reversed(BaseStrategy):
+            def _compute_weights(self, symbols, prices, regime=None):
+                idx = prices[symbols[0]].data.index
+                return pd.DataFrame({"AAPL": 0.0, "SPY": 1.0}, index=idx)
+
+        portfolio = Portfolio(
+            slots=[StrategySlot(strategy=_Reversed(), weight=1.0)],
+            initial_capital=1000.0,
+        )
+        result = run_portfolio(portfolio, self._two_symbol_prices())
+        assert result.equity_curve.iloc[-1] == pytest.approx(1000.0 * 1.01 ** 19)
+
+    def test_weights_for_some_symbols(self):
+        """A strategy may return weights for only some of the symbols."""
+        class _SpyOnly(BaseStrategy):
+            def _compute_weights(self, symbols, prices, regime=None):
+                idx = prices[symbols[0]].data.index
+                return pd.DataFrame({"SPY": 1.0}, index=idx)
+
+        portfolio = Portfolio(
+            slots=[StrategySlot(strategy=_SpyOnly(), weight=1.0)],
+            initial_capital=1000.0,
+        )
+        result = run_portfolio(portfolio, self._two_symbol_prices())
+        assert result.equity_curve.iloc[-1] == pytest.approx(1000.0 * 1.01 ** 19)
+
 
 # =============================================================================
 # [AG] max_leverage enforcement
@@ -174,3 +210,99 @@ class TestPortfolioResult:
         from trading_engine.types import Trade
         for trade in result.trades:
             assert isinstance(trade, Trade)
+
+
+# =============================================================================
+# [AK] Batched NAV kernel
+# =============================================================================
+
+class TestSimulateNav:
+    def _returns(self) -> tuple[pd.DataFrame, np.ndarray]:
+        close = pd.DataFrame({
+            s: make_price_frame(s, days=300, seed=i).data["close"].to_numpy()
+            for i, s in enumerate(["AAA", "BBB", "CCC"])
+        })
+        close.iloc[:40, 1] = np.nan      # late listing
+        close.iloc[100:110, 2] = np.nan  # suspension gap
+        return close, asset_returns(close.to_numpy())
+
+    def test_returns_match_pct_change(self):
+        close, returns = self._returns()
+        expected = close.ffill().pct_change(fill_method=None)
+        expected[close.ffill().shift(1).isna()] = np.nan
+        np.testing.assert_array_equal(returns, expected.to_numpy())
+
+    def test_weights_earn_the_next_bars_return(self):
+        returns = np.array([[np.nan], [0.10], [0.10], [-0.50]])
+        weights = np.array([[1.0], [0.0], [1.0], [1.0]])
+        nav = simulate_nav(weights, returns, 100.0)
+        np.testing.assert_allclose(nav, [100.0, 110.0, 110.0, 55.0])
+
+    def test_batch_equals_one_config_at_a_time(self):
+        _, returns = self._returns()
+        rng = np.random.default_rng(0)
+        weights = rng.uniform(-1, 1, size=(50,) + returns.shape)
+        batch = simulate_nav(weights, returns, 1000.0, max_leverage=1.0)
+        assert batch.shape == (50, len(returns))
+        for c in (0, 17, 49):
+            capped = weights[c] * leverage_scale(weights[c], 1.0)[:, None]
+            np.testing.assert_allclose(batch[c], simulate_nav(capped, returns, 1000.0), rtol=1e-12)
+            assert (np.abs(capped).sum(axis=1) <= 1.0 + 1e-12).all()
+
+    def test_run_portfolio_uses_the_kernel(self, prices_dict):
+        from trading_engine.portfolio.simulation import _build_close_matrix
+        from trading_engine.types import PricePanel
+        portfolio = Portfolio(slots=[StrategySlot(strategy=_ConstantWeightStrategy(0.5), weight=1.0)],
+                              initial_capital=1000.0, max_leverage=1.0)
+        result = run_portfolio(portfolio, prices_dict)
+        panel = PricePanel.from_frames(prices_dict, fields=("close",))
+        returns = asset_returns(_build_close_matrix(panel, result.weights.index).to_numpy())
+        raw = np.full(result.weights.shape, 0.5)
+        nav = simulate_nav(raw, returns[:, [panel.column(s) for s in result.weights.columns]],
+                           1000.0, max_leverage=1.0)
+        np.testing.assert_allclose(result.equity_curve.to_numpy(), nav, rtol=1e-12)
+
+    def test_shape_mismatch_raises(self):
+        with pytest.raises(ValueError, match="do not match"):
+            simulate_nav(np.zeros((2, 5, 3)), np.zeros((5, 2)), 1.0)
+
+    def test_run_portfolios_matches_run_portfolio(self, prices_dict):
+        class _Failing(BaseStrategy):
+            def _compute_weights(self, symbols, prices, regime=None):
+                raise RuntimeError("boom")
+
+        class _OneSymbol(BaseStrategy):
+            def _compute_weights(self, symbols, prices, regime=None):
+                idx = prices[symbols[0]].data.index
+                return pd.DataFrame({symbols[-1]: -0.5}, index=idx)
+
+        portfolios = [
+            Portfolio(slots=[StrategySlot(strategy=strategy, weight=1.0)], initial_capital=capital)
+            for strategy, capital in [
+                (_ConstantWeightStrategy(0.3), 1000.0),
+                (_Failing(), 1000.0),
+                (_OneSymbol(), 250.0),
+                (_SpecificWeightStrategy({"AAPL": [0.0, 1.0, 1.0, -1.0, 0.0]}), 10.0),
+            ]
+        ]
+        outcomes = run_portfolios(portfolios, prices_dict)
+
+        assert isinstance(outcomes[1], RuntimeError)
+        for k in (0, 2, 3):
+            expected = run_portfolio(portfolios[k], prices_dict)
+            pd.testing.assert_series_equal(outcomes[k].equity_curve, expected.equity_curve)
+            assert outcomes[k].trades == expected.trades
+
+    def test_run_portfolios_simulates_once_per_calendar(self, prices_dict, monkeypatch):
+        import trading_engine.portfolio.simulation as sim
+        calls = []
+        real = sim.simulate_nav
+        monkeypatch.setattr(sim, "simulate_nav", lambda w, *a, **k: calls.append(w.shape) or real(w, *a, **k))
+
+        portfolios = [
+            Portfolio(slots=[StrategySlot(strategy=_ConstantWeightStrategy(w), weight=1.0)],
+                      initial_capital=1000.0)
+            for w in (0.1, 0.2, 0.3)
+        ]
+        run_portfolios(portfolios, prices_dict, max_workers=2)
+        assert len(calls) == 1 and calls[0][0] == 3
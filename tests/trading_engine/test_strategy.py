@@ -16,14 +16,21 @@ import pandas as pd
 import pytest
 
 from trading_engine.strategy import BuyAndHold, EnsembleStrategy, FactorThresholdStrategy
-from trading_engine.strategy.base import BaseStrategy
+from trading_engine.strategy.base import BaseStrategy, strategy_weights
+from trading_engine.strategy.factor_threshold import threshold_weights
 from trading_engine.strategy.utils import weight_transitions_to_trades
 from trading_engine.types import (
+    ExplainRecord,
+    Portfolio,
     PriceFrame,
+    PricePanel,
     RegimeSeries,
     StrategyOutput,
     StrategyOutputError,
+    StrategySlot,
     Trade,
+    TradeTable,
+    WeightsStrategy,
 )
 
 from tests.trading_engine.conftest import make_price_frame
@@ -106,6 +113,118 @@ class TestWeightTransitionsToTrades:
         assert trades[0].mae_pct is not None    # unrealized MAE computed
         assert trades[0].mfe_pct is not None    # unrealized MFE computed
 
+    def test_trade_statistics_are_exact(self):
+        """Return, MAE, MFE and holding days of a short trade and a long trade."""
+        closes = [100.0, 110.0, 90.0, 120.0, 80.0, 100.0]
+        df = pd.DataFrame(
+            {"open": closes, "high": closes, "low": closes, "close": closes},
+            index=pd.date_range("2020-01-01", periods=6, freq="B"),
+        )
+        prices = {"SYM": PriceFrame(symbol="SYM", data=df, source="test")}
+        weights = self._make_weights([-1, -1, -0.5, 1, 1, 1])
+        short, long = weight_transitions_to_trades(weights, prices)
+
+        assert (short.direction, short.holding_days, short.exit_price) == ("short", 3, 120.0)
+        assert short.return_pct == pytest.approx(-20.0)
+        assert short.mae_pct == pytest.approx(-20.0)    # 120 vs 100
+        assert short.mfe_pct == pytest.approx(10.0)     # 90 vs 100
+        assert [e.weight for e in short.weight_history] == [-1.0, -0.5]
+
+        assert (long.exit_date, long.return_pct, long.holding_days) == (None, None, 2)
+        assert long.mae_pct == pytest.approx(-100 / 3)  # 80 vs 120
+        assert long.mfe_pct == pytest.approx(0.0)
+
+    def test_exit_on_the_last_bar(self):
+        prices = self._make_prices(5)
+        trades = weight_transitions_to_trades(self._make_weights([0, 1, 1, 1, -1]), prices)
+        assert [t.direction for t in trades] == ["long", "short"]
+        assert trades[0].holding_days == 3
+        assert trades[1].holding_days == 0 and trades[1].exit_date is None
+
+    def test_panel_path_matches_per_symbol_alignment(self):
+        """Reading closes from a PricePanel yields identical trades."""
+        prices = {
+            "AAA": make_price_frame("AAA", days=60),
+            "BBB": make_price_frame("BBB", days=40, start="2020-01-20", seed=3),
+        }
+        idx = prices["AAA"].data.index
+        rng = np.random.default_rng(0)
+        weights = pd.DataFrame(
+            {s: rng.choice([-1.0, -0.5, 0.0, 0.5, 1.0], len(idx)) for s in prices},
+            index=idx,
+        )
+        panel = PricePanel.from_frames(prices, fields=("close",))
+        assert weight_transitions_to_trades(weights, prices, panel=panel) == (
+            weight_transitions_to_trades(weights, prices)
+        )
+
+
+class TestTradeTable:
+    def _table(self) -> tuple[TradeTable, dict[str, PriceFrame]]:
+        prices = {
+            "AAA": make_price_frame("AAA", days=80),
+            "BBB": make_price_frame("BBB", days=60, start="2020-01-20", seed=3),
+        }
+        idx = prices["AAA"].data.index
+        rng = np.random.default_rng(1)
+        weights = pd.DataFrame(
+            {s: rng.choice([-1.0, -0.5, 0.0, 0.0, 0.5, 1.0], len(idx)) for s in prices},
+            index=idx,
+        )
+        return weight_transitions_to_trades(weights, prices), prices
+
+    def test_columns_match_the_trades(self):
+        table, prices = self._table()
+        assert isinstance(table, TradeTable) and table._trades is None
+        trades = list(table)
+        assert len(table) == len(trades) > 10
+        days = table.dates.astype("datetime64[D]")
+        for k, t in enumerate(trades):
+            assert table.symbols[table.symbol_code[k]] == t.symbol
+            assert days[table.entry_bar[k]].tolist() == t.entry_date
+            assert (table.exit_bar[k] < 0) == (t.exit_date is None)
+            assert table.entry_price[k] == t.entry_price
+            n_events = int((table.event_trade == k).sum())
+            assert n_events == len(t.weight_history)
+
+    def test_present_skips_missing_values(self):
+        table, _ = self._table()
+        trades = list(table)
+        assert table.present("return_pct") == [
+            t.return_pct for t in trades if t.return_pct is not None
+        ]
+        long = table.direction > 0
+        assert table.present("mae_pct", long) == [
+            t.mae_pct for t in trades if t.direction == "long" and t.mae_pct is not None
+        ]
+
+    def test_materialized_once_so_edits_persist(self):
+        table, _ = self._table()
+        table[0].explain = ExplainRecord({}, 0.5, "risk_on")
+        assert table[0].explain is not None
+        assert table.take(np.array([0]))[0].explain is not None
+
+    def test_from_trades_round_trip(self):
+        table, _ = self._table()
+        rebuilt = TradeTable.from_trades(table.to_list())
+        rebuilt._trades = None  # rebuild the objects from the columns alone
+        assert rebuilt == table
+        assert TradeTable.of(table) is table
+
+    def test_take_keeps_each_trades_events(self):
+        table, _ = self._table()
+        rows = np.flatnonzero(table.is_open | (table.direction < 0))[::-1]
+        expected = [table.to_list()[k] for k in rows]
+        table._trades = None
+        sub = table.take(rows)
+        sub._trades = None
+        assert sub.to_list() == expected
+
+    def test_empty(self):
+        table = TradeTable.empty()
+        assert len(table) == 0 and list(table) == [] and table == []
+        assert len(table.exit_dates) == 0
+
 
 # =============================================================================
 # [V] BaseStrategy NaN validation + clamping
@@ -139,6 +258,54 @@ class TestBaseStrategy:
         assert output.weights.max().max() <= 1.0
         assert output.weights.min().min() >= -1.0
 
+    def test_trades_derived_on_first_access_only(self, prices_dict, monkeypatch):
+        from trading_engine.strategy import base
+        calls = []
+        derive = base.weight_transitions_to_trades
+        monkeypatch.setattr(base, "weight_transitions_to_trades",
+                            lambda *a, **k: calls.append(1) or derive(*a, **k))
+
+        output = BuyAndHold().compute(list(prices_dict), prices_dict)
+        assert calls == []
+        assert output.trades is output.trades
+        assert len(calls) == 1
+        assert output.trades == weight_transitions_to_trades(output.weights, prices_dict)
+
+    def test_compute_weights_is_compute_without_trades(self, prices_dict):
+        strategy = _OverWeightStrategy()
+        assert isinstance(strategy, WeightsStrategy)
+        pd.testing.assert_frame_equal(
+            strategy.compute_weights(list(prices_dict), prices_dict),
+            strategy.compute(list(prices_dict), prices_dict).weights,
+        )
+
+    def test_portfolio_and_ensemble_derive_trades_once(self, prices_dict, monkeypatch):
+        from trading_engine import run_portfolio
+        from trading_engine.strategy import base, utils
+        calls = []
+        derive = utils.weight_transitions_to_trades
+        counted = lambda *a, **k: calls.append(1) or derive(*a, **k)  # noqa: E731
+        monkeypatch.setattr(base, "weight_transitions_to_trades", counted)
+        monkeypatch.setattr(utils, "weight_transitions_to_trades", counted)
+
+        ensemble = EnsembleStrategy([BuyAndHold(), _OverWeightStrategy()])
+        portfolio = Portfolio(slots=[StrategySlot(strategy=ensemble, weight=1.0)],
+                              initial_capital=10_000.0)
+        result = run_portfolio(portfolio, prices_dict)
+        assert len(calls) == 1  # only run_portfolio's, from the combined weights
+        assert len(result.trades) > 0
+
+    def test_strategy_without_compute_weights(self, prices_dict):
+        class _Plain:
+            def compute(self, symbols, prices, regime=None):
+                return BuyAndHold().compute(symbols, prices, regime)
+
+        assert not isinstance(_Plain(), WeightsStrategy)
+        pd.testing.assert_frame_equal(
+            strategy_weights(_Plain(), list(prices_dict), prices_dict),
+            BuyAndHold().compute_weights(list(prices_dict), prices_dict),
+        )
+
 
 # =============================================================================
 # [W] Strategy implementations
@@ -242,6 +409,88 @@ class TestFactorThresholdStrategy:
         assert weights[4] == 0.0   # consec=2
         assert weights[5] == 1.0   # consec=3 → entered
 
+    def test_symbols_on_different_calendars_in_one_call(self, monkeypatch):
+        """Each symbol keeps its own bar sequence; a bar another symbol has
+        but this one lacks must not break its confirmation streak."""
+        import trading_engine.strategy.factor_threshold as ft
+        from trading_engine.factors.moving_average import MovingAverageRatio
+
+        aaa = make_price_frame("AAA", days=400, seed=1)
+        bbb = make_price_frame("BBB", days=300, start="2020-03-02", seed=2)
+        bbb = PriceFrame(symbol="BBB", data=bbb.data.iloc[::3], source="synthetic")
+        prices = {"AAA": aaa, "BBB": bbb}
+
+        calls: list[tuple[int, ...]] = []
+
+        def counting(values, *args):
+            calls.append(np.shape(values))
+            return threshold_weights(values, *args)
+
+        monkeypatch.setattr(ft, "threshold_weights", counting)
+        factor = MovingAverageRatio(ma_type="SMA", length=10)
+        strategy = FactorThresholdStrategy(factor, threshold=0.0, buy_lag=2, sell_lag=1)
+        weights = strategy._compute_weights(["AAA", "BBB"], prices)
+
+        assert calls == [(400, 2)]
+        for symbol, pf in prices.items():
+            values = factor.compute(pf).values.reindex(pf.data.index).to_numpy()
+            expected = _loop_weights(values, 0.0, 2, 1)
+            np.testing.assert_array_equal(weights[symbol].reindex(pf.data.index).to_numpy(), expected)
+        assert (weights["BBB"].drop(bbb.data.index) == 0.0).all()
+
+
+def _loop_weights(values: np.ndarray, threshold: float, buy_lag: int, sell_lag: int) -> np.ndarray:
+    """The original bar-by-bar state machine, as the reference."""
+    weights = np.zeros(len(values))
+    in_position = False
+    consec_above = consec_below = 0
+    for i, v in enumerate(values):
+        if np.isnan(v):
+            consec_above = consec_below = 0
+            continue
+        above = v > threshold
+        if not in_position:
+            consec_above = consec_above + 1 if above else 0
+            if consec_above >= buy_lag + 1:
+                in_position, consec_above = True, 0
+        else:
+            consec_below = 0 if above else consec_below + 1
+            if consec_below >= sell_lag + 1:
+                in_position, consec_below = False, 0
+        weights[i] = 1.0 if in_position else 0.0
+    return weights
+
+
+class TestThresholdWeights:
+    @pytest.mark.parametrize("seed", range(40))
+    def test_matches_the_loop(self, seed):
+        rng = np.random.default_rng(seed)
+        n = int(rng.integers(1, 300))
+        # Short random streaks, NaN gaps and values exactly on the threshold.
+        values = rng.choice([-1.0, 0.0, 1.0, np.nan], size=n, p=[0.4, 0.1, 0.4, 0.1])
+        values[: rng.integers(0, 30)] = np.nan  # warm-up
+        buy_lag, sell_lag = (int(x) for x in rng.integers(0, 5, size=2))
+        np.testing.assert_array_equal(
+            threshold_weights(values, 0.0, buy_lag, sell_lag),
+            _loop_weights(values, 0.0, buy_lag, sell_lag),
+        )
+
+    def test_matrix_is_column_by_column(self):
+        rng = np.random.default_rng(7)
+        matrix = rng.normal(size=(500, 6))
+        matrix[rng.random(matrix.shape) < 0.05] = np.nan
+        result = threshold_weights(matrix, 0.2, 2, 1)
+        assert result.shape == matrix.shape
+        for j in range(matrix.shape[1]):
+            np.testing.assert_array_equal(result[:, j], _loop_weights(matrix[:, j], 0.2, 2, 1))
+
+    def test_nan_gap_keeps_the_position(self):
+        values = np.array([1.0, np.nan, np.nan, 1.0, -1.0, -1.0])
+        assert threshold_weights(values, 0.0, 0, 1).tolist() == [1, 0, 0, 1, 1, 0]
+
+    def test_empty(self):
+        assert threshold_weights(np.array([]), 0.0).shape == (0,)
+
 
 class TestBuyAndHold:
     def test_all_weights_equal_one(self, prices_dict):
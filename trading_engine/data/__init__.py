@@ -2,5 +2,24 @@
 from trading_engine.data.yfinance_loader import YFinanceLoader
 from trading_engine.data.vnstock_loader import VNStockLoader
 from trading_engine.data.csv_loader import CSVLoader
+from trading_engine.data.parquet_loader import ParquetLoader
+from trading_engine.data.synthetic import SyntheticLoader
+from trading_engine.data.cache import CachedLoader
+from trading_engine.data.chunked import ChunkedLoader
+from trading_engine.data.single_flight import CoalescingLoader, SingleFlight
+from trading_engine.data.async_loader import ThreadedAsyncLoader, as_async, load_many
 
-__all__ = ["YFinanceLoader", "VNStockLoader", "CSVLoader"]
+__all__ = [
+    "YFinanceLoader",
+    "VNStockLoader",
+    "CSVLoader",
+    "ParquetLoader",
+    "SyntheticLoader",
+    "CachedLoader",
+    "ChunkedLoader",
+    "CoalescingLoader",
+    "SingleFlight",
+    "ThreadedAsyncLoader",
+    "as_async",
+    "load_many",
+]
@@ -0,0 +1,138 @@
+"""Async multi-symbol loading — bounded-concurrency fetches over any loader.
+
+Blocking loaders (yfinance, vnstock, CSV) are adapted with as_async(), which
+runs each load() in a worker thread.  load_many() then fans out one task per
+symbol under a semaphore, so N symbols cost roughly N / max_concurrency
+round-trips instead of N.  Loaders that implement BatchDataLoader (yfinance)
+fan out one batched call per BATCH_SIZE symbols instead, under the same
+semaphore and timeout.
+"""
+from __future__ import annotations
+
+import asyncio
+import inspect
+from datetime import date
+
+from trading_engine.types import (
+    AsyncDataLoader,
+    BatchDataLoader,
+    DataLoader,
+    DataLoadError,
+    PriceFrame,
+)
+
+
+class ThreadedAsyncLoader:
+    """Adapts a blocking DataLoader to the AsyncDataLoader protocol.
+
+    Implements the AsyncDataLoader protocol.
+    """
+
+    def __init__(self, loader: DataLoader):
+        self.loader = loader
+
+    async def load(self, symbol: str, start: date, end: date) -> PriceFrame:
+        return await asyncio.to_thread(self.loader.load, symbol, start, end)
+
+
+def as_async(loader: DataLoader | AsyncDataLoader) -> AsyncDataLoader:
+    """Return loader unchanged if it is already async, else wrap it."""
+    if inspect.iscoroutinefunction(loader.load):
+        return loader  # type: ignore[return-value]
+    return ThreadedAsyncLoader(loader)  # type: ignore[arg-type]
+
+
+async def load_many(
+    loader: DataLoader | AsyncDataLoader,
+    symbols: list[str],
+    start: date,
+    end: date,
+    max_concurrency: int = 8,
+    timeout: float | None = None,
+) -> tuple[dict[str, PriceFrame], dict[str, DataLoadError]]:
+    """Load many symbols concurrently.
+
+    Args:
+        loader: Any DataLoader or AsyncDataLoader.
+        symbols: Symbols to load.  Result order follows this list.
+        start, end: Date range passed to every load().
+        max_concurrency: Upper bound on in-flight loads.
+        timeout: Per-symbol timeout in seconds (None = no limit); for a
+            BatchDataLoader, per batched call.  A timed-out blocking load keeps
+            running in its thread; only the wait is abandoned.
+
+    Returns:
+        (prices, errors).  Failures never raise — a DataLoadError or timeout
+        for one symbol is recorded in errors and the rest still load.
+    """
+    if max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be >= 1, got {max_concurrency}")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    if isinstance(loader, BatchDataLoader):
+        return await _load_batches(loader, symbols, start, end, semaphore, timeout)
+
+    async_loader = as_async(loader)
+
+    async def _load_one(symbol: str) -> PriceFrame:
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    async_loader.load(symbol, start, end), timeout=timeout
+                )
+            except TimeoutError as e:
+                raise DataLoadError(
+                    f"Timed out loading {symbol} after {timeout}s"
+                ) from e
+
+    outcomes = await asyncio.gather(
+        *(_load_one(symbol) for symbol in symbols), return_exceptions=True
+    )
+
+    prices: dict[str, PriceFrame] = {}
+    errors: dict[str, DataLoadError] = {}
+    for symbol, outcome in zip(symbols, outcomes):
+        if isinstance(outcome, DataLoadError):
+            errors[symbol] = outcome
+        elif isinstance(outcome, BaseException):
+            raise outcome
+        else:
+            prices[symbol] = outcome
+    return prices, errors
+
+
+async def _load_batches(
+    loader: BatchDataLoader,
+    symbols: list[str],
+    start: date,
+    end: date,
+    semaphore: asyncio.Semaphore,
+    timeout: float | None,
+) -> tuple[dict[str, PriceFrame], dict[str, DataLoadError]]:
+    """load_many() for a BatchDataLoader: one load_many call per BATCH_SIZE
+    symbols (all of them when the loader has no BATCH_SIZE)."""
+    size = getattr(loader, "BATCH_SIZE", None) or max(len(symbols), 1)
+    batches = [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+    async def _load_batch(batch: list[str]):
+        async with semaphore:
+            try:
+                return await asyncio.wait_for(
+                    asyncio.to_thread(loader.load_many, batch, start, end), timeout=timeout
+                )
+            except TimeoutError:
+                error = DataLoadError(
+                    f"Timed out loading a batch of {len(batch)} symbols after {timeout}s"
+                )
+                return {}, {symbol: error for symbol in batch}
+
+    outcomes = await asyncio.gather(*(_load_batch(batch) for batch in batches))
+
+    loaded: dict[str, PriceFrame] = {}
+    failed: dict[str, DataLoadError] = {}
+    for batch_prices, batch_errors in outcomes:
+        loaded.update(batch_prices)
+        failed.update(batch_errors)
+    prices = {symbol: loaded[symbol] for symbol in symbols if symbol in loaded}
+    errors = {symbol: failed[symbol] for symbol in symbols if symbol in failed}
+    return prices, errors
@@ -0,0 +1,223 @@
+"""On-disk price cache — wraps any DataLoader with a per-symbol columnar store.
+
+Each symbol's history is kept in one ``.npz`` file: an int64 epoch-day date
+column, one float64 array per OHLCV field, and the date range the file is
+known to cover.  A request only fetches the missing head and/or tail of its
+range from the wrapped loader, then merges the new bars into the store.
+
+Coverage is tracked separately from the first/last bar because markets have
+holidays: a request starting on a Saturday has no bar on its start date, but
+the store still knows nothing is missing there.
+"""
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from trading_engine.types import (
+    DataLoadError,
+    DataLoader,
+    NoDataError,
+    PartialLoadError,
+    PriceFrame,
+)
+
+_EPOCH = date(1970, 1, 1)
+_COLUMNS = ("open", "high", "low", "close", "volume")
+
+
+class CachedLoader:
+    """DataLoader wrapper that persists fetched bars to a local store.
+
+    Implements the DataLoader protocol.
+
+    The store never claims coverage of today: the current session's bar may
+    still be moving, so it is always re-fetched as part of the tail top-up.
+    Top-up fetches overlap the covered boundary by one day so loaders with an
+    exclusive ``end`` (yfinance) never leave a gap at the seam.
+
+    Args:
+        loader: The underlying DataLoader to fetch missing ranges from.
+        cache_dir: Root directory of the store.
+        namespace: Sub-directory for this loader's files.  Defaults to the
+            wrapped loader's class name so sources never share a file.
+    """
+
+    def __init__(
+        self,
+        loader: DataLoader,
+        cache_dir: str | Path,
+        namespace: str | None = None,
+    ):
+        self.loader = loader
+        self.cache_dir = Path(cache_dir) / (namespace or type(loader).__name__)
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def load(self, symbol: str, start: date, end: date) -> PriceFrame:
+        with self._symbol_lock(symbol):
+            stored = self._read(symbol)
+
+            if stored is None:
+                try:
+                    fresh = self.loader.load(symbol, start, end)
+                except PartialLoadError as e:
+                    # Keep the chunks that did load; the next request tops up the rest.
+                    self._save(symbol, e.frame.data, e.frame.source, e.covered)
+                    raise
+                df, source = fresh.data, fresh.source
+                covered = (start, end)
+                changed = True
+            else:
+                df, source, covered = stored
+                changed = False
+                if start < covered[0]:
+                    head = self._top_up(symbol, start, covered[0])
+                    if head is not None and head[1][1] >= covered[0]:
+                        df = _merge([head[0], df])
+                        covered = (head[1][0], covered[1])
+                        changed = True
+                if end > covered[1]:
+                    tail = self._top_up(symbol, covered[1], end)
+                    if tail is not None and tail[1][0] <= covered[1]:
+                        df = _merge([df, tail[0]])
+                        covered = (covered[0], tail[1][1])
+                        changed = True
+
+            if changed:
+                self._save(symbol, df, source, covered)
+
+        sliced = df.loc[str(start):str(end)]
+        if sliced.empty:
+            raise NoDataError(
+                f"No data for {symbol} in date range {start} to {end}"
+            )
+        return PriceFrame(symbol=symbol, data=sliced, source=source)
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Drop the stored history for one symbol, or for every symbol.
+
+        Call this when the vendor revises history (splits, corrections);
+        the next load re-fetches the full requested range.
+        """
+        if symbol is not None:
+            with self._symbol_lock(symbol):
+                self._path(symbol).unlink(missing_ok=True)
+            return
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*.npz"):
+                path.unlink(missing_ok=True)
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        """One lock per symbol, so concurrent loads of different symbols overlap."""
+        with self._locks_guard:
+            return self._locks.setdefault(symbol, threading.Lock())
+
+    def _top_up(
+        self, symbol: str, start: date, end: date
+    ) -> tuple[pd.DataFrame, tuple[date, date]] | None:
+        """Fetch one missing edge as (bars, range covered).
+
+        An edge the loader reports as empty (NoDataError: before the listing,
+        a weekend or holiday) comes back as no bars covering it, so it is
+        recorded and not fetched again.  None means the fetch failed; the
+        coverage is left unchanged and the edge is retried on the next request.
+        """
+        try:
+            return self.loader.load(symbol, start, end).data, (start, end)
+        except PartialLoadError as e:
+            return e.frame.data, e.covered
+        except NoDataError:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name="date")), (start, end)
+        except DataLoadError:
+            return None
+
+    def _save(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        source: str,
+        covered: tuple[date, date],
+    ) -> None:
+        # Never record today as covered — its bar is not final yet.
+        yesterday = date.today() - timedelta(days=1)
+        covered = (covered[0], min(covered[1], yesterday))
+        if covered[0] <= covered[1]:
+            self._write(symbol, df, source, covered)
+
+    def _path(self, symbol: str) -> Path:
+        safe = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+        return self.cache_dir / f"{safe}.npz"
+
+    def _read(self, symbol: str) -> tuple[pd.DataFrame, str, tuple[date, date]] | None:
+        path = self._path(symbol)
+        if not path.exists():
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as store:
+                index = _days_to_index(store["date"])
+                data = {
+                    col: store[col] for col in _COLUMNS if col in store.files
+                }
+                source = str(store["source"])
+                covered = (
+                    _EPOCH + timedelta(days=int(store["covered"][0])),
+                    _EPOCH + timedelta(days=int(store["covered"][1])),
+                )
+        except (OSError, ValueError, KeyError):
+            # Corrupt or foreign file — treat as a miss and rebuild it.
+            return None
+        df = pd.DataFrame(data, index=index)
+        return df, source, covered
+
+    def _write(
+        self,
+        symbol: str,
+        df: pd.DataFrame,
+        source: str,
+        covered: tuple[date, date],
+    ) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        arrays = {
+            col: df[col].to_numpy(dtype=np.float64)
+            for col in _COLUMNS if col in df.columns
+        }
+        arrays["date"] = _index_to_days(df.index)
+        arrays["source"] = np.array(source)
+        arrays["covered"] = np.array(
+            [(covered[0] - _EPOCH).days, (covered[1] - _EPOCH).days],
+            dtype=np.int64,
+        )
+        # Write to a temp file and rename so readers never see a partial store.
+        fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as fh:
+                np.savez(fh, **arrays)
+            os.replace(tmp, self._path(symbol))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+
+def _merge(parts: list[pd.DataFrame]) -> pd.DataFrame:
+    """Concatenate frames; on duplicate dates the later (fresher) bar wins."""
+    df = pd.concat([p for p in parts if not p.empty] or parts[:1])
+    df = df[~df.index.duplicated(keep="last")]
+    return df.sort_index()
+
+
+def _index_to_days(index: pd.Index) -> np.ndarray:
+    return pd.DatetimeIndex(index).values.astype("datetime64[D]").astype(np.int64)
+
+
+def _days_to_index(days: np.ndarray) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(days.astype("datetime64[D]"), name="date")
@@ -0,0 +1,182 @@
+"""Exchange trading calendars — weekdays minus market holidays.
+
+Used by SyntheticLoader to lay out bars on realistic dates.  Both calendars
+are rule-based approximations, good enough for benchmarking but not for
+settlement:
+
+- "us": NYSE full-day holidays (New Year's, MLK, Presidents', Good Friday,
+  Memorial, Juneteenth, Independence, Labor, Thanksgiving, Christmas).
+  One-off closures (9/11, national days of mourning) are not included.
+- "vn": HOSE holidays (New Year's, the Tết week, Hung Kings, Reunification,
+  Labour, National Day), with weekend holidays moved to the next weekday.
+  Lunar dates come from an astronomical new-moon approximation in UTC+7;
+  leap months are ignored, so Hung Kings can be a lunation off in a year
+  with a leap first or second month.
+"""
+from __future__ import annotations
+
+import math
+from datetime import date, timedelta
+from functools import lru_cache
+
+import numpy as np
+from pandas.tseries.holiday import (
+    AbstractHolidayCalendar,
+    GoodFriday,
+    Holiday,
+    USLaborDay,
+    USMemorialDay,
+    USPresidentsDay,
+    USThanksgivingDay,
+    nearest_workday,
+    sunday_to_monday,
+)
+from pandas.tseries.offsets import DateOffset
+
+CALENDARS = ("us", "vn")
+
+
+class _NYSEHolidays(AbstractHolidayCalendar):
+    rules = [
+        Holiday("New Year's Day", month=1, day=1, observance=sunday_to_monday),
+        Holiday(
+            "Martin Luther King Jr. Day", month=1, day=1,
+            offset=DateOffset(weekday=0, weeks=2), start_date=date(1998, 1, 1),
+        ),
+        USPresidentsDay,
+        GoodFriday,
+        USMemorialDay,
+        Holiday(
+            "Juneteenth", month=6, day=19,
+            observance=nearest_workday, start_date=date(2022, 1, 1),
+        ),
+        Holiday("Independence Day", month=7, day=4, observance=nearest_workday),
+        USLaborDay,
+        USThanksgivingDay,
+        Holiday("Christmas Day", month=12, day=25, observance=nearest_workday),
+    ]
+
+
+def trading_days(start: date, end: date, calendar: str = "us") -> np.ndarray:
+    """Trading days in [start, end] as int64 days since 1970-01-01."""
+    if calendar not in CALENDARS:
+        raise ValueError(f"Unknown calendar {calendar!r}; expected one of {CALENDARS}")
+    if end < start:
+        return np.empty(0, dtype=np.int64)
+
+    days = np.arange(
+        np.datetime64(start, "D"), np.datetime64(end, "D") + 1, dtype="datetime64[D]"
+    )
+    closed = np.concatenate(
+        [holidays(year, calendar) for year in range(start.year, end.year + 1)]
+    )
+    return days[np.is_busday(days, holidays=closed)].astype(np.int64)
+
+
+@lru_cache(maxsize=None)
+def holidays(year: int, calendar: str = "us") -> np.ndarray:
+    """Weekday market closures in one year, as datetime64[D]."""
+    if calendar == "us":
+        closed = _NYSEHolidays().holidays(date(year, 1, 1), date(year, 12, 31))
+        return closed.values.astype("datetime64[D]")
+    if calendar == "vn":
+        return np.array(sorted(_vn_holidays(year)), dtype="datetime64[D]")
+    raise ValueError(f"Unknown calendar {calendar!r}; expected one of {CALENDARS}")
+
+
+# ── Vietnam ──────────────────────────────────────────────────────────────────
+
+def _vn_holidays(year: int) -> set[date]:
+    tet = lunar_new_year(year)
+    closed = {tet + timedelta(days=i) for i in range(-2, 5)}  # the Tết week
+
+    fixed = [date(year, 1, 1), date(year, 4, 30), date(year, 5, 1), date(year, 9, 2)]
+    if year >= 2007:
+        fixed.append(_hung_kings(year))
+    for day in sorted(fixed):
+        # A holiday on a weekend (or on another holiday) is taken on the next free weekday.
+        while day.weekday() >= 5 or day in closed:
+            day += timedelta(days=1)
+        closed.add(day)
+    return {d for d in closed if d.weekday() < 5}
+
+
+@lru_cache(maxsize=None)
+def lunar_new_year(year: int) -> date:
+    """Tết: the second new moon after the one that begins the solstice month."""
+    return _new_moon(_solstice_lunation(year) + 2)
+
+
+def _hung_kings(year: int) -> date:
+    """10th day of the 3rd lunar month (leap months ignored)."""
+    return _new_moon(_solstice_lunation(year) + 4) + timedelta(days=9)
+
+
+def _solstice_lunation(year: int) -> int:
+    """Index of the last new moon on or before the December solstice of year - 1."""
+    solstice = _december_solstice(year - 1)
+    k = math.floor((solstice - _REFERENCE_NEW_MOON).days / _SYNODIC_MONTH)
+    while _new_moon(k + 1) <= solstice:
+        k += 1
+    while _new_moon(k) > solstice:
+        k -= 1
+    return k
+
+
+_SYNODIC_MONTH = 29.530588861
+_REFERENCE_NEW_MOON = date(2000, 1, 6)
+_JD_ORDINAL_OFFSET = 1721425  # Julian Day Number of date.fromordinal(1) is 1721426
+
+
+def _december_solstice(year: int) -> date:
+    """Local (UTC+7) date of the December solstice (Meeus, ch. 27, mean terms)."""
+    y = (year - 2000) / 1000
+    jde = (
+        2451900.05952 + 365242.74049 * y
+        - 0.06223 * y**2 - 0.00823 * y**3 + 0.00032 * y**4
+    )
+    return _local_date(jde)
+
+
+@lru_cache(maxsize=None)
+def _new_moon(k: int) -> date:
+    """Local (UTC+7) date of the k-th new moon after 2000-01-06 (Meeus, ch. 49)."""
+    t = k / 1236.85
+    jde = (
+        2451550.09766 + _SYNODIC_MONTH * k
+        + 0.00015437 * t**2 - 0.000000150 * t**3 + 0.00000000073 * t**4
+    )
+    e = 1 - 0.002516 * t - 0.0000074 * t**2
+    m = math.radians(2.5534 + 29.10535670 * k - 0.0000014 * t**2 - 0.00000011 * t**3)
+    mp = math.radians(
+        201.5643 + 385.81693528 * k + 0.0107582 * t**2
+        + 0.00001238 * t**3 - 0.000000058 * t**4
+    )
+    f = math.radians(
+        160.7108 + 390.67050284 * k - 0.0016118 * t**2
+        - 0.00000227 * t**3 + 0.000000011 * t**4
+    )
+    omega = math.radians(124.7746 - 1.56375588 * k + 0.0020672 * t**2 + 0.00000215 * t**3)
+    jde += (
+        -0.40720 * math.sin(mp)
+        + 0.17241 * e * math.sin(m)
+        + 0.01608 * math.sin(2 * mp)
+        + 0.01039 * math.sin(2 * f)
+        + 0.00739 * e * math.sin(mp - m)
+        - 0.00514 * e * math.sin(mp + m)
+        + 0.00208 * e * e * math.sin(2 * m)
+        - 0.00111 * math.sin(mp - 2 * f)
+        - 0.00057 * math.sin(mp + 2 * f)
+        + 0.00056 * e * math.sin(2 * mp + m)
+        - 0.00042 * math.sin(3 * mp)
+        + 0.00042 * e * math.sin(m + 2 * f)
+        + 0.00038 * e * math.sin(m - 2 * f)
+        - 0.00024 * e * math.sin(2 * mp - m)
+        - 0.00017 * math.sin(omega)
+    )
+    return _local_date(jde)
+
+
+def _local_date(jde: float) -> date:
+    """Calendar date in UTC+7 of a Julian Ephemeris Day."""
+    return date.fromordinal(math.floor(jde + 0.5 + 7 / 24) - _JD_ORDINAL_OFFSET)
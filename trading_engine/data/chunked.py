@@ -0,0 +1,133 @@
+"""Chunked long-range fetching — split multi-year requests into parallel pieces.
+
+A 20-year request sent as one download often times out and is then retried
+from scratch.  ChunkedLoader splits the range on calendar-year boundaries,
+fetches the chunks concurrently, retries only the chunks that failed, and
+stitches the results into one PriceFrame.
+
+Chunk boundaries overlap by one day (each chunk ends on the next one's start
+date) so loaders with an exclusive ``end`` (yfinance) never drop the boundary
+bar; duplicates are removed when stitching.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date
+
+import pandas as pd
+
+from trading_engine.types import (
+    DataLoader,
+    DataLoadError,
+    NoDataError,
+    PartialLoadError,
+    PriceFrame,
+)
+
+
+class ChunkedLoader:
+    """DataLoader wrapper that fetches long ranges in year-sized chunks.
+
+    Implements the DataLoader protocol.
+
+    A chunk whose loader raises NoDataError is empty history (before the
+    listing, after a delisting, a long suspension, or a range with no trading
+    days) and is not retried.  Other DataLoadErrors are retried.  Chunks that
+    still fail before the first one that returns data are also treated as
+    empty history, since some vendors report an empty range and a failed
+    range the same way.  A chunk that still fails once data has started raises
+    PartialLoadError carrying the contiguous bars loaded before it.
+
+    Args:
+        loader: The underlying DataLoader.
+        chunk_years: Calendar years per chunk.
+        max_workers: Upper bound on concurrent chunk fetches.
+    """
+
+    MAX_RETRIES = 2
+
+    def __init__(self, loader: DataLoader, chunk_years: int = 1, max_workers: int = 4):
+        if chunk_years < 1:
+            raise ValueError(f"chunk_years must be >= 1, got {chunk_years}")
+        self.loader = loader
+        self.chunk_years = chunk_years
+        self.max_workers = max_workers
+
+    def load(self, symbol: str, start: date, end: date) -> PriceFrame:
+        chunks = year_chunks(start, end, self.chunk_years)
+        if len(chunks) == 1:
+            return self.loader.load(symbol, start, end)
+
+        loaded: dict[int, PriceFrame] = {}
+        failed: dict[int, Exception] = {}
+        pending = list(range(len(chunks)))
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as pool:
+            for _ in range(self.MAX_RETRIES + 1):
+                futures = {
+                    pool.submit(self.loader.load, symbol, *chunks[i]): i
+                    for i in pending
+                }
+                pending = []
+                for future in as_completed(futures):
+                    i = futures[future]
+                    try:
+                        loaded[i] = future.result()
+                        failed.pop(i, None)
+                    except NoDataError:
+                        failed.pop(i, None)  # empty history; nothing to retry
+                    except DataLoadError as e:
+                        failed[i] = e
+                        pending.append(i)
+                if not pending:
+                    break
+
+        if not loaded:
+            last_error = next(iter(failed.values()), None)
+            if last_error is None:
+                raise NoDataError(
+                    f"No data for {symbol} in date range {start} to {end}"
+                )
+            raise DataLoadError(
+                f"No data for {symbol} in any of {len(chunks)} chunks "
+                f"from {start} to {end}. Last error: {last_error}"
+            )
+
+        first = min(loaded)
+        gaps = sorted(i for i in failed if i > first)
+        stop = gaps[0] if gaps else len(chunks)
+        frame = _stitch([loaded[i] for i in range(first, stop) if i in loaded])
+
+        if gaps:
+            covered = (start, chunks[stop - 1][1])
+            raise PartialLoadError(
+                f"Loaded {symbol} only through {covered[1]}: chunk "
+                f"{chunks[stop][0]}..{chunks[stop][1]} failed after "
+                f"{self.MAX_RETRIES + 1} attempts: {failed[stop]}",
+                frame=frame,
+                covered=covered,
+            )
+        return frame
+
+
+def year_chunks(start: date, end: date, years: int = 1) -> list[tuple[date, date]]:
+    """Split [start, end] on calendar-year boundaries.
+
+    Each chunk ends on the next chunk's start date (one-day overlap).
+    """
+    chunks: list[tuple[date, date]] = []
+    cursor = start
+    while True:
+        boundary = date(cursor.year + years, 1, 1)
+        chunk_end = min(end, boundary)
+        chunks.append((cursor, chunk_end))
+        if chunk_end >= end:
+            return chunks
+        cursor = chunk_end
+
+
+def _stitch(frames: list[PriceFrame]) -> PriceFrame:
+    """Concatenate chunk frames in order; overlapping boundary bars keep the later chunk."""
+    df = pd.concat([pf.data for pf in frames])
+    df = df[~df.index.duplicated(keep="last")].sort_index()
+    return PriceFrame(symbol=frames[0].symbol, data=df, source=frames[0].source)
@@ -1,12 +1,26 @@
-"""CSV data loader — reads OHLCV data from local CSV files."""
+"""CSV data loader — reads OHLCV data from local CSV files.
+
+Parsing a large CSV archive on every load dominates backtest time, so each
+CSV is parsed once into a sidecar directory of ``.npy`` columns (int64
+epoch-day dates + float64 OHLCV).  Later loads memory-map the sidecar and hand
+back views of the rows inside the requested window, without copying.  A
+sidecar is rebuilt whenever its CSV's mtime or size changes.
+"""
 from __future__ import annotations
 
+import json
+import os
+import threading
 from datetime import date
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
-from trading_engine.types import DataLoadError, PriceFrame
+from trading_engine.types import DataLoadError, NoDataError, PriceFrame
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+_SIDECAR_VERSION = 1
 
 
 class CSVLoader:
@@ -15,54 +29,189 @@ class CSVLoader:
     Implements the DataLoader protocol.
     The CSV must have a 'Date' or 'date' column (or a DatetimeIndex)
     and at minimum: open, high, low, close columns (case-insensitive).
+
+    Args:
+        base_dir: Directory holding the CSV files.
+        sidecar_dir: Where parsed sidecars are written.  Defaults to
+            ``base_dir/.sidecar``.  If it cannot be written, loads fall back
+            to parsing the CSV directly.
     """
 
-    def __init__(self, base_dir: str | Path):
+    def __init__(self, base_dir: str | Path, sidecar_dir: str | Path | None = None):
         self.base_dir = Path(base_dir)
+        self.sidecar_dir = Path(sidecar_dir) if sidecar_dir else self.base_dir / ".sidecar"
+        self._manifest: list[Path] | None = None
+        self._listed: int | None = None  # base_dir mtime when _manifest was listed
+        self._resolved: dict[str, Path] = {}
+        # csv path -> (stat signature, memory-mapped columns)
+        self._opened: dict[Path, tuple[tuple[int, int], dict[str, np.ndarray]]] = {}
+        self._lock = threading.Lock()
+        self._path_locks: dict[Path, threading.Lock] = {}
 
     def load(self, symbol: str, start: date, end: date) -> PriceFrame:
-        # Find a CSV file matching the symbol
-        pattern = f"*{symbol}*.csv"
-        matches = sorted(self.base_dir.glob(pattern))
-
-        if not matches:
-            raise DataLoadError(
-                f"No CSV file matching '{pattern}' in {self.base_dir}"
+        filepath = self._resolve(symbol)
+        columns = self._columns(filepath)
+
+        dates = columns["date"]
+        lo = np.searchsorted(dates, _to_day(start), side="left")
+        hi = np.searchsorted(dates, _to_day(end), side="right")
+        if lo >= hi:
+            raise NoDataError(
+                f"No data for {symbol} in date range {start} to {end}"
             )
 
-        filepath = matches[-1]  # use most recent if multiple
+        return PriceFrame.from_arrays(
+            symbol,
+            np.asarray(dates[lo:hi]),
+            {col: np.asarray(columns[col][lo:hi]) for col in _COLUMNS if col in columns},
+            source="csv",
+        )
+
+    # ── Manifest ─────────────────────────────────────────────────────────────
+
+    def _resolve(self, symbol: str) -> Path:
+        """Map a symbol to its CSV via the manifest (most recent match wins).
+
+        The directory is listed once, and re-listed when its mtime changes (a
+        file was added, removed or renamed) or a symbol has no match, so newer
+        exports and renamed files are picked up without a restart.
+        """
+        listed = _mtime_ns(self.base_dir)
+        with self._lock:
+            if listed != self._listed:
+                self._manifest = None
+                self._resolved.clear()
+            resolved = self._resolved.get(symbol)
+            if resolved is not None and resolved.exists():
+                return resolved
+            for refresh in (False, True):
+                if refresh or self._manifest is None:
+                    self._manifest = sorted(self.base_dir.glob("*.csv"))
+                    self._listed = listed
+                matches = [p for p in self._manifest if symbol in p.stem]
+                if matches:
+                    self._resolved[symbol] = matches[-1]
+                    return matches[-1]
+
+        raise DataLoadError(
+            f"No CSV file matching '*{symbol}*.csv' in {self.base_dir}"
+        )
+
+    # ── Sidecar ──────────────────────────────────────────────────────────────
+
+    def _columns(self, filepath: Path) -> dict[str, np.ndarray]:
+        """Return the parsed columns of a CSV, (re)building its sidecar if stale."""
         try:
-            df = pd.read_csv(filepath, parse_dates=True)
-        except Exception as e:
+            st = filepath.stat()
+        except OSError as e:
             raise DataLoadError(f"Failed to read {filepath}: {e}") from e
-
-        # Normalize the index
-        date_col = None
-        for col in df.columns:
-            if col.lower() in ("date", "time", "datetime"):
-                date_col = col
-                break
-
-        if date_col is not None:
-            df[date_col] = pd.to_datetime(df[date_col])
-            df = df.set_index(date_col)
-        elif not isinstance(df.index, pd.DatetimeIndex):
-            raise DataLoadError(
-                f"CSV {filepath} has no recognizable date column"
-            )
-
-        df.index.name = "date"
-        df.columns = df.columns.str.lower()
-
-        # Filter to date range
-        df = df.loc[str(start):str(end)]
-
-        if df.empty:
-            raise DataLoadError(
-                f"No data for {symbol} in date range {start} to {end}"
-            )
-
-        keep = [c for c in ["open", "high", "low", "close", "volume"] if c in df.columns]
-        df = df[keep].dropna(subset=["open", "high", "low", "close"])
-
-        return PriceFrame(symbol=symbol, data=df, source="csv")
+        signature = (st.st_mtime_ns, st.st_size)
+
+        with self._path_lock(filepath):
+            opened = self._opened.get(filepath)
+            if opened is not None and opened[0] == signature:
+                return opened[1]
+
+            sidecar = self.sidecar_dir / filepath.stem
+            columns = _read_sidecar(sidecar, signature)
+            if columns is None:
+                df = _parse_csv(filepath)
+                columns = {
+                    "date": df.index.values.astype("datetime64[D]").astype(np.int64),
+                    **{c: df[c].to_numpy(dtype=np.float64) for c in df.columns},
+                }
+                try:
+                    _write_sidecar(sidecar, signature, columns)
+                except OSError:
+                    pass  # read-only archive — serve from memory this time
+            self._opened[filepath] = (signature, columns)
+            return columns
+
+    def _path_lock(self, filepath: Path) -> threading.Lock:
+        """One lock per CSV, so first-time parses of different files overlap."""
+        with self._lock:
+            return self._path_locks.setdefault(filepath, threading.Lock())
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return None
+
+
+def _parse_csv(filepath: Path) -> pd.DataFrame:
+    """Parse and normalize a CSV into a sorted OHLCV frame."""
+    try:
+        df = pd.read_csv(filepath, parse_dates=True)
+    except Exception as e:
+        raise DataLoadError(f"Failed to read {filepath}: {e}") from e
+
+    # Normalize the index
+    date_col = None
+    for col in df.columns:
+        if col.lower() in ("date", "time", "datetime"):
+            date_col = col
+            break
+
+    if date_col is not None:
+        df[date_col] = pd.to_datetime(df[date_col])
+        df = df.set_index(date_col)
+    elif not isinstance(df.index, pd.DatetimeIndex):
+        raise DataLoadError(
+            f"CSV {filepath} has no recognizable date column"
+        )
+
+    df.index.name = "date"
+    df.columns = df.columns.str.lower()
+
+    missing = {"open", "high", "low", "close"} - set(df.columns)
+    if missing:
+        raise DataLoadError(f"CSV {filepath} missing columns: {missing}")
+
+    keep = [c for c in _COLUMNS if c in df.columns]
+    df = df[keep].dropna(subset=["open", "high", "low", "close"])
+    return df.sort_index(kind="stable")
+
+
+def _read_sidecar(
+    sidecar: Path,
+    signature: tuple[int, int],
+) -> dict[str, np.ndarray] | None:
+    meta_path = sidecar / "meta.json"
+    try:
+        meta = json.loads(meta_path.read_text())
+        if meta.get("version") != _SIDECAR_VERSION or tuple(meta["signature"]) != signature:
+            return None
+        return {
+            col: np.load(sidecar / f"{col}.npy", mmap_mode="r")
+            for col in ["date", *meta["columns"]]
+        }
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _write_sidecar(
+    sidecar: Path,
+    signature: tuple[int, int],
+    columns: dict[str, np.ndarray],
+) -> None:
+    sidecar.mkdir(parents=True, exist_ok=True)
+    for col, arr in columns.items():
+        tmp = sidecar / f"{col}.npy.tmp"
+        with open(tmp, "wb") as fh:
+            np.save(fh, arr)
+        os.replace(tmp, sidecar / f"{col}.npy")
+    # meta.json is written last: it is what marks the sidecar as valid.
+    meta = {
+        "version": _SIDECAR_VERSION,
+        "signature": list(signature),
+        "columns": [c for c in columns if c != "date"],
+    }
+    tmp = sidecar / "meta.json.tmp"
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, sidecar / "meta.json")
+
+
+def _to_day(d: date) -> int:
+    return int(np.datetime64(d, "D").astype(np.int64))
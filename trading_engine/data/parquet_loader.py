@@ -0,0 +1,269 @@
+"""Parquet data loader — reads OHLCV bars from a local Parquet data lake.
+
+The nightly export already lands as Parquet, so this reads it in place
+instead of converting to CSV.  Reads go through pyarrow.dataset with a
+symbol/date predicate and a column projection: only the row groups (and,
+for a partitioned layout, the files) that can hold the requested bars are
+opened, and only the OHLCV columns are decoded.
+
+A small JSON catalog (first date, last date, bar count per symbol) sits
+next to the data.  It lets callers validate requests and build universes
+without opening any data files; rebuild it with build_catalog() after each
+export.  A long-lived loader re-reads the catalog and re-lists the dataset
+whenever the catalog file changes, so it picks up each export's new symbols
+and partitions without a restart.
+
+pyarrow is an optional dependency, imported only when a dataset is opened.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+
+from trading_engine.types import CatalogEntry, DataLoadError, NoDataError, PriceFrame
+
+_COLUMNS = ("open", "high", "low", "close", "volume")
+_CATALOG_VERSION = 1
+
+
+class ParquetLoader:
+    """Loads historical OHLCV data from Parquet files.
+
+    Implements the DataLoader protocol.
+    Supported layouts, both with a "date" column (date32 or timestamp) and at
+    minimum open, high, low, close columns:
+
+    - partitioned: root/symbol=AAA/year=2020/*.parquet (hive-style
+      directories; the symbol and year partitions prune whole files)
+    - wide: one file, or a flat directory of files, holding every symbol
+      with a "symbol" column
+
+    Args:
+        path: Dataset root directory, or a single Parquet file.
+        catalog_path: Catalog location.  Defaults to ``_catalog.json`` in
+            the root directory, or ``<file>.catalog.json`` beside a file.
+    """
+
+    def __init__(self, path: str | Path, catalog_path: str | Path | None = None):
+        self.path = Path(path)
+        if catalog_path is not None:
+            self.catalog_path = Path(catalog_path)
+        elif self.path.is_dir():
+            self.catalog_path = self.path / "_catalog.json"
+        else:
+            self.catalog_path = self.path.with_suffix(".catalog.json")
+        self._dataset = None
+        self._catalog: dict[str, CatalogEntry] | None = None
+        self._catalog_signature: tuple[int, int] | None = None
+        self._lock = threading.Lock()
+
+    def load(self, symbol: str, start: date, end: date) -> PriceFrame:
+        self.validate(symbol, start, end)
+
+        dataset = self._open()
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        names = set(dataset.schema.names)
+        missing = {"open", "high", "low", "close", "date", "symbol"} - names
+        if missing:
+            raise DataLoadError(f"Parquet dataset {self.path} missing columns: {missing}")
+
+        date_type = dataset.schema.field("date").type
+        predicate = (
+            (ds.field("symbol") == symbol)
+            & (ds.field("date") >= _scalar(start, date_type))
+            & (ds.field("date") <= _scalar(end, date_type))
+        )
+        if "year" in names:  # partition pruning on the year directories
+            predicate &= (ds.field("year") >= start.year) & (ds.field("year") <= end.year)
+
+        try:
+            table = dataset.to_table(
+                columns=["date", *(c for c in _COLUMNS if c in names)],
+                filter=predicate,
+            )
+        except Exception as e:
+            raise DataLoadError(f"Failed to read {symbol} from {self.path}: {e}") from e
+        if table.num_rows == 0:
+            raise NoDataError(
+                f"No data for {symbol} in date range {start} to {end}"
+            )
+
+        table = table.sort_by("date")
+        days = pc.cast(table["date"], pa.date32(), safe=False).cast(pa.int32())
+        columns = {
+            col: table[col].to_numpy().astype(np.float64, copy=False)
+            for col in _COLUMNS if col in table.column_names
+        }
+        ohlc = np.vstack([columns[c] for c in ("open", "high", "low", "close")])
+        keep = ~np.isnan(ohlc).any(axis=0)
+        return PriceFrame.from_arrays(
+            symbol,
+            days.to_numpy().astype(np.int64)[keep],
+            {col: values[keep] for col, values in columns.items()},
+            source="parquet",
+        )
+
+    # ── Catalog ──────────────────────────────────────────────────────────────
+
+    def catalog(self) -> dict[str, CatalogEntry]:
+        """Per-symbol coverage from the catalog file (no data files opened).
+
+        Raises:
+            DataLoadError: If there is no readable catalog.
+        """
+        with self._lock:
+            self._refresh()
+            if self._catalog is None:
+                try:
+                    raw = json.loads(self.catalog_path.read_text())
+                    if raw.get("version") != _CATALOG_VERSION:
+                        raise ValueError(f"unsupported version {raw.get('version')}")
+                    self._catalog = {
+                        sym: CatalogEntry(
+                            symbol=sym,
+                            first_date=date.fromisoformat(e["first_date"]),
+                            last_date=date.fromisoformat(e["last_date"]),
+                            bars=int(e["bars"]),
+                        )
+                        for sym, e in raw["symbols"].items()
+                    }
+                except (OSError, ValueError, KeyError) as e:
+                    raise DataLoadError(
+                        f"No usable Parquet catalog at {self.catalog_path}: {e}. "
+                        f"Run ParquetLoader.build_catalog()."
+                    ) from e
+            return self._catalog
+
+    def symbols(self) -> list[str]:
+        """Every symbol in the catalog, sorted — a ready-made universe."""
+        return sorted(self.catalog())
+
+    def validate(self, symbol: str, start: date, end: date) -> None:
+        """Reject requests the catalog says cannot return bars.
+
+        A no-op when there is no catalog, so an uncataloged lake still loads.
+
+        Raises:
+            DataLoadError: If symbol is unknown or [start, end] misses its history.
+        """
+        if not self.catalog_path.exists():
+            return
+        entry = self.catalog().get(symbol)
+        if entry is None:
+            raise DataLoadError(f"{symbol} is not in the Parquet catalog {self.catalog_path}")
+        if end < entry.first_date or start > entry.last_date:
+            raise DataLoadError(
+                f"No data for {symbol} in date range {start} to {end} "
+                f"(history is {entry.first_date} to {entry.last_date})"
+            )
+
+    def build_catalog(self) -> dict[str, CatalogEntry]:
+        """Scan the symbol and date columns once and write the catalog."""
+        with self._lock:
+            self._dataset = None  # re-list: the export may have added files
+        dataset = self._open()
+        try:
+            table = dataset.to_table(columns=["symbol", "date"])
+        except Exception as e:
+            raise DataLoadError(f"Failed to scan {self.path}: {e}") from e
+        stats = table.group_by("symbol").aggregate(
+            [("date", "min"), ("date", "max"), ("date", "count")]
+        )
+
+        catalog = {
+            sym: CatalogEntry(
+                symbol=sym,
+                first_date=_as_date(first),
+                last_date=_as_date(last),
+                bars=int(bars),
+            )
+            for sym, first, last, bars in zip(
+                stats["symbol"].to_pylist(),
+                stats["date_min"].to_pylist(),
+                stats["date_max"].to_pylist(),
+                stats["date_count"].to_pylist(),
+            )
+        }
+        payload = {
+            "version": _CATALOG_VERSION,
+            "symbols": {
+                sym: {
+                    "first_date": e.first_date.isoformat(),
+                    "last_date": e.last_date.isoformat(),
+                    "bars": e.bars,
+                }
+                for sym, e in sorted(catalog.items())
+            },
+        }
+        tmp = self.catalog_path.with_name(self.catalog_path.name + ".tmp")
+        tmp.write_text(json.dumps(payload, indent=1))
+        os.replace(tmp, self.catalog_path)
+        with self._lock:
+            self._catalog = catalog
+            self._catalog_signature = _signature(self.catalog_path)
+        return catalog
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _refresh(self) -> None:
+        """Forget the catalog and dataset once the catalog file has changed.
+
+        Each export ends by rewriting the catalog, so a new catalog also means
+        new files to list.  Caller holds self._lock.
+        """
+        signature = _signature(self.catalog_path)
+        if signature != self._catalog_signature:
+            self._catalog = None
+            self._dataset = None
+            self._catalog_signature = signature
+
+    def _open(self):
+        """Discover the dataset once per catalog; file listing is the expensive part."""
+        with self._lock:
+            self._refresh()
+            if self._dataset is None:
+                try:
+                    import pyarrow.dataset as ds
+                except ImportError as e:
+                    raise DataLoadError(
+                        "ParquetLoader requires pyarrow (pip install pyarrow)"
+                    ) from e
+                try:
+                    self._dataset = ds.dataset(
+                        self.path,
+                        format="parquet",
+                        partitioning="hive",
+                    )
+                except (OSError, ValueError) as e:
+                    raise DataLoadError(f"Failed to open Parquet dataset {self.path}: {e}") from e
+            return self._dataset
+
+
+def _scalar(d: date, arrow_type):
+    """A date bound typed like the dataset's date column."""
+    import pyarrow as pa
+
+    if pa.types.is_timestamp(arrow_type):
+        return pa.scalar(datetime(d.year, d.month, d.day), type=arrow_type)
+    return pa.scalar(d, type=arrow_type)
+
+
+def _signature(path: Path) -> tuple[int, int] | None:
+    """(mtime, size) of a file, or None when it does not exist."""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _as_date(value: date | datetime) -> date:
+    return value.date() if isinstance(value, datetime) else value
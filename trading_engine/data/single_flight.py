@@ -0,0 +1,93 @@
+"""Single-flight request coalescing for concurrent loads.
+
+At market open many requests for the same ticker arrive together.  Without
+coalescing each one calls the vendor independently and we get rate limited.
+SingleFlight lets the first caller for a key do the work while every caller
+that arrives before it finishes waits on the same Future and shares the result.
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from datetime import date
+from typing import Callable, Generic, Hashable, TypeVar
+
+from trading_engine.types import DataLoader, PriceFrame
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """Deduplicates concurrent calls that share a key.
+
+    Thread-safe.  Results are not cached: once the leader finishes, the next
+    call for the same key starts a new flight.
+    """
+
+    def __init__(self) -> None:
+        self._inflight: dict[Hashable, Future[T]] = {}
+        self._lock = threading.Lock()
+
+    def claim(self, key: Hashable) -> tuple[Future[T], bool]:
+        """Join the flight for key.
+
+        Returns (future, is_leader).  The leader must resolve the future and
+        then call release(key); followers just wait on future.result().
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future, False
+            future = Future()
+            self._inflight[key] = future
+            return future, True
+
+    def release(self, key: Hashable) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """Run fn once per concurrent group of callers and share its outcome.
+
+        Exceptions raised by the leader are re-raised in every follower.
+        """
+        future, leader = self.claim(key)
+        if not leader:
+            return future.result()
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            self.release(key)
+
+
+class CoalescingLoader:
+    """DataLoader wrapper that coalesces concurrent identical loads.
+
+    Implements the DataLoader protocol.
+
+    Pass a shared SingleFlight to coalesce across loader instances (the API
+    builds a new loader per request).  Keys are (namespace, symbol, start,
+    end); namespace defaults to the wrapped loader's class name.
+    """
+
+    def __init__(
+        self,
+        loader: DataLoader,
+        flight: SingleFlight[PriceFrame] | None = None,
+        namespace: str | None = None,
+    ):
+        self.loader = loader
+        self.flight = flight if flight is not None else SingleFlight()
+        self.namespace = namespace or type(loader).__name__
+
+    def load(self, symbol: str, start: date, end: date) -> PriceFrame:
+        return self.flight.do(
+            (self.namespace, symbol, start, end),
+            lambda: self.loader.load(symbol, start, end),
+        )
@@ -1,11 +1,50 @@
 """VNStock data loader — fetches OHLCV data from Vietnamese stock market."""
 from __future__ import annotations
 
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from datetime import date
 
+import numpy as np
 import pandas as pd
 
-from trading_engine.types import DataLoadError, PriceFrame
+from trading_engine.types import DataLoadError, NoDataError, PriceFrame
+
+
+class LatencyTracker:
+    """Rolling per-source latency samples for vnstock requests.
+
+    Keeps the last `window` attempts per source (successes and failures) so
+    tail latency can be inspected without unbounded growth.  Thread-safe.
+    """
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._samples: dict[str, deque[tuple[float, bool]]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, source: str, seconds: float, ok: bool) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(source, deque(maxlen=self.window))
+            samples.append((seconds, ok))
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per source: attempt count, error count and p50/p95/p99 latency (s)."""
+        with self._lock:
+            snapshot = {src: list(s) for src, s in self._samples.items()}
+        out: dict[str, dict[str, float]] = {}
+        for source, samples in snapshot.items():
+            secs = np.array([s for s, _ in samples])
+            out[source] = {
+                "count": len(samples),
+                "errors": sum(1 for _, ok in samples if not ok),
+                "p50": float(np.percentile(secs, 50)),
+                "p95": float(np.percentile(secs, 95)),
+                "p99": float(np.percentile(secs, 99)),
+            }
+        return out
 
 
 class VNStockLoader:
@@ -13,43 +52,130 @@ class VNStockLoader:
 
     Implements the DataLoader protocol.
     Tries primary source first, then fallback. Retries 2x on timeout.
+
+    Hedged mode (opt-in via hedge_after): if the primary source has not
+    answered within hedge_after seconds, the fallback is fired in parallel
+    and whichever valid response arrives first wins.  The losing request is
+    left to finish in the background; its result is discarded.
+
+    Args:
+        source: Primary vnstock source ("KBS" or "VCI").
+        hedge_after: Latency budget in seconds before hedging, or None for
+            the plain sequential primary-then-fallback chain.
+        latency: Tracker to record per-source attempt latency into.  Pass a
+            shared tracker to aggregate across loader instances.
     """
 
     MAX_RETRIES = 2
 
-    def __init__(self, source: str = "KBS"):
+    def __init__(
+        self,
+        source: str = "KBS",
+        hedge_after: float | None = None,
+        latency: LatencyTracker | None = None,
+    ):
         self.source = source
         self._fallback = "VCI" if source == "KBS" else "KBS"
+        self.hedge_after = hedge_after
+        self.latency = latency if latency is not None else LatencyTracker()
 
     def load(self, symbol: str, start: date, end: date) -> PriceFrame:
-        from vnstock import Quote
-
         sources_to_try = [self.source, self._fallback]
+        errors: list[Exception] = []
 
-        for source in sources_to_try:
-            last_error: Exception | None = None
-            for attempt in range(self.MAX_RETRIES + 1):
+        if self.hedge_after is None:
+            for source in sources_to_try:
                 try:
-                    q = Quote(symbol=symbol.upper(), source=source)
-                    raw = q.history(
-                        start=start.isoformat(),
-                        end=end.isoformat(),
-                        interval="1D",
-                    )
-                    if raw is not None and not raw.empty:
-                        return self._normalize(raw, symbol)
-                    break  # empty result, try next source
+                    pf = self._load_from(source, symbol, start, end)
                 except Exception as e:
-                    last_error = e
-                    if attempt < self.MAX_RETRIES:
-                        continue
-                    break  # exhausted retries for this source
-
+                    errors.append(e)
+                    continue
+                if pf is not None:
+                    return pf
+        else:
+            pf = self._load_hedged(symbol, start, end, errors)
+            if pf is not None:
+                return pf
+
+        if not errors:
+            raise NoDataError(
+                f"No data for {symbol} from vnstock in date range {start} to {end} "
+                f"(tried: {sources_to_try})"
+            )
         raise DataLoadError(
             f"No data for {symbol} from vnstock (tried: {sources_to_try}). "
-            f"Last error: {last_error}"
+            f"Last error: {errors[-1]}"
         )
 
+    def _load_hedged(
+        self,
+        symbol: str,
+        start: date,
+        end: date,
+        errors: list[Exception],
+    ) -> PriceFrame | None:
+        """Race primary against fallback once the primary exceeds hedge_after.
+
+        The fallback also starts immediately if the primary finishes early
+        with no data or an error, matching the sequential chain.
+        """
+        pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="vnstock-hedge")
+        try:
+            pending: set[Future] = {
+                pool.submit(self._load_from, self.source, symbol, start, end)
+            }
+            fallback_started = False
+            while pending:
+                done, pending = wait(
+                    pending,
+                    timeout=None if fallback_started else self.hedge_after,
+                    return_when=FIRST_COMPLETED,
+                )
+                for future in done:
+                    try:
+                        pf = future.result()
+                    except Exception as e:
+                        errors.append(e)
+                        continue
+                    if pf is not None:
+                        return pf
+                if not fallback_started:
+                    pending.add(
+                        pool.submit(self._load_from, self._fallback, symbol, start, end)
+                    )
+                    fallback_started = True
+            return None
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _load_from(self, source: str, symbol: str, start: date, end: date) -> PriceFrame | None:
+        """Load from one vnstock source with retries.
+
+        Returns None on an empty result; raises the last error once retries
+        are exhausted.
+        """
+        from vnstock import Quote
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            began = time.perf_counter()
+            try:
+                q = Quote(symbol=symbol.upper(), source=source)
+                raw = q.history(
+                    start=start.isoformat(),
+                    end=end.isoformat(),
+                    interval="1D",
+                )
+            except Exception:
+                self.latency.record(source, time.perf_counter() - began, ok=False)
+                if attempt < self.MAX_RETRIES:
+                    continue
+                raise  # exhausted retries for this source
+            self.latency.record(source, time.perf_counter() - began, ok=True)
+            if raw is not None and not raw.empty:
+                return self._normalize(raw, symbol)
+            return None  # empty result, try next source
+        return None
+
     @staticmethod
     def _normalize(raw: pd.DataFrame, symbol: str) -> PriceFrame:
         """Normalize vnstock output to standard PriceFrame format."""
@@ -6,49 +6,99 @@ from datetime import date
 import pandas as pd
 import yfinance as yf
 
-from trading_engine.types import DataLoadError, PriceFrame
+from trading_engine.types import DataLoadError, NoDataError, PriceFrame
 
 
 class YFinanceLoader:
     """Loads historical OHLCV data from Yahoo Finance.
 
-    Implements the DataLoader protocol.
+    Implements the DataLoader and BatchDataLoader protocols.
     Retries 2x on timeout, raises DataLoadError after.
+
+    yf.download opens a new HTTP session per call unless one is passed in, so
+    the loader creates one session lazily and reuses it for every download.
     """
 
     MAX_RETRIES = 2
+    BATCH_SIZE = 50  # tickers per yf.download call in load_many()
+
+    def __init__(self, session=None):
+        self.session = session
 
     def load(self, symbol: str, start: date, end: date) -> PriceFrame:
-        last_error: Exception | None = None
+        df = self._download(symbol, start, end)
+
+        # yfinance sometimes returns MultiIndex columns
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = df.columns.get_level_values(0)
 
+        return self._normalize(df, symbol)
+
+    def load_many(
+        self,
+        symbols: list[str],
+        start: date,
+        end: date,
+    ) -> tuple[dict[str, PriceFrame], dict[str, DataLoadError]]:
+        """Load many symbols with one yf.download call per BATCH_SIZE chunk.
+
+        Returns (prices, errors) like trading_engine.data.load_many: a symbol
+        that comes back empty or malformed is recorded in errors, and a chunk
+        that fails after retries marks every symbol in it as failed.
+        """
+        prices: dict[str, PriceFrame] = {}
+        errors: dict[str, DataLoadError] = {}
+
+        for i in range(0, len(symbols), self.BATCH_SIZE):
+            chunk = symbols[i:i + self.BATCH_SIZE]
+            try:
+                df = self._download(chunk, start, end)
+            except DataLoadError as e:
+                for symbol in chunk:
+                    errors[symbol] = e
+                continue
+
+            for symbol in chunk:
+                try:
+                    prices[symbol] = self._normalize(
+                        _ticker_frame(df, symbol), symbol
+                    )
+                except DataLoadError as e:
+                    errors[symbol] = e
+
+        return prices, errors
+
+    def _download(self, tickers: str | list[str], start: date, end: date) -> pd.DataFrame:
+        """yf.download with retries on the shared session."""
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                df = yf.download(
-                    symbol,
+                return yf.download(
+                    tickers,
                     start=start.isoformat(),
                     end=end.isoformat(),
                     progress=False,
+                    session=self._session(),
                 )
-                break
             except Exception as e:
-                last_error = e
                 if attempt < self.MAX_RETRIES:
                     continue
                 raise DataLoadError(
-                    f"Failed to load {symbol} from yfinance after "
+                    f"Failed to load {tickers} from yfinance after "
                     f"{self.MAX_RETRIES + 1} attempts: {e}"
                 ) from e
-        else:
-            raise DataLoadError(
-                f"Failed to load {symbol} from yfinance: {last_error}"
-            )
+        raise AssertionError("unreachable")
 
-        # yfinance sometimes returns MultiIndex columns
-        if isinstance(df.columns, pd.MultiIndex):
-            df.columns = df.columns.get_level_values(0)
+    def _session(self):
+        if self.session is None:
+            from curl_cffi import requests as curl_requests
+            self.session = curl_requests.Session(impersonate="chrome")
+        return self.session
 
-        if df.empty:
-            raise DataLoadError(f"No data returned for {symbol} from yfinance")
+    @staticmethod
+    def _normalize(df: pd.DataFrame, symbol: str) -> PriceFrame:
+        """Normalize a flat-column yfinance frame to standard PriceFrame format."""
+        if df is None or df.empty:
+            raise NoDataError(f"No data returned for {symbol} from yfinance")
 
         # Normalize column names to lowercase
         df.columns = df.columns.str.lower()
@@ -71,5 +121,19 @@ class YFinanceLoader:
         # Keep only OHLCV columns, drop NaN rows
         keep = [c for c in ["open", "high", "low", "close", "volume"] if c in df.columns]
         df = df[keep].dropna(subset=["open", "high", "low", "close"])
+        if df.empty:
+            raise NoDataError(f"No data returned for {symbol} from yfinance")
 
         return PriceFrame(symbol=symbol, data=df, source="yfinance")
+
+
+def _ticker_frame(df: pd.DataFrame, symbol: str) -> pd.DataFrame:
+    """Slice one ticker out of a multi-ticker (Price, Ticker) download."""
+    if not isinstance(df.columns, pd.MultiIndex):
+        return df.copy()
+    tickers = df.columns.get_level_values(1)
+    # yfinance upper-cases tickers before requesting them
+    key = symbol if symbol in tickers else symbol.upper()
+    if key not in tickers:
+        return pd.DataFrame()
+    return df.xs(key, axis=1, level=1).copy()
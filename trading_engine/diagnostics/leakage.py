@@ -11,6 +11,7 @@ from __future__ import annotations
 
 import pandas as pd
 
+from trading_engine.strategy.base import strategy_weights
 from trading_engine.types import PriceFrame, Strategy, StrategyOutputError
 
 
@@ -37,8 +38,7 @@ def assert_no_leakage(
         StrategyOutputError: If look-ahead bias is detected.
     """
     # Run on full data
-    full_output = strategy.compute(symbols, prices, regime=None)
-    full_weights = full_output.weights
+    full_weights = strategy_weights(strategy, symbols, prices, regime=None)
 
     # Run on truncated data
     truncated_prices: dict[str, PriceFrame] = {}
@@ -56,12 +56,12 @@ def assert_no_leakage(
     if not truncated_prices:
         return  # not enough data to test
 
-    trunc_output = strategy.compute(
+    trunc_weights = strategy_weights(
+        strategy,
         [s for s in symbols if s in truncated_prices],
         truncated_prices,
         regime=None,
     )
-    trunc_weights = trunc_output.weights
 
     # Compare overlapping dates
     overlap_dates = full_weights.index.intersection(trunc_weights.index)
@@ -5,13 +5,16 @@ Produces market breadth indicators, universe rankings, and threshold statistics.
 """
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from trading_engine.types import (
     CrossSectionalResult,
     Factor,
     InsufficientDataError,
+    PanelFactor,
     PriceFrame,
+    PricePanel,
 )
 
 
@@ -20,17 +23,22 @@ def analyze_cross_section(
     universe: list[str],
     prices: dict[str, PriceFrame],
     threshold: float | None = None,
+    panel: PricePanel | None = None,
 ) -> CrossSectionalResult:
     """Compute cross-sectional analysis across a universe of symbols.
 
     For each time step, computes the factor for every symbol in the universe,
     then aggregates: counts above threshold, percentage, breadth, ranks, median.
+    A factor with compute_panel() (PanelFactor) is computed for the whole
+    universe in one pass; other factors are computed symbol by symbol.
 
     Args:
         factor: The Factor to compute for each symbol.
         universe: List of symbol names.
         prices: Dict mapping symbol -> PriceFrame.
         threshold: Value above which to count (for breadth). If None, uses 0.
+        panel: Pre-built PricePanel whose calendar the factor values are
+            aligned on.  Built from prices if omitted.
 
     Returns:
         CrossSectionalResult with time-indexed aggregation series.
@@ -45,44 +53,56 @@ def analyze_cross_section(
     if threshold is None:
         threshold = 0.0
 
-    # Compute factor for each symbol, align to a common date index
-    factor_values: dict[str, pd.Series] = {}
-    factor_name: str = ""
-    for symbol in universe:
-        if symbol not in prices:
-            continue  # skip symbols without price data
-        series = factor.compute(prices[symbol])
-        factor_values[symbol] = series.values
-        if not factor_name:
-            factor_name = series.name  # capture from first successful compute
-
-    if not factor_values:
+    symbols = [s for s in universe if s in prices]  # skip symbols without price data
+    if not symbols:
         raise InsufficientDataError(
             f"No factor values computed for any symbol in universe"
         )
 
-    # Combine into a DataFrame: rows = dates, columns = symbols
-    factor_df = pd.DataFrame(factor_values)
+    if isinstance(factor, PanelFactor):
+        matrix, factor_name, panel = _compute_panel(factor, symbols, prices, panel)
+    else:
+        if panel is None:
+            panel = PricePanel.from_frames(prices, symbols, fields=())
+
+        # Compute factor for each symbol straight onto the panel calendar:
+        # rows = dates, columns = symbols
+        matrix = np.full((len(panel.dates), len(symbols)), np.nan)
+        factor_name: str = ""
+        for j, symbol in enumerate(symbols):
+            series = factor.compute(prices[symbol])
+            rows = panel.rows(series.values.index)
+            on_calendar = rows >= 0
+            matrix[rows[on_calendar], j] = series.values.to_numpy(dtype=float)[on_calendar]
+            if not factor_name:
+                factor_name = series.name  # capture from first successful compute
 
     # Drop rows where ALL symbols are NaN
-    factor_df = factor_df.dropna(how="all")
+    has_value = ~np.isnan(matrix)
+    keep = has_value.any(axis=1)
+    matrix, has_value, index = matrix[keep], has_value[keep], panel.index[keep]
 
-    if factor_df.empty:
+    if len(index) == 0:
         raise InsufficientDataError("No overlapping dates across universe")
 
-    n_symbols = factor_df.count(axis=1)  # non-NaN count per row
+    n_symbols = has_value.sum(axis=1)  # non-NaN count per row
 
     # Counts above threshold at each time step
-    above = factor_df.gt(threshold)
-    counts_above = above.sum(axis=1)
-    pct_above = (counts_above / n_symbols * 100).fillna(0)
-    breadth = (counts_above / n_symbols).fillna(0)
+    counts_above = pd.Series((matrix > threshold).sum(axis=1), index=index)
+    pct_above = pd.Series(counts_above.to_numpy() / n_symbols * 100, index=index)
+    breadth = pd.Series(counts_above.to_numpy() / n_symbols, index=index)
 
     # Rank per symbol per time step (ascending: 1 = lowest factor value)
+    factor_df = pd.DataFrame(matrix, index=index, columns=symbols)
     ranks = factor_df.rank(axis=1, method="average", ascending=True)
 
-    # Universe median at each time step
-    universe_median = factor_df.median(axis=1)
+    # Universe median at each time step.  NaNs sort last, so each row's
+    # values fill its first n_symbols slots (one sort beats nanmedian's
+    # per-row loop on wide universes).
+    ordered = np.sort(matrix, axis=1)
+    rows = np.arange(len(ordered))
+    median = (ordered[rows, (n_symbols - 1) // 2] + ordered[rows, n_symbols // 2]) / 2
+    universe_median = pd.Series(median, index=index)
 
     return CrossSectionalResult(
         factor_name=factor_name,
@@ -93,3 +113,29 @@ def analyze_cross_section(
         ranks=ranks,
         universe_median=universe_median,
     )
+
+
+def _compute_panel(
+    factor: PanelFactor,
+    symbols: list[str],
+    prices: dict[str, PriceFrame],
+    panel: PricePanel | None,
+) -> tuple[np.ndarray, str, PricePanel]:
+    """Whole-universe factor matrix on the calendar of panel (built if None)."""
+    fields = tuple(factor.panel_fields)
+    usable = (
+        panel is not None
+        and all(s in panel for s in symbols)
+        and set(fields) <= set(panel.fields)
+    )
+    source = panel.select(symbols) if usable else PricePanel.from_frames(prices, symbols, fields)
+    result = factor.compute_panel(source)
+    if panel is None or usable:
+        return result.values, result.name, panel if usable else source
+
+    # Caller's panel lacks the fields or symbols: move onto its calendar.
+    matrix = np.full((len(panel.dates), len(symbols)), np.nan)
+    rows = panel.rows(source.index)
+    on_calendar = rows >= 0
+    matrix[rows[on_calendar]] = result.values[on_calendar]
+    return matrix, result.name, panel
@@ -13,6 +13,10 @@ from trading_engine.factors.bollinger import BollingerBands
 from trading_engine.factors.donchian import DonchianChannel
 from trading_engine.factors.distance_from_peak import DistanceFromPeak
 from trading_engine.factors.ahr999 import AHR999
+from trading_engine.factors.cache import CachedFactor, FactorCache
+from trading_engine.factors.bank import FactorBank
+from trading_engine.factors.expression import ExpressionFactor
+from trading_engine.factors.percentile import RollingPercentile
 
 __all__ = [
     "MovingAverage",
@@ -22,4 +26,9 @@ __all__ = [
     "DonchianChannel",
     "DistanceFromPeak",
     "AHR999",
+    "FactorCache",
+    "CachedFactor",
+    "FactorBank",
+    "ExpressionFactor",
+    "RollingPercentile",
 ]
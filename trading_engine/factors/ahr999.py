@@ -10,19 +10,29 @@ from datetime import datetime
 
 import numpy as np
 
-from trading_engine.types import FactorComputeError, FactorSeries, PriceFrame
+from trading_engine.factors import kernels, tail
+from trading_engine.factors.panel import BarAxis
+from trading_engine.factors.streaming import BarStream, RingBuffer
+from trading_engine.types import (
+    FactorComputeError,
+    FactorPanel,
+    FactorSeries,
+    PriceFrame,
+    PricePanel,
+)
 
 
 class AHR999:
     """Factor: AHR999 Bitcoin accumulation index.
 
-    Implements the Factor protocol.
+    Implements the Factor and PanelFactor protocols.
     Only meaningful for BTC-USD — will compute on any symbol but results
     only make sense for Bitcoin.
     """
 
     GENESIS_DATE = datetime(2009, 1, 3)
     MA_WINDOW = 200
+    panel_fields = ("close",)
 
     def compute(self, prices: PriceFrame) -> FactorSeries:
         close = prices.data["close"]
@@ -36,7 +46,7 @@ class AHR999:
             (close.index - self.GENESIS_DATE).days, 1
         )
         p_est = 10 ** (5.84 * np.log10(days_passed) - 17.01)
-        ma200 = close.rolling(window=self.MA_WINDOW).mean()
+        ma200 = kernels.rolling(close, kernels.sma, self.MA_WINDOW)
 
         # Guard against zero MA
         if (ma200.dropna() == 0).any():
@@ -50,3 +60,76 @@ class AHR999:
             values=values,
             metadata={"ma_window": self.MA_WINDOW},
         )
+
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        bars = BarAxis(panel)
+        bars.require(self.MA_WINDOW, "AHR999")
+
+        genesis = np.datetime64(self.GENESIS_DATE.date(), "D").astype(np.int64)
+        days_passed = np.maximum(panel.dates - genesis, 1)
+        p_est = 10 ** (5.84 * np.log10(days_passed) - 17.01)
+        p_est = bars.gather(np.broadcast_to(p_est[:, None], panel.valid.shape))
+
+        close = bars.gather(panel.field("close"))
+        ma200 = kernels.sma(close, self.MA_WINDOW)
+
+        if (ma200 == 0).any():
+            j = int(np.flatnonzero((ma200 == 0).any(axis=0))[0])
+            raise FactorComputeError(
+                f"200-day MA contains zero for {panel.symbols[j]}"
+            )
+
+        return FactorPanel(
+            name="AHR999",
+            dates=panel.dates,
+            symbols=panel.symbols,
+            values=bars.scatter((close / p_est) * (close / ma200)),
+            metadata={"ma_window": self.MA_WINDOW},
+        )
+
+    def stream(self) -> AHR999Stream:
+        return AHR999Stream()
+
+    def compute_tail(self, prices: PriceFrame, k: int = 1) -> FactorSeries:
+        """The last k values of compute(prices), from only the bars they need."""
+        recent = tail.tail_frame(prices, k, self.MA_WINDOW, self.MA_WINDOW)
+        return tail.last(self.compute(recent), k)
+
+
+class AHR999Stream(BarStream):
+    """Incremental AHR999.
+
+    Implements the FactorStream protocol.  Keeps a ring buffer of the last
+    200 closes with a running sum; bars must carry their "date" for the
+    price model.
+    """
+
+    _saved = ("closes",)
+
+    def __init__(self):
+        super().__init__()
+        self._sync_every = AHR999.MA_WINDOW
+
+    def _reset(self, columns: int) -> None:
+        self.closes = RingBuffer(AHR999.MA_WINDOW, columns)
+        self.total = np.zeros(columns)
+
+    def _load(self, history: PricePanel) -> None:
+        self.closes.load(history.field("close"), history.valid)
+
+    def _step(self, bar: dict[str, np.ndarray], mask: np.ndarray) -> np.ndarray:
+        if "date" not in bar:
+            raise FactorComputeError("AHR999 stream bars need a 'date'")
+        close = bar["close"]
+        dropped = self.closes.push(close, mask)
+        self.total = np.where(mask, self.total + close - np.nan_to_num(dropped), self.total)
+
+        genesis = np.datetime64(AHR999.GENESIS_DATE.date(), "D").astype(np.int64)
+        days_passed = np.maximum(bar["date"] - genesis, 1)
+        p_est = 10 ** (5.84 * np.log10(days_passed) - 17.01)
+        ma200 = self.total / AHR999.MA_WINDOW
+        warm = self.closes.full() & (ma200 != 0)
+        return np.where(warm, (close / p_est) * (close / ma200), np.nan)
+
+    def _sync(self) -> None:
+        self.total = np.nansum(self.closes.rows, axis=0)
@@ -0,0 +1,322 @@
+"""Factor banks — one factor family over a whole parameter grid in one pass.
+
+A sweep over MovingAverageRatio(length=L) for L in 5..300 would otherwise
+run ~300 independent computations over the same closes.  FactorBank computes
+the whole family as one (time x parameter) matrix from shared structures:
+
+- SMA / WMA: dyadic block sums.  Level k holds, for every bar, the sum (and
+  the position-weighted sum) of the 2**k bars ending there, built from level
+  k - 1 in one vector add.  A window of any length L is the popcount(L)
+  blocks of L's binary expansion, so every length reuses the same levels.
+  Unlike a single global prefix sum, every term is a sum over its own
+  window, so there is no cancellation and long, high-priced histories keep
+  full precision.
+- Donchian / DistanceFromPeak: a sparse table of running extrema.  The
+  max/min of any window is the max/min of two overlapping power-of-two
+  blocks.
+- EMA, and factor classes without a bank implementation, fall back to
+  one compute() per parameter; the bank API is the same.
+
+Columns come back as the FactorSeries compute() would return.  publish()
+seeds a FactorCache with them, so strategies holding CachedFactors pull
+their column instead of recomputing.
+"""
+from __future__ import annotations
+
+import itertools
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from trading_engine.factors.cache import CachedFactor, FactorCache, factor_key
+from trading_engine.factors.distance_from_peak import DistanceFromPeak
+from trading_engine.factors.donchian import DonchianChannel
+from trading_engine.factors.moving_average import (
+    DistanceFromMovingAverage,
+    MovingAverage,
+    MovingAverageRatio,
+    compute_ma_values,
+)
+from trading_engine.factors.panel import shift
+from trading_engine.types import Factor, FactorComputeError, FactorSeries, PriceFrame
+
+# Per column: (name, metadata, values.name) of the FactorSeries, or None to
+# defer that column to factor.compute() (which then raises its usual error).
+_Described = list[tuple[str, dict, str | None] | None]
+
+
+class FactorBank:
+    """A family of factors computed together over one PriceFrame.
+
+    values[:, i] is factors[i] on prices, on the full price index (NaN
+    during warm-up).
+
+    Args:
+        factors: Factors of one class, differing only in parameters.
+        prices: Bars to compute them on.
+    """
+
+    def __init__(self, factors: list[Factor], prices: PriceFrame):
+        factors = [f.factor if isinstance(f, CachedFactor) else f for f in factors]
+        classes = {type(f) for f in factors}
+        if len(classes) > 1:
+            raise FactorComputeError(
+                f"A FactorBank holds one factor class, got {sorted(c.__name__ for c in classes)}"
+            )
+        self.factors = factors
+        self.prices = prices
+        self.index = prices.data.index
+
+        family = _FAMILIES.get(classes.pop(), _compute_each) if factors else _compute_each
+        self.values, self._described = family(factors, prices)
+        self._positions: dict[Any, int] = {}
+        for i, f in enumerate(factors):
+            try:
+                self._positions.setdefault(factor_key(f), i)
+            except TypeError:
+                continue
+
+    @classmethod
+    def grid(cls, factor_cls: type, prices: PriceFrame, **grid: Any) -> FactorBank:
+        """Bank over the cartesian product of the keyword grid.
+
+        Each keyword is one constructor argument: a list/range of values,
+        or a single value held fixed, e.g.
+        ``FactorBank.grid(MovingAverageRatio, prices, ma_type="SMA", length=range(5, 301))``.
+        """
+        names = list(grid)
+        axes = [
+            list(v) if isinstance(v, (list, tuple, range, np.ndarray)) else [v]
+            for v in grid.values()
+        ]
+        factors = [factor_cls(**dict(zip(names, combo))) for combo in itertools.product(*axes)]
+        return cls(factors, prices)
+
+    def __len__(self) -> int:
+        return len(self.factors)
+
+    def position(self, factor: Factor) -> int:
+        """Column of a factor equal (same class and parameters) to factor."""
+        if isinstance(factor, CachedFactor):
+            factor = factor.factor
+        try:
+            return self._positions[factor_key(factor)]
+        except (KeyError, TypeError):
+            raise KeyError(f"{factor!r} is not in this bank") from None
+
+    def column(self, key: int | Factor) -> FactorSeries:
+        """The FactorSeries factors[key].compute(prices) would return.
+
+        Raises:
+            FactorComputeError: Exactly when compute() would.
+        """
+        i = key if isinstance(key, (int, np.integer)) else self.position(key)
+        described = self._described[i]
+        if described is None:
+            return self.factors[i].compute(self.prices)
+        name, metadata, values_name = described
+        values = pd.Series(self.values[:, i], index=self.index, name=values_name).dropna()
+        return FactorSeries(name=name, values=values, metadata=dict(metadata))
+
+    def to_frame(self) -> pd.DataFrame:
+        """The bank as a (time x factor name) DataFrame."""
+        names = [
+            d[0] if d is not None else repr(f) for d, f in zip(self._described, self.factors)
+        ]
+        return pd.DataFrame(self.values, index=self.index, columns=names)
+
+    def publish(self, cache: FactorCache) -> None:
+        """Seed cache with every column that compute() would not reject."""
+        for i, factor in enumerate(self.factors):
+            try:
+                cache.put(factor, self.prices, self.column(i))
+            except FactorComputeError:
+                continue
+
+
+# ── Shared structures ────────────────────────────────────────────────────────
+
+class _DyadicSums:
+    """Sums and position-weighted sums of every power-of-two block."""
+
+    def __init__(self, x: np.ndarray, max_window: int):
+        self.sums = [x]
+        self.weighted = [x]  # weight = position inside the block, 1-based
+        for k in range(1, max(max_window, 1).bit_length()):
+            half = 1 << (k - 1)
+            s, w = self.sums[-1], self.weighted[-1]
+            older_s, older_w = shift(s, half), shift(w, half)
+            self.sums.append(older_s + s)
+            self.weighted.append(older_w + w + half * s)
+
+    def window_sum(self, window: int) -> np.ndarray:
+        total, offset = None, 0
+        for k in _bits(window):
+            term = shift(self.sums[k], offset)
+            total = term if total is None else total + term
+            offset += 1 << k
+        return total
+
+    def window_weighted(self, window: int) -> np.ndarray:
+        """sum over the window of x * (1-based position, newest = window)."""
+        total, offset = None, 0
+        for k in _bits(window):
+            size = 1 << k
+            lead = window - offset - size  # window positions before this block
+            term = shift(self.weighted[k], offset) + lead * shift(self.sums[k], offset)
+            total = term if total is None else total + term
+            offset += size
+        return total
+
+
+class _SparseExtrema:
+    """Running max or min of every power-of-two block (a sparse table)."""
+
+    def __init__(self, x: np.ndarray, max_window: int, op: np.ufunc):
+        self.op = op
+        self.levels = [x]
+        for k in range(1, max(max_window, 1).bit_length()):
+            half = 1 << (k - 1)
+            prev = self.levels[-1]
+            self.levels.append(op(prev, shift(prev, half)))
+
+    def window(self, window: int) -> np.ndarray:
+        k = window.bit_length() - 1
+        level = self.levels[k]
+        return self.op(level, shift(level, window - (1 << k)))
+
+
+def _bits(n: int) -> list[int]:
+    return [k for k in range(n.bit_length()) if n >> k & 1]
+
+
+# ── Families ─────────────────────────────────────────────────────────────────
+
+def _ma_columns(factors: list, close: np.ndarray) -> list[np.ndarray]:
+    """The moving average of each factor's (ma_type, length), sharing block sums.
+
+    Invalid parameters give an all-NaN column (compute() reports the error).
+    """
+    linear = [f.length for f in factors if _ma_valid(f) and f.ma_type != "EMA"]
+    sums = _DyadicSums(close, max(linear)) if linear else None
+    columns = []
+    for f in factors:
+        if not _ma_valid(f):
+            columns.append(np.full(len(close), np.nan))
+        elif f.ma_type == "SMA":
+            columns.append(sums.window_sum(f.length) / f.length)
+        elif f.ma_type == "WMA":
+            columns.append(sums.window_weighted(f.length) / (f.length * (f.length + 1) / 2))
+        else:
+            columns.append(compute_ma_values(close, f.ma_type, f.length))
+    return columns
+
+
+def _ma_valid(f) -> bool:
+    return f.ma_type in ("SMA", "EMA", "WMA") and f.length >= 1
+
+
+def _moving_average(factors: list, prices: PriceFrame) -> tuple[np.ndarray, _Described]:
+    close = prices.close.astype(np.float64)
+    values = np.column_stack(_ma_columns(factors, close)) if factors else _empty(close)
+    described = [
+        (f"{f.ma_type}({f.length})", {"ma_type": f.ma_type, "length": f.length}, "close")
+        if _ma_valid(f) and f.length <= len(close) else None
+        for f in factors
+    ]
+    return values, described
+
+
+def _ma_ratio(factors: list, prices: PriceFrame) -> tuple[np.ndarray, _Described]:
+    close = prices.close.astype(np.float64)
+    columns, described = [], []
+    for f, ma in zip(factors, _ma_columns(factors, close)):
+        columns.append(close / ma - 1)
+        ok = _ma_valid(f) and f.length <= len(close) and not (ma == 0).any()
+        if isinstance(f, DistanceFromMovingAverage):
+            name = f"Distance from {f.ma_type}({f.length})"
+        else:
+            name = f"{f.ma_type}({f.length}) Ratio"
+        described.append(
+            (name, {"ma_type": f.ma_type, "length": f.length}, "close") if ok else None
+        )
+    return (np.column_stack(columns) if columns else _empty(close)), described
+
+
+def _distance_from_peak(factors: list, prices: PriceFrame) -> tuple[np.ndarray, _Described]:
+    close = prices.close.astype(np.float64)
+    if not factors:
+        return _empty(close), []
+    peaks = _SparseExtrema(close, max(f.window for f in factors), np.maximum)
+    columns, described = [], []
+    for f in factors:
+        if not 1 <= f.window <= len(close):
+            columns.append(np.full(len(close), np.nan))
+            described.append(None)
+            continue
+        rolling_max = peaks.window(f.window)
+        columns.append(close / rolling_max - 1)
+        ok = not (rolling_max == 0).any()
+        described.append(
+            (f"DistFromPeak({f.window})", {"window": f.window}, "close") if ok else None
+        )
+    return np.column_stack(columns), described
+
+
+def _donchian(factors: list, prices: PriceFrame) -> tuple[np.ndarray, _Described]:
+    close = prices.close.astype(np.float64)
+    if not factors:
+        return _empty(close), []
+    highs = _SparseExtrema(
+        prices.column("high").astype(np.float64), max(f.entry_length for f in factors), np.maximum
+    )
+    lows = _SparseExtrema(
+        prices.column("low").astype(np.float64), max(f.exit_length for f in factors), np.minimum
+    )
+    columns, described = [], []
+    for f in factors:
+        if min(f.entry_length, f.exit_length) < 1 or max(f.entry_length, f.exit_length) > len(close):
+            columns.append(np.full(len(close), np.nan))
+            described.append(None)
+            continue
+        upper = shift(highs.window(f.entry_length))
+        lower = shift(lows.window(f.exit_length))
+        width = upper - lower
+        width[width == 0] = np.nan
+        columns.append((close - lower) / width)
+        described.append((
+            f"Donchian({f.entry_length}/{f.exit_length})",
+            {"entry_length": f.entry_length, "exit_length": f.exit_length},
+            None,
+        ))
+    return np.column_stack(columns), described
+
+
+def _compute_each(factors: list, prices: PriceFrame) -> tuple[np.ndarray, _Described]:
+    """Fallback for classes without a bank implementation."""
+    index = prices.data.index
+    values = np.full((len(index), len(factors)), np.nan)
+    described: _Described = []
+    for i, f in enumerate(factors):
+        try:
+            result = f.compute(prices)
+        except FactorComputeError:
+            described.append(None)
+            continue
+        values[:, i] = result.values.reindex(index).to_numpy(dtype=np.float64)
+        described.append((result.name, result.metadata, result.values.name))
+    return values, described
+
+
+def _empty(close: np.ndarray) -> np.ndarray:
+    return np.empty((len(close), 0))
+
+
+_FAMILIES: dict[type, Callable[[list, PriceFrame], tuple[np.ndarray, _Described]]] = {
+    MovingAverage: _moving_average,
+    MovingAverageRatio: _ma_ratio,
+    DistanceFromMovingAverage: _ma_ratio,
+    DistanceFromPeak: _distance_from_peak,
+    DonchianChannel: _donchian,
+}
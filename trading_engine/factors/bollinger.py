@@ -3,10 +3,19 @@ from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from trading_engine.types import FactorComputeError, FactorSeries, PriceFrame
-from trading_engine.factors.moving_average import compute_ma
+from trading_engine.types import (
+    FactorComputeError,
+    FactorPanel,
+    FactorSeries,
+    PriceFrame,
+    PricePanel,
+)
+from trading_engine.factors import expression, kernels, tail
+from trading_engine.factors.panel import BarAxis
+from trading_engine.factors.streaming import BarStream, RingBuffer
 
 
 class BollingerBands:
@@ -19,9 +28,11 @@ class BollingerBands:
     - > 1.0 = above upper band
     - < 0.0 = below lower band
 
-    Implements the Factor protocol.
+    Implements the Factor and PanelFactor protocols.
     """
 
+    panel_fields = ("close",)
+
     def __init__(self, period: int = 20, num_std: float = 2.0):
         self.period = period
         self.num_std = num_std
@@ -33,10 +44,7 @@ class BollingerBands:
                 f"Need at least {self.period} bars for Bollinger, got {len(close)}"
             )
 
-        sma = compute_ma(close, "SMA", self.period)
-        std = close.rolling(self.period).std()
-        upper = sma + std * self.num_std
-        lower = sma - std * self.num_std
+        _, upper, lower = self.compute_bands(prices)
 
         band_width = upper - lower
         if (band_width == 0).any():
@@ -55,9 +63,41 @@ class BollingerBands:
             },
         )
 
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        bars = BarAxis(panel)
+        bars.require(self.period, "Bollinger")
+        close = bars.gather(panel.field("close"))
+        _, upper, lower = self._bands(close)
+
+        band_width = upper - lower
+        if (band_width == 0).any():
+            j = int(np.flatnonzero((band_width == 0).any(axis=0))[0])
+            raise FactorComputeError(
+                f"Bollinger band width is zero for {panel.symbols[j]} — "
+                f"constant price in window"
+            )
+
+        return FactorPanel(
+            name=f"BB({self.period}, {self.num_std}σ)",
+            dates=panel.dates,
+            symbols=panel.symbols,
+            values=bars.scatter((close - lower) / band_width),
+            metadata={
+                "period": self.period,
+                "num_std": self.num_std,
+            },
+        )
+
+    def stream(self) -> BollingerStream:
+        return BollingerStream(self.period, self.num_std)
+
+    def compute_tail(self, prices: PriceFrame, k: int = 1) -> FactorSeries:
+        """The last k values of compute(prices), from only the bars they need."""
+        return tail.last(self.compute(tail.tail_frame(prices, k, self.period, self.period)), k)
+
     def context(self, prices: PriceFrame) -> dict[str, Any]:
         """Return current band values and bandwidth."""
-        sma, upper, lower = self.compute_bands(prices)
+        sma, upper, lower = self.compute_bands(tail.tail_frame(prices, 1, self.period, self.period))
         sma_val = float(sma.iloc[-1])
         upper_val = float(upper.iloc[-1])
         lower_val = float(lower.iloc[-1])
@@ -72,8 +112,83 @@ class BollingerBands:
     def compute_bands(self, prices: PriceFrame) -> tuple[pd.Series, pd.Series, pd.Series]:
         """Return raw (sma, upper, lower) bands for charting."""
         close = prices.data["close"]
-        sma = compute_ma(close, "SMA", self.period)
-        std = close.rolling(self.period).std()
+        bands = expression.evaluate(self.band_nodes(), prices)
+        return tuple(pd.Series(np.array(b), index=close.index, name=close.name) for b in bands)
+
+    def band_nodes(self) -> tuple[expression.Node, expression.Node, expression.Node]:
+        """(sma, upper, lower) as expression nodes.
+
+        compute(), compute_bands() and context() evaluate these through the
+        shared intermediates cache, so the SMA and rolling std are computed
+        once per PriceFrame, and zscore(close, period) reuses them too.
+        """
+        close = expression.field("close")
+        sma = expression.sma(close, self.period)
+        std = expression.std(close, self.period)
+        return sma, sma + std * self.num_std, sma - std * self.num_std
+
+    def _bands(self, close: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        sma = kernels.sma(close, self.period)
+        std = kernels.rolling_std(close, self.period)
+        return sma, sma + std * self.num_std, sma - std * self.num_std
+
+
+class BollingerStream(BarStream):
+    """Incremental BollingerBands position.
+
+    Implements the FactorStream protocol.  Keeps a ring buffer of the last
+    period closes with running sums of (close - ref) and its square, ref
+    being a recent close re-picked at every resync so the variance does not
+    cancel catastrophically on high-priced series.
+    """
+
+    _saved = ("window",)
+
+    def __init__(self, period: int = 20, num_std: float = 2.0):
+        if period < 1:
+            raise FactorComputeError(f"Bollinger period must be >= 1, got {period}")
+        super().__init__(period=period, num_std=num_std)
+        self.period = period
+        self.num_std = num_std
+        self._sync_every = period
+
+    def _reset(self, columns: int) -> None:
+        self.window = RingBuffer(self.period, columns)
+        self.ref = np.zeros(columns)
+        self.s1 = np.zeros(columns)
+        self.s2 = np.zeros(columns)
+
+    def _load(self, history: PricePanel) -> None:
+        self.window.load(history.field("close"), history.valid)
+
+    def _step(self, bar: dict[str, np.ndarray], mask: np.ndarray) -> np.ndarray:
+        close = bar["close"]
+        dropped = self.window.push(close, mask)
+        new = close - self.ref
+        old = np.nan_to_num(dropped - self.ref)
+        self.s1 = np.where(mask, self.s1 + new - old, self.s1)
+        self.s2 = np.where(mask, self.s2 + new * new - old * old, self.s2)
+
+        n = self.period
+        sma = self.ref + self.s1 / n
+        std = np.sqrt(np.maximum(self.s2 - self.s1 * self.s1 / n, 0) / (n - 1))
+        # Same flat-window rule as kernels.rolling_std: a constant window has
+        # std exactly 0 (and so no position), not a rounding residue.
+        full = self.window.full()
+        suspect = np.flatnonzero(mask & full & (std <= 1e-7 * np.abs(close)))
+        if len(suspect):
+            rows = self.window.rows[:, suspect]
+            flat = rows.max(axis=0) == rows.min(axis=0)
+            std[suspect] = np.where(flat, 0.0, std[suspect])
+
         upper = sma + std * self.num_std
         lower = sma - std * self.num_std
-        return sma, upper, lower
+        band_width = upper - lower
+        position = np.where(band_width == 0, np.nan, (close - lower) / band_width)
+        return np.where(full, position, np.nan)
+
+    def _sync(self) -> None:
+        self.ref = np.nan_to_num(self.window.latest())
+        centred = self.window.rows - self.ref
+        self.s1 = np.nansum(centred, axis=0)
+        self.s2 = np.nansum(centred * centred, axis=0)
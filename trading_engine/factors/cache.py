@@ -0,0 +1,211 @@
+"""Content-addressed memoization of factor results.
+
+A sweep or a single API request often computes the same factor on the same
+bars several times: once per strategy config, once for the rarity analysis,
+once for the cross-section.  FactorCache keys each result on
+
+    (factor class + constructor parameters, PriceFrame.fingerprint())
+
+so any two computations that must give the same answer share one entry,
+whichever layer asks and whichever PriceFrame object carries the bars.
+
+- Works for any Factor: parameters are read from the instance's attributes,
+  recursing into nested factors.  A factor whose attributes cannot be keyed
+  safely (callables, opaque objects) is simply computed every time.
+- Bounded by total bytes of cached values with LRU eviction.
+- Hit, miss and eviction counters for sizing the bound.
+- Failures (FactorComputeError etc.) are never cached.
+"""
+from __future__ import annotations
+
+import dataclasses
+import enum
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from typing import Any, Hashable
+
+import numpy as np
+
+from trading_engine.types import (
+    Factor,
+    FactorPanel,
+    FactorSeries,
+    PanelFactor,
+    PriceFrame,
+    PricePanel,
+)
+
+
+class FactorCache:
+    """Thread-safe LRU cache of FactorSeries keyed by factor and bar content.
+
+    Args:
+        max_bytes: Upper bound on the summed size of cached factor values.
+    """
+
+    def __init__(self, max_bytes: int = 128 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, tuple[FactorSeries, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def compute(self, factor: Factor, prices: PriceFrame) -> FactorSeries:
+        """factor.compute(prices), served from the cache when possible.
+
+        The returned FactorSeries is a fresh object, but its values Series is
+        shared with the cache: do not modify it in place.
+        """
+        while isinstance(factor, CachedFactor):
+            factor = factor.factor
+        try:
+            key = (factor_key(factor), prices.fingerprint())
+        except TypeError:
+            return factor.compute(prices)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                self.misses += 1
+        if entry is not None:
+            return _copy(entry[0])
+
+        # Compute outside the lock; two threads racing on one key both
+        # compute and the second put is a no-op.
+        result = factor.compute(prices)
+        self._put(key, result)
+        return _copy(result)
+
+    def put(self, factor: Factor, prices: PriceFrame, result: FactorSeries) -> None:
+        """Store a result computed elsewhere (e.g. a FactorBank column).
+
+        result must equal factor.compute(prices).
+        """
+        while isinstance(factor, CachedFactor):
+            factor = factor.factor
+        try:
+            key = (factor_key(factor), prices.fingerprint())
+        except TypeError:
+            return
+        self._put(key, result)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _put(self, key: Hashable, result: FactorSeries) -> None:
+        nbytes = int(result.values.memory_usage(index=True, deep=False))
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = (_copy(result), nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._bytes -= dropped
+                self.evictions += 1
+
+
+class CachedFactor:
+    """Factor wrapper whose compute() goes through a FactorCache.
+
+    Implements the Factor protocol.
+    Every other attribute (context(), compute_bands(), parameters) is
+    forwarded to the wrapped factor, so the wrapper can stand in for it
+    anywhere, e.g. FactorThresholdStrategy(factor=CachedFactor(f, cache)).
+    Wrapping a PanelFactor gives a CachedPanelFactor, so protocol checks
+    (which do not see forwarded attributes) still recognise it.
+    """
+
+    def __new__(cls, factor: Factor | None = None, cache: FactorCache | None = None):
+        if cls is CachedFactor and isinstance(factor, PanelFactor):
+            cls = CachedPanelFactor
+        return super().__new__(cls)
+
+    def __init__(self, factor: Factor, cache: FactorCache):
+        self.factor = factor
+        self.cache = cache
+
+    def compute(self, prices: PriceFrame) -> FactorSeries:
+        return self.cache.compute(self.factor, prices)
+
+    def __getattr__(self, name: str) -> Any:
+        if name in ("factor", "cache"):  # not yet set (e.g. during unpickling)
+            raise AttributeError(name)
+        return getattr(self.factor, name)
+
+    def __repr__(self) -> str:
+        return f"CachedFactor({self.factor!r})"
+
+
+class CachedPanelFactor(CachedFactor):
+    """CachedFactor of a PanelFactor.  compute_panel() is passed through uncached.
+
+    Implements the Factor and PanelFactor protocols.
+    """
+
+    @property
+    def panel_fields(self) -> tuple[str, ...]:
+        return self.factor.panel_fields
+
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        return self.factor.compute_panel(panel)
+
+
+def factor_key(factor: Any) -> tuple:
+    """Hashable identity of a factor: its class plus its parameters.
+
+    Raises:
+        TypeError: If a parameter cannot be keyed safely.
+    """
+    cls = type(factor)
+    try:
+        params = vars(factor)
+    except TypeError:
+        raise TypeError(f"{cls.__qualname__} has no instance attributes to key on") from None
+    return (f"{cls.__module__}.{cls.__qualname__}", _freeze(params))
+
+
+def _freeze(value: Any) -> Hashable:
+    if value is None or isinstance(value, (bool, int, float, str, bytes, date, datetime, enum.Enum)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return frozenset(_freeze(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), _freeze(v)) for k, v in value.items()))
+    if isinstance(value, CachedFactor):
+        return _freeze(value.factor)
+    if hasattr(value, "__dict__") and not callable(value):
+        # Nested factor or parameter object.  Callables are excluded: two
+        # different lambdas would otherwise share a key.
+        return factor_key(value)
+    raise TypeError(f"Cannot key factor parameter of type {type(value).__name__}")
+
+
+def _copy(result: FactorSeries) -> FactorSeries:
+    return dataclasses.replace(result, metadata=dict(result.metadata))
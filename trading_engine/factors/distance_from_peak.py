@@ -3,7 +3,18 @@ from __future__ import annotations
 
 from typing import Any
 
-from trading_engine.types import FactorComputeError, FactorSeries, PriceFrame
+import numpy as np
+
+from trading_engine.factors import kernels, tail
+from trading_engine.factors.panel import BarAxis
+from trading_engine.factors.streaming import BarStream, RingBuffer, roll_extreme
+from trading_engine.types import (
+    FactorComputeError,
+    FactorPanel,
+    FactorSeries,
+    PriceFrame,
+    PricePanel,
+)
 
 
 class DistanceFromPeak:
@@ -13,9 +24,11 @@ class DistanceFromPeak:
     - 0.0 = at the peak (no drawdown)
     - -0.20 = 20% below the peak
 
-    Implements the Factor protocol.
+    Implements the Factor and PanelFactor protocols.
     """
 
+    panel_fields = ("close",)
+
     def __init__(self, window: int = 252):
         self.window = window
 
@@ -27,7 +40,7 @@ class DistanceFromPeak:
                 f"got {len(close)}"
             )
 
-        rolling_max = close.rolling(window=self.window).max()
+        rolling_max = kernels.rolling(close, kernels.rolling_max, self.window)
 
         if (rolling_max == 0).any():
             raise FactorComputeError(
@@ -41,6 +54,33 @@ class DistanceFromPeak:
             metadata={"window": self.window},
         )
 
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        bars = BarAxis(panel)
+        bars.require(self.window, "DistanceFromPeak")
+        close = bars.gather(panel.field("close"))
+        rolling_max = kernels.rolling_max(close, self.window)
+
+        if (rolling_max == 0).any():
+            j = int(np.flatnonzero((rolling_max == 0).any(axis=0))[0])
+            raise FactorComputeError(
+                f"Rolling max contains zero for {panel.symbols[j]}"
+            )
+
+        return FactorPanel(
+            name=f"DistFromPeak({self.window})",
+            dates=panel.dates,
+            symbols=panel.symbols,
+            values=bars.scatter(close / rolling_max - 1),
+            metadata={"window": self.window},
+        )
+
+    def stream(self) -> DistanceFromPeakStream:
+        return DistanceFromPeakStream(self.window)
+
+    def compute_tail(self, prices: PriceFrame, k: int = 1) -> FactorSeries:
+        """The last k values of compute(prices), from only the bars they need."""
+        return tail.last(self.compute(tail.tail_frame(prices, k, self.window, self.window)), k)
+
     def context(self, prices: PriceFrame) -> dict[str, Any]:
         """Return factor-specific live context for display.
 
@@ -60,3 +100,37 @@ class DistanceFromPeak:
             "sessions_from_peak": sessions_from_peak,
             "remaining_sessions": remaining_sessions,
         }
+
+
+class DistanceFromPeakStream(BarStream):
+    """Incremental DistanceFromPeak.
+
+    Implements the FactorStream protocol.  Keeps a ring buffer of the last
+    window closes and their running max; the buffer is only rescanned when
+    the peak itself rolls off.
+    """
+
+    _saved = ("closes",)
+
+    def __init__(self, window: int = 252):
+        if window < 1:
+            raise FactorComputeError(f"DistanceFromPeak window must be >= 1, got {window}")
+        super().__init__(window=window)
+        self.window = window
+
+    def _reset(self, columns: int) -> None:
+        self.closes = RingBuffer(self.window, columns)
+        self.peak = np.full(columns, np.nan)
+
+    def _load(self, history: PricePanel) -> None:
+        self.closes.load(history.field("close"), history.valid)
+
+    def _step(self, bar: dict[str, np.ndarray], mask: np.ndarray) -> np.ndarray:
+        close = bar["close"]
+        dropped = self.closes.push(close, mask)
+        self.peak = roll_extreme(np.fmax, self.peak, self.closes, close, dropped, mask)
+        warm = self.closes.full() & (self.peak != 0)
+        return np.where(warm, close / self.peak - 1, np.nan)
+
+    def _sync(self) -> None:
+        self.peak = np.fmax.reduce(self.closes.rows, axis=0)
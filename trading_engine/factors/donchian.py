@@ -3,9 +3,19 @@ from __future__ import annotations
 
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
-from trading_engine.types import FactorComputeError, FactorSeries, PriceFrame
+from trading_engine.factors import kernels, tail
+from trading_engine.factors.panel import BarAxis, shift
+from trading_engine.factors.streaming import BarStream, RingBuffer, roll_extreme
+from trading_engine.types import (
+    FactorComputeError,
+    FactorPanel,
+    FactorSeries,
+    PriceFrame,
+    PricePanel,
+)
 
 
 class DonchianChannel:
@@ -15,16 +25,16 @@ class DonchianChannel:
     - 0.0 = at lower channel
     - 1.0 = at upper channel
 
-    Implements the Factor protocol.
+    Implements the Factor and PanelFactor protocols.
     """
 
+    panel_fields = ("high", "low", "close")
+
     def __init__(self, entry_length: int = 20, exit_length: int = 10):
         self.entry_length = entry_length
         self.exit_length = exit_length
 
     def compute(self, prices: PriceFrame) -> FactorSeries:
-        high = prices.data["high"]
-        low = prices.data["low"]
         close = prices.data["close"]
 
         min_length = max(self.entry_length, self.exit_length)
@@ -33,8 +43,7 @@ class DonchianChannel:
                 f"Need at least {min_length} bars for Donchian, got {len(close)}"
             )
 
-        upper = high.rolling(self.entry_length).max().shift(1)
-        lower = low.rolling(self.exit_length).min().shift(1)
+        upper, lower = self.compute_channels(prices)
 
         channel_width = upper - lower
         # Replace zero width with NaN to avoid division by zero
@@ -50,9 +59,38 @@ class DonchianChannel:
             },
         )
 
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        bars = BarAxis(panel)
+        bars.require(max(self.entry_length, self.exit_length), "Donchian")
+        upper, lower = self._channels(
+            bars.gather(panel.field("high")), bars.gather(panel.field("low"))
+        )
+
+        channel_width = upper - lower
+        channel_width[channel_width == 0] = np.nan
+        close = bars.gather(panel.field("close"))
+
+        return FactorPanel(
+            name=f"Donchian({self.entry_length}/{self.exit_length})",
+            dates=panel.dates,
+            symbols=panel.symbols,
+            values=bars.scatter((close - lower) / channel_width),
+            metadata={
+                "entry_length": self.entry_length,
+                "exit_length": self.exit_length,
+            },
+        )
+
+    def stream(self) -> DonchianStream:
+        return DonchianStream(self.entry_length, self.exit_length)
+
+    def compute_tail(self, prices: PriceFrame, k: int = 1) -> FactorSeries:
+        """The last k values of compute(prices), from only the bars they need."""
+        return tail.last(self.compute(self._tail_frame(prices, k)), k)
+
     def context(self, prices: PriceFrame) -> dict[str, Any]:
         """Return current channel levels and width."""
-        upper, lower = self.compute_channels(prices)
+        upper, lower = self.compute_channels(self._tail_frame(prices, 1))
         upper_val = float(upper.iloc[-1])
         lower_val = float(lower.iloc[-1])
         return {
@@ -65,6 +103,74 @@ class DonchianChannel:
         """Return raw (upper, lower) channels for charting."""
         high = prices.data["high"]
         low = prices.data["low"]
-        upper = high.rolling(self.entry_length).max().shift(1)
-        lower = low.rolling(self.exit_length).min().shift(1)
+        upper, lower = self._channels(
+            high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64)
+        )
+        return (
+            pd.Series(upper, index=high.index, name=high.name),
+            pd.Series(lower, index=low.index, name=low.name),
+        )
+
+    def _tail_frame(self, prices: PriceFrame, k: int) -> PriceFrame:
+        # Channels are of the bars before each bar, hence the extra bar.  No
+        # alignment: a rolling max / min is exact wherever the slice starts.
+        warmup = max(self.entry_length, self.exit_length) + 1
+        return tail.tail_frame(prices, k, warmup)
+
+    def _channels(self, high: np.ndarray, low: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Prior-bar channels: the current bar is never part of its own channel."""
+        upper = shift(kernels.rolling_max(high, self.entry_length))
+        lower = shift(kernels.rolling_min(low, self.exit_length))
         return upper, lower
+
+
+class DonchianStream(BarStream):
+    """Incremental DonchianChannel position.
+
+    Implements the FactorStream protocol.  Keeps ring buffers of the last
+    entry_length highs and exit_length lows with their running max / min.
+    A bar is positioned in the channel of the bars before it, then joins it.
+    """
+
+    fields = ("high", "low", "close")
+    _saved = ("highs", "lows")
+
+    def __init__(self, entry_length: int = 20, exit_length: int = 10):
+        if min(entry_length, exit_length) < 1:
+            raise FactorComputeError(
+                f"Donchian lengths must be >= 1, got {entry_length}/{exit_length}"
+            )
+        super().__init__(entry_length=entry_length, exit_length=exit_length)
+        self.entry_length = entry_length
+        self.exit_length = exit_length
+
+    def _reset(self, columns: int) -> None:
+        self.highs = RingBuffer(self.entry_length, columns)
+        self.lows = RingBuffer(self.exit_length, columns)
+        self.upper = np.full(columns, np.nan)
+        self.lower = np.full(columns, np.nan)
+
+    def _load(self, history: PricePanel) -> None:
+        self.highs.load(history.field("high"), history.valid)
+        self.lows.load(history.field("low"), history.valid)
+
+    def _step(self, bar: dict[str, np.ndarray], mask: np.ndarray) -> np.ndarray:
+        channel_width = self.upper - self.lower
+        warm = self.highs.full() & self.lows.full()
+        position = np.where(
+            warm & (channel_width != 0), (bar["close"] - self.lower) / channel_width, np.nan
+        )
+
+        high, low = bar["high"], bar["low"]
+        self.upper = roll_extreme(
+            np.fmax, self.upper, self.highs, high, self.highs.push(high, mask), mask
+        )
+        self.lower = roll_extreme(
+            np.fmin, self.lower, self.lows, low, self.lows.push(low, mask), mask
+        )
+        return position
+
+    def _sync(self) -> None:
+        # Extremes carry no rounding drift; this only (re)derives them.
+        self.upper = np.fmax.reduce(self.highs.rows, axis=0)
+        self.lower = np.fmin.reduce(self.lows.rows, axis=0)
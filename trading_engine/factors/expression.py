@@ -0,0 +1,518 @@
+"""Factor expressions — compound factors as a graph of shared nodes.
+
+An expression is built from price fields, numbers, arithmetic and rolling
+functions, either in Python or parsed from text:
+
+    close = field("close")
+    ratio = close / sma(close, 50) - 1
+    ratio = parse("close / sma(close, 50) - 1")          # same node
+
+Nodes compare and hash by structure, so every occurrence of sma(close, 50)
+— within one expression, across expressions, across the factor classes
+built on them — is one node, evaluated once:
+
+- Graph(roots) evaluates each distinct node once per call (common
+  subexpression elimination) and hands back every intermediate, for
+  charting or context.
+- Across calls, non-trivial nodes are memoised in a NodeCache keyed by
+  (node, PriceFrame.fingerprint()), so compute(), compute_bands() and
+  context() on the same bars share their rolling windows.
+
+ExpressionFactor wraps an expression as a Factor, so custom factors need
+no new Python class (the /factors endpoints accept factor_type="expression").
+"""
+from __future__ import annotations
+
+import ast
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Sequence
+
+import numpy as np
+import pandas as pd
+
+from trading_engine.factors import kernels
+from trading_engine.factors.panel import BarAxis, shift as shift_array
+from trading_engine.types import (
+    FactorComputeError,
+    FactorPanel,
+    FactorSeries,
+    PriceFrame,
+    PricePanel,
+)
+
+FIELDS = ("open", "high", "low", "close", "volume")
+
+# Bounds on user-supplied expressions (they arrive through the API).
+MAX_EXPRESSION_LENGTH = 500
+MAX_NODES = 100
+
+
+# =============================================================================
+# Nodes
+# =============================================================================
+
+@dataclass(frozen=True)
+class Node:
+    """One operation in an expression graph.
+
+    op is "field" (param = field name), "const" (param = value), an
+    arithmetic or element-wise operator, or a rolling function (param =
+    window).  Equal structure means equal node.
+    """
+    op: str
+    args: tuple[Node, ...] = ()
+    param: Any = None
+
+    def __add__(self, other: Node | float) -> Node:
+        return _binary("add", self, other)
+
+    def __radd__(self, other: float) -> Node:
+        return _binary("add", other, self)
+
+    def __sub__(self, other: Node | float) -> Node:
+        return _binary("sub", self, other)
+
+    def __rsub__(self, other: float) -> Node:
+        return _binary("sub", other, self)
+
+    def __mul__(self, other: Node | float) -> Node:
+        return _binary("mul", self, other)
+
+    def __rmul__(self, other: float) -> Node:
+        return _binary("mul", other, self)
+
+    def __truediv__(self, other: Node | float) -> Node:
+        return _binary("div", self, other)
+
+    def __rtruediv__(self, other: float) -> Node:
+        return _binary("div", other, self)
+
+    def __pow__(self, other: Node | float) -> Node:
+        return _binary("pow", self, other)
+
+    def __neg__(self) -> Node:
+        return Node("neg", (self,))
+
+    def fields(self) -> tuple[str, ...]:
+        """Price fields the expression reads, in FIELDS order."""
+        used = {n.param for n in Graph([self]).nodes if n.op == "field"}
+        return tuple(f for f in FIELDS if f in used)
+
+    def __str__(self) -> str:
+        return _format(self, 0)
+
+
+def field(name: str) -> Node:
+    if name not in FIELDS:
+        raise FactorComputeError(f"Unknown price field {name!r}; expected one of {FIELDS}")
+    return Node("field", param=name)
+
+
+def const(value: float) -> Node:
+    try:
+        return Node("const", param=float(value))
+    except (OverflowError, ValueError):
+        raise FactorComputeError(
+            f"Constant {str(value)[:20]}... is too large for a factor expression"
+        ) from None
+
+
+def _node(value: Node | float) -> Node:
+    if isinstance(value, Node):
+        return value
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return const(value)
+    raise FactorComputeError(f"Cannot use {type(value).__name__} in a factor expression")
+
+
+def _binary(op: str, left: Node | float, right: Node | float) -> Node:
+    return Node(op, (_node(left), _node(right)))
+
+
+def _rolling(op: str) -> Callable[[Node | float, int], Node]:
+    def build(x: Node | float, window: int) -> Node:
+        if isinstance(window, bool) or not isinstance(window, (int, np.integer)) or window < 1:
+            raise FactorComputeError(f"{op}() window must be a positive integer, got {window!r}")
+        return Node(op, (_node(x),), int(window))
+    build.__name__ = op
+    build.__doc__ = f"{op}(x, window) — see ROLLING[{op!r}]."
+    return build
+
+
+sma = _rolling("sma")
+ema = _rolling("ema")
+wma = _rolling("wma")
+std = _rolling("std")
+rolling_max = _rolling("max")
+rolling_min = _rolling("min")
+rolling_sum = _rolling("sum")
+rank = _rolling("rank")
+shift = _rolling("shift")
+
+
+def log(x: Node | float) -> Node:
+    return Node("log", (_node(x),))
+
+
+def abs_(x: Node | float) -> Node:
+    return Node("abs", (_node(x),))
+
+
+def zscore(x: Node | float, window: int) -> Node:
+    """(x - sma(x, window)) / std(x, window), sharing those nodes with Bollinger."""
+    return (x - sma(x, window)) / std(x, window)
+
+
+# =============================================================================
+# Evaluation
+# =============================================================================
+
+def _rolling_rank(values: np.ndarray, window: int) -> np.ndarray:
+    """Percentile (0, 1] of each value within its trailing window."""
+    frame = pd.DataFrame(values.reshape(len(values), -1))
+    return frame.rolling(window).rank(pct=True).to_numpy().reshape(values.shape)
+
+
+ROLLING: dict[str, Callable[[np.ndarray, int], np.ndarray]] = {
+    "sma": kernels.sma,
+    "ema": kernels.ema,
+    "wma": kernels.wma,
+    "std": kernels.rolling_std,
+    "max": kernels.rolling_max,
+    "min": kernels.rolling_min,
+    "sum": kernels.rolling_sum,
+    "rank": _rolling_rank,
+    "shift": shift_array,
+}
+
+ELEMENTWISE: dict[str, Callable[..., np.ndarray]] = {
+    "add": np.add,
+    "sub": np.subtract,
+    "mul": np.multiply,
+    "div": np.divide,
+    "pow": np.power,
+    "neg": np.negative,
+    "log": np.log,
+    "abs": np.abs,
+}
+
+
+class NodeCache:
+    """Thread-safe LRU of evaluated nodes keyed by (node, bar fingerprint).
+
+    Args:
+        max_bytes: Upper bound on the summed size of cached arrays.
+    """
+
+    def __init__(self, max_bytes: int = 32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, np.ndarray] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> np.ndarray | None:
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: np.ndarray) -> None:
+        if value.nbytes > self.max_bytes:
+            return
+        value.setflags(write=False)  # shared between callers
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = value
+            self._bytes += value.nbytes
+            while self._bytes > self.max_bytes:
+                _, dropped = self._entries.popitem(last=False)
+                self._bytes -= dropped.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+# Process-wide intermediates shared by every factor built on expressions.
+intermediates = NodeCache()
+
+
+class Graph:
+    """The distinct nodes of one or more expressions, in evaluation order."""
+
+    def __init__(self, roots: Sequence[Node]):
+        self.roots = list(roots)
+        self.nodes: list[Node] = []
+        seen: set[Node] = set()
+        stack: list[tuple[Node, bool]] = [(r, False) for r in reversed(self.roots)]
+        while stack:
+            node, expanded = stack.pop()
+            if node in seen:
+                continue
+            if expanded:
+                seen.add(node)
+                self.nodes.append(node)
+            else:
+                stack.append((node, True))
+                stack.extend((a, False) for a in reversed(node.args) if a not in seen)
+
+    def evaluate(self, prices: PriceFrame, cache: NodeCache | None = None) -> dict[Node, np.ndarray]:
+        """Every node's values on prices, each computed (or fetched) once.
+
+        cache defaults to the process-wide intermediates.
+        """
+        cache = intermediates if cache is None else cache
+        fingerprint = prices.fingerprint()
+        values: dict[Node, np.ndarray] = {}
+        for node in self.nodes:
+            if node.op == "field":
+                values[node] = prices.column(node.param).astype(np.float64)
+                continue
+            if node.op == "const":
+                values[node] = np.float64(node.param)
+                continue
+            key = (node, fingerprint)
+            hit = cache.get(key)
+            if hit is not None:
+                values[node] = hit
+                continue
+            result = _apply(node, [values[a] for a in node.args], len(prices))
+            cache.put(key, result)
+            values[node] = result
+        return values
+
+    def evaluate_arrays(self, fields: dict[str, np.ndarray]) -> dict[Node, np.ndarray]:
+        """Every node's values on raw (time x ...) field arrays; no cross-call cache."""
+        rows = len(next(iter(fields.values()))) if fields else 0
+        values: dict[Node, np.ndarray] = {}
+        for node in self.nodes:
+            if node.op == "field":
+                values[node] = fields[node.param]
+            elif node.op == "const":
+                values[node] = np.float64(node.param)
+            else:
+                values[node] = _apply(node, [values[a] for a in node.args], rows)
+        return values
+
+
+def evaluate(nodes: Sequence[Node], prices: PriceFrame) -> list[np.ndarray]:
+    """Values of each node on prices, sharing work through the intermediates cache."""
+    values = Graph(nodes).evaluate(prices)
+    return [values[n] for n in nodes]
+
+
+def _apply(node: Node, args: list[np.ndarray], rows: int) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        if node.op in ROLLING:
+            x = np.broadcast_to(args[0], (rows,)) if np.ndim(args[0]) == 0 else args[0]
+            return ROLLING[node.op](np.asarray(x, dtype=np.float64), node.param)
+        result = ELEMENTWISE[node.op](*args)
+    if np.ndim(result) == 0:
+        result = np.full(rows, result)
+    return np.asarray(result, dtype=np.float64)
+
+
+# =============================================================================
+# Text form
+# =============================================================================
+
+_FUNCTIONS: dict[str, Callable[..., Node]] = {
+    "sma": sma,
+    "ema": ema,
+    "wma": wma,
+    "std": std,
+    "max": rolling_max,
+    "min": rolling_min,
+    "sum": rolling_sum,
+    "rank": rank,
+    "shift": shift,
+    "zscore": zscore,
+    "log": log,
+    "abs": abs_,
+}
+_BINARY = {ast.Add: "add", ast.Sub: "sub", ast.Mult: "mul", ast.Div: "div", ast.Pow: "pow"}
+_SYMBOLS = {"add": "+", "sub": "-", "mul": "*", "div": "/", "pow": "**"}
+_PRECEDENCE = {"add": 1, "sub": 1, "mul": 2, "div": 2, "neg": 3, "pow": 4}
+
+
+def parse(text: str) -> Node:
+    """Parse an expression such as "zscore(close, 20)" or "close / sma(close, 50) - 1".
+
+    Only fields, numbers, + - * / **, unary minus and the rolling / element-wise
+    functions are accepted; nothing is ever executed.
+
+    Raises:
+        FactorComputeError: If the text is not a valid expression.
+    """
+    if len(text) > MAX_EXPRESSION_LENGTH:
+        raise FactorComputeError(
+            f"Factor expression is longer than {MAX_EXPRESSION_LENGTH} characters"
+        )
+    try:
+        tree = ast.parse(text.strip(), mode="eval")
+    except SyntaxError as exc:
+        raise FactorComputeError(f"Invalid factor expression {text!r}: {exc.msg}") from None
+    node = _convert(tree.body, text)
+    if not isinstance(node, Node):
+        raise FactorComputeError(f"Factor expression {text!r} does not read any price field")
+    if len(Graph([node]).nodes) > MAX_NODES:
+        raise FactorComputeError(f"Factor expression has more than {MAX_NODES} distinct nodes")
+    return node
+
+
+def _convert(tree: ast.AST, text: str) -> Node | float:
+    if isinstance(tree, ast.Constant) and isinstance(tree.value, (int, float)) \
+            and not isinstance(tree.value, bool):
+        try:
+            float(tree.value)  # windows stay int, but every number must fit a float
+        except OverflowError:
+            raise FactorComputeError(
+                f"Number {str(tree.value)[:20]}... is too large for a factor expression"
+            ) from None
+        return tree.value
+    if isinstance(tree, ast.Name):
+        return field(tree.id)
+    if isinstance(tree, ast.BinOp) and type(tree.op) in _BINARY:
+        left, right = _convert(tree.left, text), _convert(tree.right, text)
+        if not isinstance(left, Node) and not isinstance(right, Node):
+            return _fold(_BINARY[type(tree.op)], left, right)
+        return _binary(_BINARY[type(tree.op)], left, right)
+    if isinstance(tree, ast.UnaryOp) and isinstance(tree.op, (ast.USub, ast.UAdd)):
+        operand = _convert(tree.operand, text)
+        return -operand if isinstance(tree.op, ast.USub) else operand
+    if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Name) and not tree.keywords:
+        build = _FUNCTIONS.get(tree.func.id)
+        if build is None:
+            raise FactorComputeError(
+                f"Unknown function {tree.func.id!r} in factor expression; "
+                f"expected one of {sorted(_FUNCTIONS)}"
+            )
+        args = [_convert(a, text) for a in tree.args]
+        try:
+            return build(*args)
+        except TypeError:
+            raise FactorComputeError(
+                f"Wrong arguments to {tree.func.id}() in factor expression {text!r}"
+            ) from None
+    raise FactorComputeError(
+        f"Unsupported syntax in factor expression {text!r}: {ast.unparse(tree)!r}"
+    )
+
+
+def _fold(op: str, left: float, right: float) -> float:
+    try:
+        return float(ELEMENTWISE[op](np.float64(left), np.float64(right)))
+    except (ArithmeticError, ValueError):
+        raise FactorComputeError(f"Cannot evaluate {left} {_SYMBOLS[op]} {right}") from None
+
+
+def _format(node: Node, parent: int) -> str:
+    if node.op == "field":
+        return node.param
+    if node.op == "const":
+        value = node.param
+        return str(int(value)) if value.is_integer() else repr(value)
+    if node.op in ROLLING:
+        return f"{node.op}({_format(node.args[0], 0)}, {node.param})"
+    if node.op in ("log", "abs"):
+        return f"{node.op}({_format(node.args[0], 0)})"
+    level = _PRECEDENCE[node.op]
+    if node.op == "neg":
+        text = f"-{_format(node.args[0], level)}"
+    else:
+        left, right = node.args
+        # Left-associative: a right operand of equal precedence needs parentheses.
+        right_level = level if node.op == "pow" else level + 1
+        text = f"{_format(left, level)} {_SYMBOLS[node.op]} {_format(right, right_level)}"
+    return f"({text})" if level < parent else text
+
+
+# =============================================================================
+# Factor
+# =============================================================================
+
+class ExpressionFactor:
+    """Factor: any expression over price fields, e.g. "close / sma(close, 50) - 1".
+
+    Implements the Factor and PanelFactor protocols.
+    """
+
+    def __init__(self, expression: Node | str, name: str | None = None):
+        self.expression = parse(expression) if isinstance(expression, str) else _node(expression)
+        self.name = name or str(self.expression)
+        self.panel_fields = self.expression.fields()
+
+    def compute(self, prices: PriceFrame) -> FactorSeries:
+        values = self._check(evaluate([self.expression], prices)[0], prices.symbol)
+        series = pd.Series(values, index=prices.data.index, name=self.name).dropna()
+        if series.empty:
+            raise FactorComputeError(
+                f"Expression {self.name} has no values on {len(prices)} bars of {prices.symbol}"
+            )
+        return FactorSeries(
+            name=self.name, values=series, metadata={"expression": str(self.expression)}
+        )
+
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        bars = BarAxis(panel)
+        graph = Graph([self.expression])
+        fields = {f: bars.gather(panel.field(f)) for f in self.panel_fields}
+        values = graph.evaluate_arrays(fields)[self.expression]
+        values = bars.scatter(np.broadcast_to(values, panel.valid.shape))
+
+        for j, symbol in enumerate(panel.symbols):
+            self._check(values[:, j], symbol)
+            if bars.counts[j] and np.isnan(values[:, j]).all():
+                raise FactorComputeError(
+                    f"Expression {self.name} has no values on {bars.counts[j]} bars of {symbol}"
+                )
+        return FactorPanel(
+            name=self.name,
+            dates=panel.dates,
+            symbols=panel.symbols,
+            values=values,
+            metadata={"expression": str(self.expression)},
+        )
+
+    def intermediates(self, prices: PriceFrame) -> dict[str, pd.Series]:
+        """Every sub-expression's series, by its text, for charting."""
+        values = Graph([self.expression]).evaluate(prices)
+        index = prices.data.index
+        return {
+            str(node): pd.Series(np.broadcast_to(v, (len(index),)), index=index, name=str(node))
+            for node, v in values.items()
+            if node.op not in ("field", "const")
+        }
+
+    def context(self, prices: PriceFrame) -> dict[str, Any]:
+        """Latest value of each rolling sub-expression (e.g. the current SMA)."""
+        values = Graph([self.expression]).evaluate(prices)
+        context: dict[str, Any] = {"expression": str(self.expression)}
+        for node, v in values.items():
+            if node.op in ROLLING and len(v):
+                last = float(v[-1])
+                context[str(node)] = None if np.isnan(last) else last
+        return context
+
+    def _check(self, values: np.ndarray, symbol: str) -> np.ndarray:
+        if np.isinf(values).any():
+            raise FactorComputeError(
+                f"Expression {self.name} has infinite values (division by zero?) for {symbol}"
+            )
+        return values
+
+    def __repr__(self) -> str:
+        return f"ExpressionFactor({str(self.expression)!r})"
@@ -6,7 +6,16 @@ from typing import Any, Literal
 import numpy as np
 import pandas as pd
 
-from trading_engine.types import FactorComputeError, FactorSeries, PriceFrame
+from trading_engine.factors import expression, kernels, tail
+from trading_engine.factors.panel import BarAxis
+from trading_engine.factors.streaming import BarStream, RingBuffer
+from trading_engine.types import (
+    FactorComputeError,
+    FactorPanel,
+    FactorSeries,
+    PriceFrame,
+    PricePanel,
+)
 
 
 MaType = Literal["SMA", "EMA", "WMA"]
@@ -18,27 +27,46 @@ def compute_ma(series: pd.Series, ma_type: MaType, length: int) -> pd.Series:
     This is the core utility used by MovingAverage and MovingAverageRatio
     factors, and also available for direct use by strategies.
     """
+    values = compute_ma_values(series.to_numpy(dtype=np.float64), ma_type, length)
+    return pd.Series(values, index=series.index, name=series.name)
+
+
+def compute_ma_values(values: np.ndarray, ma_type: MaType, length: int) -> np.ndarray:
+    """compute_ma on an array: one series, or each column of a (time x symbol) matrix."""
     if length < 1:
         raise FactorComputeError(f"MA length must be >= 1, got {length}")
 
     if ma_type == "SMA":
-        return series.rolling(length).mean()
+        return kernels.sma(values, length)
     elif ma_type == "EMA":
-        return series.ewm(span=length, adjust=False).mean()
+        return kernels.ema(values, length)
     elif ma_type == "WMA":
-        weights = np.arange(1, length + 1, dtype=float)
-        weights /= weights.sum()
-        return series.rolling(length).apply(lambda x: np.dot(x, weights), raw=True)
+        return kernels.wma(values, length)
     else:
         raise FactorComputeError(f"Unknown MA type: {ma_type}")
 
 
+def ma_node(source: expression.Node, ma_type: MaType, length: int) -> expression.Node:
+    """The moving average as an expression node, shared with every other
+    factor and expression averaging the same source over the same bars."""
+    if length < 1:
+        raise FactorComputeError(f"MA length must be >= 1, got {length}")
+    if ma_type not in _MA_NODES:
+        raise FactorComputeError(f"Unknown MA type: {ma_type}")
+    return _MA_NODES[ma_type](source, length)
+
+
+_MA_NODES = {"SMA": expression.sma, "EMA": expression.ema, "WMA": expression.wma}
+
+
 class MovingAverage:
     """Factor: compute a moving average of close prices.
 
-    Implements the Factor protocol.
+    Implements the Factor and PanelFactor protocols.
     """
 
+    panel_fields = ("close",)
+
     def __init__(self, ma_type: MaType = "SMA", length: int = 50):
         self.ma_type = ma_type
         self.length = length
@@ -50,33 +78,55 @@ class MovingAverage:
                 f"Need at least {self.length} bars for {self.ma_type}({self.length}), "
                 f"got {len(close)}"
             )
-        values = compute_ma(close, self.ma_type, self.length).dropna()
+        values = _close_series(_ma_values(prices, self.ma_type, self.length), prices)
         return FactorSeries(
             name=f"{self.ma_type}({self.length})",
             values=values,
             metadata={"ma_type": self.ma_type, "length": self.length},
         )
 
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        bars = BarAxis(panel)
+        bars.require(self.length, f"{self.ma_type}({self.length})")
+        ma = compute_ma_values(bars.gather(panel.field("close")), self.ma_type, self.length)
+        return FactorPanel(
+            name=f"{self.ma_type}({self.length})",
+            dates=panel.dates,
+            symbols=panel.symbols,
+            values=bars.scatter(ma),
+            metadata={"ma_type": self.ma_type, "length": self.length},
+        )
+
+    def stream(self) -> MovingAverageStream:
+        return MovingAverageStream(self.ma_type, self.length)
+
+    def compute_tail(self, prices: PriceFrame, k: int = 1) -> FactorSeries:
+        """The last k values of compute(prices), from only the bars they need."""
+        recent = tail.tail_frame(prices, k, *_tail_window(self.ma_type, self.length))
+        return tail.last(self.compute(recent), k)
+
 
 class MovingAverageRatio:
     """Factor: price / MA - 1. Measures how far price is from its MA.
 
     Positive = price above MA, negative = price below MA.
-    Implements the Factor protocol.
+    Implements the Factor and PanelFactor protocols.
     """
 
+    panel_fields = ("close",)
+
     def __init__(self, ma_type: MaType = "SMA", length: int = 50):
         self.ma_type = ma_type
         self.length = length
 
     def compute(self, prices: PriceFrame) -> FactorSeries:
-        close = prices.data["close"]
+        close = prices.close
         if len(close) < self.length:
             raise FactorComputeError(
                 f"Need at least {self.length} bars for MA ratio, got {len(close)}"
             )
 
-        ma = compute_ma(close, self.ma_type, self.length)
+        ma = _ma_values(prices, self.ma_type, self.length)
 
         # Guard against zero MA (e.g., if all prices are 0)
         if (ma == 0).any():
@@ -85,19 +135,47 @@ class MovingAverageRatio:
                 f"cannot compute ratio"
             )
 
-        values = (close / ma - 1).dropna()
+        values = _close_series(close / ma - 1, prices)
         return FactorSeries(
             name=f"{self.ma_type}({self.length}) Ratio",
             values=values,
             metadata={"ma_type": self.ma_type, "length": self.length},
         )
 
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        bars = BarAxis(panel)
+        bars.require(self.length, "MA ratio")
+        close = bars.gather(panel.field("close"))
+        ma = compute_ma_values(close, self.ma_type, self.length)
+
+        if (ma == 0).any():
+            j = int(np.flatnonzero((ma == 0).any(axis=0))[0])
+            raise FactorComputeError(
+                f"MA contains zero values for {panel.symbols[j]} — "
+                f"cannot compute ratio"
+            )
+
+        return FactorPanel(
+            name=f"{self.ma_type}({self.length}) Ratio",
+            dates=panel.dates,
+            symbols=panel.symbols,
+            values=bars.scatter(close / ma - 1),
+            metadata={"ma_type": self.ma_type, "length": self.length},
+        )
+
+    def stream(self) -> MovingAverageStream:
+        return MovingAverageStream(self.ma_type, self.length, ratio=True)
+
+    def compute_tail(self, prices: PriceFrame, k: int = 1) -> FactorSeries:
+        """The last k values of compute(prices), from only the bars they need."""
+        recent = tail.tail_frame(prices, k, *_tail_window(self.ma_type, self.length))
+        return tail.last(self.compute(recent), k)
+
     def context(self, prices: PriceFrame) -> dict[str, Any]:
         """Return current MA value and its distance from price."""
-        close = prices.data["close"]
-        ma = compute_ma(close, self.ma_type, self.length)
-        ma_value = float(ma.iloc[-1])
-        current_price = float(close.iloc[-1])
+        recent = tail.tail_frame(prices, 1, *_tail_window(self.ma_type, self.length))
+        ma_value = float(_ma_values(recent, self.ma_type, self.length)[-1])
+        current_price = float(recent.close[-1])
         return {
             "ma_value": ma_value,
             "ma_type": self.ma_type,
@@ -106,6 +184,25 @@ class MovingAverageRatio:
         }
 
 
+def _tail_window(ma_type: MaType, length: int) -> tuple[int, int]:
+    """(warm-up, alignment) of tail.tail_frame for an MA."""
+    if ma_type == "EMA":
+        return tail.ema_warmup(length), 1
+    return length, length
+
+
+def _ma_values(prices: PriceFrame, ma_type: MaType, length: int) -> np.ndarray:
+    """The MA of prices' closes, through the shared intermediates cache (read-only)."""
+    (ma,) = expression.evaluate([ma_node(expression.field("close"), ma_type, length)], prices)
+    return ma
+
+
+def _close_series(values: np.ndarray, prices: PriceFrame) -> pd.Series:
+    """values on prices' index without warm-up NaNs, named like the close column."""
+    keep = ~np.isnan(values)
+    return pd.Series(values[keep], index=prices.data.index[keep], name="close")
+
+
 class DistanceFromMovingAverage(MovingAverageRatio):
     """Factor: percentage distance from moving average.
 
@@ -117,3 +214,79 @@ class DistanceFromMovingAverage(MovingAverageRatio):
         result = super().compute(prices)
         result.name = f"Distance from {self.ma_type}({self.length})"
         return result
+
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        result = super().compute_panel(panel)
+        result.name = f"Distance from {self.ma_type}({self.length})"
+        return result
+
+
+class MovingAverageStream(BarStream):
+    """Incremental MovingAverage, or MovingAverageRatio with ratio=True.
+
+    Implements the FactorStream protocol.  SMA and WMA keep a ring buffer of
+    the last length closes with a running sum (and position-weighted sum);
+    EMA keeps only its last value.
+    """
+
+    _saved = ("window", "ema")
+
+    def __init__(self, ma_type: MaType = "SMA", length: int = 50, ratio: bool = False):
+        if length < 1:
+            raise FactorComputeError(f"MA length must be >= 1, got {length}")
+        if ma_type not in ("SMA", "EMA", "WMA"):
+            raise FactorComputeError(f"Unknown MA type: {ma_type}")
+        super().__init__(ma_type=ma_type, length=length, ratio=ratio)
+        self.ma_type = ma_type
+        self.length = length
+        self.ratio = ratio
+        self._sync_every = length
+
+    def _reset(self, columns: int) -> None:
+        # EMA needs no history, only the bar count for its warm-up.
+        self.window = RingBuffer(1 if self.ma_type == "EMA" else self.length, columns)
+        self.ema = np.full(columns, np.nan)
+        self.total = np.zeros(columns)
+        self.weighted = np.zeros(columns)
+
+    def _load(self, history: PricePanel) -> None:
+        close = history.field("close")
+        self.window.load(close, history.valid)
+        if self.ma_type == "EMA" and len(history.dates):
+            bars = BarAxis(history)
+            ema = bars.scatter(compute_ma_values(bars.gather(close), "EMA", self.length))
+            last = len(history.dates) - 1 - history.valid[::-1].argmax(axis=0)
+            self.ema = np.where(bars.counts > 0, ema[last, np.arange(len(last))], np.nan)
+
+    def _step(self, bar: dict[str, np.ndarray], mask: np.ndarray) -> np.ndarray:
+        close = bar["close"]
+        if self.ma_type == "EMA":
+            alpha = 2 / (self.length + 1)
+            smoothed = np.where(self.window.count == 0, close, (1 - alpha) * self.ema + alpha * close)
+            self.ema = np.where(mask, smoothed, self.ema)
+            self.window.push(close, mask)
+            ma = self.ema
+        else:
+            if self.ma_type == "WMA":
+                # Every bar already in the window moves one weight down.
+                self.weighted = np.where(
+                    mask, self.weighted - self.total + self.length * close, self.weighted
+                )
+            dropped = self.window.push(close, mask)
+            self.total = np.where(mask, self.total + close - np.nan_to_num(dropped), self.total)
+            if self.ma_type == "SMA":
+                ma = self.total / self.length
+            else:
+                ma = self.weighted / (self.length * (self.length + 1) / 2)
+
+        ma = np.where(self.window.count >= self.length, ma, np.nan)
+        if not self.ratio:
+            return ma
+        return np.where(ma == 0, np.nan, close / ma - 1)
+
+    def _sync(self) -> None:
+        if self.ma_type == "EMA":
+            return
+        rows = self.window.rows
+        self.total = np.nansum(rows, axis=0)
+        self.weighted = np.nansum(rows * (self.length - self.window.ages()), axis=0)
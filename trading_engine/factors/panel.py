@@ -0,0 +1,68 @@
+"""Bar coordinates for panel-wide factor computation (Factor.compute_panel).
+
+A PricePanel row is a calendar date.  A symbol that listed late, was
+suspended, or follows another exchange's holidays has invalid rows, so a
+window rolled straight down the panel would span calendar rows rather than
+the symbol's own bars and disagree with compute().  BarAxis stacks each
+column's valid bars contiguously, the factor math runs on that matrix with
+the same kernels compute() uses, and scatter() puts the results back on the
+panel calendar.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from trading_engine.types import FactorComputeError, PricePanel
+
+
+class BarAxis:
+    """Per-symbol bar positions of a (time x symbol) panel."""
+
+    def __init__(self, panel: PricePanel):
+        self.symbols = panel.symbols
+        self.valid = panel.valid
+        self.counts = self.valid.sum(axis=0)
+
+        # Columns whose bars form one unbroken run (late listings, early
+        # delistings) need no re-stacking: leading invalid rows only delay
+        # the warm-up, exactly as in the symbol's own series.
+        first = self.valid.argmax(axis=0)
+        last = len(self.valid) - 1 - self.valid[::-1].argmax(axis=0)
+        contiguous = (self.counts == 0) | (last - first + 1 == self.counts)
+        self._order = None
+        if not contiguous.all():
+            self._order = np.argsort(~self.valid, axis=0, kind="stable")
+
+    def require(self, bars: int, what: str) -> None:
+        """Raise like compute() does when any symbol has fewer than bars bars."""
+        short = np.flatnonzero(self.counts < bars)
+        if len(short):
+            j = short[0]
+            raise FactorComputeError(
+                f"Need at least {bars} bars for {what}, got {self.counts[j]} "
+                f"for {self.symbols[j]}"
+            )
+
+    def gather(self, matrix: np.ndarray) -> np.ndarray:
+        """Panel-calendar matrix -> each column's bars in order."""
+        if self._order is None:
+            return matrix
+        return np.take_along_axis(matrix, self._order, axis=0)
+
+    def scatter(self, matrix: np.ndarray) -> np.ndarray:
+        """Inverse of gather(); NaN where a symbol has no bar."""
+        if self._order is None:
+            out = np.array(matrix, dtype=np.float64)
+        else:
+            out = np.empty(matrix.shape)
+            np.put_along_axis(out, self._order, matrix, axis=0)
+        out[~self.valid] = np.nan
+        return out
+
+
+def shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Series.shift(periods) along the first axis, for arrays."""
+    out = np.full(values.shape, np.nan)
+    if periods < len(values):
+        out[periods:] = values[:len(values) - periods]
+    return out
@@ -0,0 +1,141 @@
+"""Point-in-time percentile rank of a factor.
+
+percentile_breakdown() and zone_rarity_analysis() rank the latest value
+against the factor's whole history, which is right for "how rare is today"
+but uses future bars when replayed historically.  RollingPercentile gives,
+at every bar, the percentile of that bar's value among the values seen up
+to and including it — over the last window bars, or all of them
+(expanding) — so rarity signals can be backtested without look-ahead.
+
+Ranks come from pandas' rolling/expanding rank, an indexable skiplist of
+the window's values: O(log w) per bar rather than a percentileofscore()
+over the window (O(w)) per bar.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from trading_engine.types import (
+    Factor,
+    FactorComputeError,
+    FactorPanel,
+    FactorSeries,
+    PanelFactor,
+    PriceFrame,
+    PricePanel,
+)
+
+
+def rolling_percentile(
+    values: pd.Series,
+    window: int | None = None,
+    min_periods: int | None = None,
+) -> pd.Series:
+    """Percentile (0-100) of each value within the window ending on it.
+
+    Equals scipy.stats.percentileofscore(window_values, value) (kind="rank":
+    ties share their average rank).  window=None ranks against every value so
+    far.  NaN until min_periods values (default: window, or 2 expanding).
+    """
+    if window is not None and window < 2:
+        raise FactorComputeError(f"Percentile window must be >= 2, got {window}")
+    if min_periods is None:
+        min_periods = 2 if window is None else window
+    if min_periods < 1 or (window is not None and min_periods > window):
+        raise FactorComputeError(
+            f"min_periods must be between 1 and the window, got {min_periods}"
+        )
+
+    rolling = (
+        values.expanding(min_periods) if window is None
+        else values.rolling(window, min_periods=min_periods)
+    )
+    return rolling.rank(method="average", pct=True) * 100
+
+
+class RollingPercentile:
+    """Factor: point-in-time percentile rank (0-100) of another factor.
+
+    Value on bar t = percentileofscore(factor values in the window ending at
+    t, factor value at t).  window=None is expanding: all values up to t.
+    compute() on a prefix of the prices gives a prefix of the full result.
+
+    Implements the Factor protocol.  Wrapping a PanelFactor gives a
+    PanelRollingPercentile, which implements PanelFactor too.
+    """
+
+    def __new__(cls, factor: Factor | None = None, *args: Any, **kwargs: Any):
+        if cls is RollingPercentile and isinstance(factor, PanelFactor):
+            cls = PanelRollingPercentile
+        return super().__new__(cls)
+
+    def __init__(
+        self,
+        factor: Factor,
+        window: int | None = 252,
+        min_periods: int | None = None,
+    ):
+        self.factor = factor
+        self.window = window
+        self.min_periods = min_periods
+
+    def compute(self, prices: PriceFrame) -> FactorSeries:
+        inner = self.factor.compute(prices)
+        values = inner.values.dropna()
+        percentile = rolling_percentile(values, self.window, self.min_periods).dropna()
+        if percentile.empty:
+            raise FactorComputeError(
+                f"Need at least {self._min_periods()} values of {inner.name} "
+                f"for its percentile, got {len(values)}"
+            )
+        return FactorSeries(
+            name=self._name(inner.name),
+            values=percentile,
+            metadata=self._metadata(inner.name),
+        )
+
+    def _min_periods(self) -> int:
+        if self.min_periods is not None:
+            return self.min_periods
+        return 2 if self.window is None else self.window
+
+    def _name(self, inner: str) -> str:
+        span = "expanding" if self.window is None else str(self.window)
+        return f"Percentile({inner}, {span})"
+
+    def _metadata(self, inner: str) -> dict:
+        return {"factor": inner, "window": self.window, "min_periods": self._min_periods()}
+
+
+class PanelRollingPercentile(RollingPercentile):
+    """RollingPercentile of a PanelFactor, ranking each symbol's own history.
+
+    Implements the Factor and PanelFactor protocols.
+    """
+
+    @property
+    def panel_fields(self) -> tuple[str, ...]:
+        return self.factor.panel_fields
+
+    def compute_panel(self, panel: PricePanel) -> FactorPanel:
+        inner = self.factor.compute_panel(panel)
+        out = np.full(inner.values.shape, np.nan)
+        for j in range(out.shape[1]):
+            present = np.flatnonzero(~np.isnan(inner.values[:, j]))
+            if len(present) < self._min_periods():
+                raise FactorComputeError(
+                    f"Need at least {self._min_periods()} values of {inner.name} "
+                    f"for its percentile, got {len(present)} for {panel.symbols[j]}"
+                )
+            column = pd.Series(inner.values[present, j])
+            out[present, j] = rolling_percentile(column, self.window, self.min_periods).to_numpy()
+        return FactorPanel(
+            name=self._name(inner.name),
+            dates=inner.dates,
+            symbols=inner.symbols,
+            values=out,
+            metadata=self._metadata(inner.name),
+        )
@@ -0,0 +1,241 @@
+"""Incremental factor state for live monitoring (Factor.stream).
+
+Recomputing a factor's whole history every time a daily bar arrives costs
+O(history) per symbol.  A stream keeps just the state the factor needs — a
+ring buffer of the last window bars plus running sums or extrema — so each
+new bar is O(1) per symbol:
+
+    stream = MovingAverageRatio("SMA", 200).stream()
+    stream.init(history)              # PriceFrame, or a PricePanel universe
+    value = stream.update({"close": 101.5})
+
+A stream initialised from a PricePanel updates every symbol at once: bar
+fields are (N,) arrays and update() returns an (N,) array, NaN for symbols
+whose close is NaN (no bar today; their state is left untouched).  Each
+value is the last value compute() would give on the bars seen so far, or NaN
+while compute() would have no value (warm-up) or would reject the window
+(zero MA, zero band width).
+
+Running sums drift by rounding as bars are added and dropped, so they are
+rebuilt from the ring buffer once per window of updates (amortised O(1)).
+state() is plain lists and numbers (JSON-serialisable); from_state()
+restores it.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Any, Mapping
+
+import numpy as np
+
+from trading_engine.types import FactorComputeError, PriceFrame, PricePanel
+
+
+class RingBuffer:
+    """The last size bars of each of a (time x symbol) block of series.
+
+    Bar i of a column (counting from its first bar) lives in row i % size,
+    so the next bar of column j goes to row count[j] % size.
+    """
+
+    def __init__(self, size: int, columns: int):
+        self.size = size
+        self.rows = np.full((size, columns), np.nan)
+        self.count = np.zeros(columns, dtype=np.int64)
+
+    def load(self, values: np.ndarray, valid: np.ndarray) -> None:
+        """Fill from a (time x symbol) history, keeping each column's last size bars."""
+        bar = np.cumsum(valid, axis=0) - 1  # bar number of each valid row
+        self.count = valid.sum(axis=0).astype(np.int64)
+        keep = valid & (bar >= self.count - self.size)
+        t, j = np.nonzero(keep)
+        self.rows[:] = np.nan
+        self.rows[bar[t, j] % self.size, j] = values[t, j]
+
+    def push(self, x: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Append x where mask; return the bars that fell out (NaN while filling)."""
+        cols = np.flatnonzero(mask)
+        slot = self.count[cols] % self.size
+        dropped = np.full(len(x), np.nan)
+        dropped[cols] = self.rows[slot, cols]
+        self.rows[slot, cols] = x[cols]
+        self.count[cols] += 1
+        return dropped
+
+    def full(self) -> np.ndarray:
+        return self.count >= self.size
+
+    def latest(self) -> np.ndarray:
+        """Each column's newest bar (NaN before its first)."""
+        out = self.rows[(self.count - 1) % self.size, np.arange(self.rows.shape[1])]
+        return np.where(self.count > 0, out, np.nan)
+
+    def ages(self) -> np.ndarray:
+        """(size x symbol) age of the bar in each row: 0 = newest."""
+        return (self.count[None, :] - 1 - np.arange(self.size)[:, None]) % self.size
+
+
+def roll_extreme(
+    op: np.ufunc,
+    current: np.ndarray,
+    window: RingBuffer,
+    x: np.ndarray,
+    dropped: np.ndarray,
+    mask: np.ndarray,
+) -> np.ndarray:
+    """Running max/min (op = np.fmax / np.fmin) after window.push(x, mask).
+
+    Only a column whose extreme just fell out of the window, and was not
+    replaced by x, is rescanned.
+    """
+    out = np.where(mask, op(current, x), current)
+    stale = mask & (dropped == current) & (op(x, dropped) != x)
+    if stale.any():
+        cols = np.flatnonzero(stale)
+        out[cols] = op.reduce(window.rows[:, cols], axis=0)
+    return out
+
+
+def epoch_day(value: Any) -> np.ndarray:
+    """Date(s) — date, datetime, Timestamp, ISO string or epoch day — as int64 epoch days."""
+    days = np.asarray(value)
+    if np.issubdtype(days.dtype, np.integer):
+        return days.astype(np.int64)
+    if days.dtype == object or days.dtype.kind in "US":
+        days = np.array([np.datetime64(v, "D") for v in np.atleast_1d(value)]).reshape(days.shape)
+    return days.astype("datetime64[D]").astype(np.int64)
+
+
+class BarStream(ABC):
+    """Shared plumbing of the factor streams.
+
+    Subclasses set fields (bar fields read) and _saved (array or RingBuffer
+    attributes making up the state), and implement _reset(columns),
+    _load(history), _step(bar, mask) and, when they keep running sums,
+    _sync().
+    """
+
+    fields: tuple[str, ...] = ("close",)
+    _saved: tuple[str, ...] = ()
+
+    def __init__(self, **params: Any):
+        self.params = params
+        self.symbols: list[str] | None = None
+        self._sync_every = 1
+        self._updates = 0
+        self._columns = 0
+        self._ready = False
+
+    def init(self, history: PriceFrame | PricePanel) -> None:
+        """Start from history: one PriceFrame, or every symbol of a PricePanel."""
+        if isinstance(history, PricePanel):
+            missing = [f for f in self.fields if f not in history.fields]
+            if missing:
+                raise FactorComputeError(f"Panel lacks fields {missing} needed to stream")
+            self.symbols = list(history.symbols)
+        else:
+            history = PricePanel.from_frames({history.symbol: history}, fields=self.fields)
+            self.symbols = None
+        self._columns = len(history.symbols)
+        self._reset(self._columns)
+        self._load(history)
+        self._sync()
+        self._updates = 0
+        self._ready = True
+
+    def update(self, bar: Mapping[str, Any]) -> float | np.ndarray:
+        """Advance by one bar and return the factor value on it.
+
+        bar maps each of fields (plus "date" where the factor needs it) to a
+        scalar for a PriceFrame stream, or an (N,) array for a panel stream.
+        """
+        self._require_ready()
+        arrays = {}
+        for name in self.fields:
+            if name not in bar:
+                raise FactorComputeError(f"Bar is missing {name!r}")
+            value = np.asarray(bar[name], dtype=np.float64).reshape(-1)
+            if len(value) != self._columns:
+                raise FactorComputeError(
+                    f"Bar {name!r} has {len(value)} values for {self._columns} symbols"
+                )
+            arrays[name] = value
+        if "date" in bar:
+            arrays["date"] = np.broadcast_to(epoch_day(bar["date"]), (self._columns,))
+        mask = ~np.isnan(arrays["close"])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = self._step(arrays, mask)
+        out = np.where(mask, out, np.nan)
+
+        self._updates += 1
+        if self._updates >= self._sync_every:
+            self._sync()
+            self._updates = 0
+        return float(out[0]) if self.symbols is None else out
+
+    def state(self) -> dict[str, Any]:
+        """Plain-data (JSON-serialisable) snapshot for from_state()."""
+        self._require_ready()
+        arrays: dict[str, Any] = {}
+        for name in self._saved:
+            value = getattr(self, name)
+            if isinstance(value, RingBuffer):
+                arrays[name] = {"rows": value.rows.tolist(), "count": value.count.tolist()}
+            else:
+                arrays[name] = value.tolist()
+        return {
+            "stream": type(self).__name__,
+            "params": dict(self.params),
+            "symbols": self.symbols,
+            "columns": self._columns,
+            "updates": self._updates,
+            "arrays": arrays,
+        }
+
+    @classmethod
+    def from_state(cls, state: Mapping[str, Any]) -> BarStream:
+        """Rebuild a stream saved with state()."""
+        if state.get("stream") != cls.__name__:
+            raise FactorComputeError(
+                f"State is for {state.get('stream')!r}, not {cls.__name__}"
+            )
+        stream = cls(**state["params"])
+        stream.symbols = state["symbols"]
+        stream._columns = state["columns"]
+        stream._reset(stream._columns)
+        for name, value in state["arrays"].items():
+            current = getattr(stream, name)
+            if isinstance(current, RingBuffer):
+                current.rows = np.array(value["rows"], dtype=np.float64).reshape(current.rows.shape)
+                current.count = np.array(value["count"], dtype=np.int64)
+            else:
+                setattr(stream, name, np.array(value, dtype=current.dtype))
+        stream._sync()
+        stream._updates = state["updates"]
+        stream._ready = True
+        return stream
+
+    def _require_ready(self) -> None:
+        if not self._ready:
+            raise FactorComputeError("Stream not initialised: call init(history) first")
+
+    # ── Subclass hooks ───────────────────────────────────────────────────────
+
+    @abstractmethod
+    def _reset(self, columns: int) -> None:
+        """Allocate empty state for columns symbols."""
+        ...
+
+    @abstractmethod
+    def _load(self, history: PricePanel) -> None:
+        """Fill the state from the history bars."""
+        ...
+
+    @abstractmethod
+    def _step(self, bar: dict[str, np.ndarray], mask: np.ndarray) -> np.ndarray:
+        """Advance the symbols in mask by one bar and return every symbol's value."""
+        ...
+
+    def _sync(self) -> None:
+        """Rebuild running sums exactly from the ring buffers."""
@@ -0,0 +1,60 @@
+"""Tail-only factor evaluation (Factor.compute_tail).
+
+A screen ("which tickers are below their SMA200 today?") or a context panel
+needs the last value, or the last k, yet compute() walks the whole history.
+A windowed factor's last k values depend only on its last k + warm-up - 1
+bars, so compute_tail() runs compute() on just those:
+
+    factor.compute_tail(prices, k)  ==  last k values of factor.compute(prices)
+
+The match is exact, not approximate.  The rolling kernels cut a series into
+blocks of one window starting at its first bar, so the tail slice starts on
+a block boundary of the full history (rounded down to a multiple of the
+window) and every window is summed exactly as in the full run.  EMA has no
+finite window; its warm-up is long enough that the weight of the dropped
+history is below double precision.
+"""
+from __future__ import annotations
+
+import math
+
+from trading_engine.types import Factor, FactorComputeError, FactorSeries, PriceFrame
+
+
+def tail_frame(prices: PriceFrame, k: int, warmup: int, align: int = 1) -> PriceFrame:
+    """The bars the last k values need: k + warmup - 1 of them, the slice
+    start rounded down to a multiple of align."""
+    if k < 1:
+        raise FactorComputeError(f"compute_tail needs k >= 1, got {k}")
+    n = len(prices)
+    start = max(n - (k + warmup - 1), 0)
+    start -= start % max(align, 1)
+    return prices.tail(n - start)
+
+
+def ema_warmup(span: int) -> int:
+    """Bars after which an EMA no longer depends on where it was seeded."""
+    alpha = 2 / (span + 1)
+    if alpha >= 1:
+        return 1
+    return span + math.ceil(math.log(2.0 ** -60) / math.log(1 - alpha))
+
+
+def last(result: FactorSeries, k: int) -> FactorSeries:
+    """result with only its last k values."""
+    result.values = result.values.iloc[-k:]
+    return result
+
+
+def compute_tail(factor: Factor, prices: PriceFrame, k: int = 1) -> FactorSeries:
+    """The last k values of factor.compute(prices), for any Factor.
+
+    Uses the factor's own compute_tail() when it has one, otherwise falls
+    back to a full compute().
+    """
+    method = getattr(factor, "compute_tail", None)
+    if method is not None:
+        return method(prices, k)
+    if k < 1:
+        raise FactorComputeError(f"compute_tail needs k >= 1, got {k}")
+    return last(factor.compute(prices), k)
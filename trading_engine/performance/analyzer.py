@@ -7,8 +7,8 @@ import pandas as pd
 from trading_engine.types import (
     PerformanceReport,
     PortfolioResult,
-    Trade,
     TradeDistribution,
+    TradeTable,
 )
 
 
@@ -19,7 +19,7 @@ def analyze_performance(result: PortfolioResult) -> PerformanceReport:
     Handles the edge case of 0 trades gracefully (all metrics = 0).
     """
     equity = result.equity_curve
-    trades = result.trades
+    trades = TradeTable.of(result.trades)
 
     if equity.empty or len(equity) < 2:
         return _empty_report()
@@ -31,9 +31,9 @@ def analyze_performance(result: PortfolioResult) -> PerformanceReport:
     max_dd = _compute_max_drawdown(equity)
 
     # Trade-level metrics
-    closed_trades = [t for t in trades if t.exit_date is not None]
+    closed_trades = trades.take(~trades.is_open)
 
-    if not closed_trades:
+    if not len(closed_trades):
         return PerformanceReport(
             total_return_pct=total_return_pct,
             cagr=cagr,
@@ -47,13 +47,13 @@ def analyze_performance(result: PortfolioResult) -> PerformanceReport:
             trade_distribution=_empty_distribution(),
         )
 
-    returns = [t.return_pct for t in closed_trades if t.return_pct is not None]
+    returns = closed_trades.present("return_pct")
     wins = [r for r in returns if r > 0]
     win_rate = len(wins) / len(returns) * 100 if returns else 0.0
     avg_return = float(np.mean(returns)) if returns else 0.0
 
-    holding_days = [t.holding_days for t in closed_trades if t.holding_days is not None]
-    avg_holding = float(np.mean(holding_days)) if holding_days else 0.0
+    holding_days = closed_trades.holding_days[closed_trades.holding_days >= 0]
+    avg_holding = float(np.mean(holding_days)) if len(holding_days) else 0.0
 
     monthly = _compute_monthly_returns(equity)
     annual = _compute_annual_returns(equity)
@@ -127,11 +127,11 @@ def _compute_annual_returns(equity: pd.Series) -> pd.Series:
     return annual.dropna()
 
 
-def _compute_distribution(trades: list[Trade]) -> TradeDistribution:
+def _compute_distribution(trades: TradeTable) -> TradeDistribution:
     """Compute return/MAE/MFE distribution buckets."""
-    returns = [t.return_pct for t in trades if t.return_pct is not None]
-    maes = [t.mae_pct for t in trades if t.mae_pct is not None]
-    mfes = [t.mfe_pct for t in trades if t.mfe_pct is not None]
+    returns = trades.present("return_pct")
+    maes = trades.present("mae_pct")
+    mfes = trades.present("mfe_pct")
 
     return_buckets = _bucket(returns, [
         ("< -20%", float("-inf"), -20),
@@ -3,6 +3,10 @@
 run_comparison() takes N BacktestConfigs + pre-fetched prices,
 runs each one, and collects results + errors. Partial failure:
 individual config failures are collected, not raised.
+
+When every config covers the same symbols and dates (a parameter sweep),
+the configs run as one run_portfolios() batch: weights per config, then
+all equity curves in a single NAV pass.
 """
 from __future__ import annotations
 
@@ -17,7 +21,7 @@ from trading_engine.types import (
     PriceFrame,
     StrategySlot,
 )
-from trading_engine.portfolio.simulation import run_portfolio
+from trading_engine.portfolio.simulation import run_portfolio, run_portfolios
 
 
 def run_comparison(
@@ -42,6 +46,13 @@ def run_comparison(
     if not configs:
         raise ValueError("No configs provided to run_comparison")
 
+    first = configs[0]
+    if all(
+        c.symbols == first.symbols and c.start == first.start and c.end == first.end
+        for c in configs
+    ):
+        return _run_shared(configs, prices, max_workers)
+
     results: list[PortfolioResult] = []
     successful_configs: list[BacktestConfig] = []
     errors: list[tuple[BacktestConfig, Exception]] = []
@@ -76,39 +87,70 @@ def run_comparison(
     )
 
 
+def _run_shared(
+    configs: list[BacktestConfig],
+    prices: dict[str, PriceFrame],
+    max_workers: int,
+) -> ComparisonReport:
+    """Run configs that share symbols and dates as one run_portfolios() batch."""
+    try:
+        filtered = _filter_prices(configs[0], prices)
+    except ConfigError as e:
+        return ComparisonReport(results=[], configs=[], errors=[(c, e) for c in configs])
+
+    outcomes = run_portfolios([_portfolio(c) for c in configs], filtered, max_workers)
+
+    results: list[PortfolioResult] = []
+    successful_configs: list[BacktestConfig] = []
+    errors: list[tuple[BacktestConfig, Exception]] = []
+    for config, outcome in zip(configs, outcomes):
+        if isinstance(outcome, Exception):
+            errors.append((config, outcome))
+        else:
+            results.append(outcome)
+            successful_configs.append(config)
+    return ComparisonReport(
+        results=results,
+        configs=successful_configs,
+        errors=errors,
+    )
+
+
 def _run_single(
     config: BacktestConfig,
     prices: dict[str, PriceFrame],
 ) -> tuple[PortfolioResult | None, Exception | None]:
     """Run a single backtest config. Returns (result, None) or (None, error)."""
     try:
-        # Filter prices to the config's date range and symbols
-        filtered: dict[str, PriceFrame] = {}
-        for symbol in config.symbols:
-            if symbol not in prices:
-                raise ConfigError(f"No price data for symbol: {symbol}")
-
-            pf = prices[symbol]
-            mask = (pf.data.index >= str(config.start)) & (
-                pf.data.index <= str(config.end)
-            )
-            filtered_data = pf.data.loc[mask]
+        result = run_portfolio(_portfolio(config), _filter_prices(config, prices))
+        return result, None
+
+    except Exception as e:
+        return None, e
 
-            if filtered_data.empty:
-                raise ConfigError(
-                    f"No data for {symbol} in range {config.start} to {config.end}"
-                )
 
-            filtered[symbol] = PriceFrame(
-                symbol=symbol, data=filtered_data, source=pf.source
+def _filter_prices(
+    config: BacktestConfig,
+    prices: dict[str, PriceFrame],
+) -> dict[str, PriceFrame]:
+    """Prices of the config's symbols, sliced to its date range."""
+    filtered: dict[str, PriceFrame] = {}
+    for symbol in config.symbols:
+        if symbol not in prices:
+            raise ConfigError(f"No price data for symbol: {symbol}")
+
+        # Views into the shared history: a 500-config sweep copies nothing.
+        sliced = prices[symbol].slice(config.start, config.end)
+        if len(sliced) == 0:
+            raise ConfigError(
+                f"No data for {symbol} in range {config.start} to {config.end}"
             )
+        filtered[symbol] = sliced
+    return filtered
 
-        portfolio = Portfolio(
-            slots=[StrategySlot(strategy=config.strategy, weight=1.0)],
-            initial_capital=1000.0,
-        )
-        result = run_portfolio(portfolio, filtered)
-        return result, None
 
-    except Exception as e:
-        return None, e
+def _portfolio(config: BacktestConfig) -> Portfolio:
+    return Portfolio(
+        slots=[StrategySlot(strategy=config.strategy, weight=1.0)],
+        initial_capital=1000.0,
+    )
@@ -8,7 +8,6 @@ from __future__ import annotations
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Any
 
 import numpy as np
 import pandas as pd
@@ -16,7 +15,7 @@ import pandas as pd
 from trading_engine import run_portfolio
 from trading_engine.strategy.buy_and_hold import BuyAndHold
 from trading_engine.strategy.factor_threshold import FactorThresholdStrategy
-from trading_engine.types import Portfolio, PortfolioResult, PriceFrame, Strategy, StrategySlot, Trade
+from trading_engine.types import Portfolio, PortfolioResult, PriceFrame, Strategy, StrategySlot, TradeTable
 
 
 # =============================================================================
@@ -191,33 +190,35 @@ def run_single_ticker_analysis(
     to_date = str(equity.index[-1].date()) if not equity.empty else ""
     total_bars = len(equity)
 
-    open_trades = [t for t in result.trades if t.exit_date is None]
-    closed_trades = [t for t in result.trades if t.exit_date is not None]
+    trades = TradeTable.of(result.trades)
+    closed_trades = trades.take(~trades.is_open)
 
     # Current open position for this symbol (most recent)
     current_position: CurrentPosition | None = None
-    symbol_open = [t for t in open_trades if t.symbol == symbol]
-    if symbol_open:
-        t = symbol_open[-1]
+    symbol_open = np.flatnonzero(trades.is_open & (_symbol_codes(trades) == symbol))
+    if len(symbol_open):
+        k = symbol_open[-1]
+        entry_price = float(trades.entry_price[k])
         last_price = float(price_frame.data["close"].iloc[-1])
-        unrealized = (last_price / t.entry_price - 1) * 100 if t.entry_price > 0 else None
+        unrealized = (last_price / entry_price - 1) * 100 if entry_price > 0 else None
         current_position = CurrentPosition(
-            entry_date=str(t.entry_date),
-            entry_price=t.entry_price,
-            holding_days=t.holding_days or 0,
+            entry_date=str(trades.entry_dates[k]),
+            entry_price=entry_price,
+            holding_days=max(int(trades.holding_days[k]), 0),
             unrealized_return_pct=unrealized,
-            mae_pct=t.mae_pct,
-            mfe_pct=t.mfe_pct,
+            mae_pct=_optional(trades.mae_pct[k]),
+            mfe_pct=_optional(trades.mfe_pct[k]),
         )
 
-    bah_closed = [t for t in bah_result.trades if t.exit_date is not None]
+    bah_trades = TradeTable.of(bah_result.trades)
+    bah_closed = bah_trades.take(~bah_trades.is_open)
 
-    returns = [t.return_pct for t in closed_trades if t.return_pct is not None]
-    winners = [t for t in closed_trades if t.return_pct is not None and t.return_pct > 0]
-    losers  = [t for t in closed_trades if t.return_pct is not None and t.return_pct <= 0]
-    winner_maes = [t.mae_pct for t in winners if t.mae_pct is not None]
-    winner_mfes = [t.mfe_pct for t in winners if t.mfe_pct is not None]
-    loser_mfes  = [t.mfe_pct for t in losers  if t.mfe_pct is not None]
+    returns = closed_trades.present("return_pct")
+    winners = closed_trades.take(closed_trades.return_pct > 0)
+    losers  = closed_trades.take(closed_trades.return_pct <= 0)
+    winner_maes = winners.present("mae_pct")
+    winner_mfes = winners.present("mfe_pct")
+    loser_mfes  = losers.present("mfe_pct")
 
     undercut_distribution = _compute_undercut_distribution(strategy, winners, price_frame)
 
@@ -230,7 +231,7 @@ def run_single_ticker_analysis(
         current_position=current_position,
         strategy=_compute_performance_summary(result, closed_trades),
         bah=_compute_performance_summary(bah_result, bah_closed),
-        trades=_compute_trade_rows(result.trades, price_frame),
+        trades=_compute_trade_rows(trades, price_frame),
         return_percentiles=_compute_percentile_table(returns),
         mae_percentiles_winners=_compute_percentile_table(winner_maes),
         mfe_percentiles_winners=_compute_percentile_table(winner_mfes),
@@ -254,7 +255,7 @@ def run_single_ticker_analysis(
 
 def _compute_undercut_distribution(
     strategy: Strategy,
-    winners: list[Trade],
+    winners: TradeTable,
     price_frame: PriceFrame,
 ) -> list[UndercutDistributionRow] | None:
     """Count how many temporary "undercut" events each winning trade had.
@@ -286,19 +287,11 @@ def _compute_undercut_distribution(
     close = price_frame.data["close"]
     ma = compute_ma(close, factor.ma_type, factor.length)
 
-    # Build date→integer-position lookup
-    date_to_idx: dict[Any, int] = {ts: i for i, ts in enumerate(close.index)}
-
+    entries, exits = _trade_bars(winners, price_frame)
     trade_undercuts: list[int] = []  # one entry per winning trade
 
-    for t in winners:
-        if t.exit_date is None:
-            continue
-        entry_ts = pd.Timestamp(str(t.entry_date))
-        exit_ts = pd.Timestamp(str(t.exit_date))
-        entry_idx = date_to_idx.get(entry_ts)
-        exit_idx = date_to_idx.get(exit_ts)
-        if entry_idx is None or exit_idx is None or entry_idx >= exit_idx:
+    for entry_idx, exit_idx in zip(entries.tolist(), exits.tolist()):
+        if entry_idx < 0 or exit_idx < 0 or entry_idx >= exit_idx:
             continue
 
         undercuts = 0
@@ -357,7 +350,7 @@ def _compute_undercut_distribution(
 # Performance summary
 # =============================================================================
 
-def _compute_performance_summary(result: PortfolioResult, closed_trades: list[Trade]) -> PerformanceSummary:
+def _compute_performance_summary(result: PortfolioResult, closed_trades: TradeTable) -> PerformanceSummary:
     equity = result.equity_curve
     if equity.empty or len(equity) < 2:
         return _empty_summary()
@@ -375,9 +368,9 @@ def _compute_performance_summary(result: PortfolioResult, closed_trades: list[Tr
         current_dd_days = int((equity.index[-1] - at_peak.index[-1]).days) if not at_peak.empty else 0
     else:
         current_dd_days = 0
-    time_in_market = _time_in_market(result.trades, equity)
+    time_in_market = _time_in_market(TradeTable.of(result.trades), equity)
 
-    returns = [t.return_pct for t in closed_trades if t.return_pct is not None]
+    returns = closed_trades.present("return_pct")
     if not returns:
         return PerformanceSummary(
             total_return_pct=total_return_pct,
@@ -418,8 +411,8 @@ def _compute_performance_summary(result: PortfolioResult, closed_trades: list[Tr
     sum_losses = sum(abs(r) for r in losses)
     profit_factor = (sum_wins / sum_losses) if sum_losses > 0 else 999.0
 
-    holding_days = [t.holding_days for t in closed_trades if t.holding_days is not None]
-    avg_holding = float(np.mean(holding_days)) if holding_days else 0.0
+    holding_days = closed_trades.holding_days[closed_trades.holding_days >= 0]
+    avg_holding = float(np.mean(holding_days)) if len(holding_days) else 0.0
 
     return PerformanceSummary(
         total_return_pct=total_return_pct,
@@ -452,14 +445,13 @@ def _empty_summary() -> PerformanceSummary:
     )
 
 
-def _time_in_market(trades: list[Trade], equity: pd.Series) -> float:
+def _time_in_market(trades: TradeTable, equity: pd.Series) -> float:
     if equity.empty:
         return 0.0
-    in_market = 0
-    for t in trades:
-        entry = pd.Timestamp(str(t.entry_date))
-        exit_ = pd.Timestamp(str(t.exit_date)) if t.exit_date else equity.index[-1]
-        in_market += int(((equity.index >= entry) & (equity.index <= exit_)).sum())
+    days = equity.index.values.astype("datetime64[D]")
+    exits = np.where(trades.is_open, days[-1], trades.exit_dates)
+    bars = np.searchsorted(days, exits, side="right") - np.searchsorted(days, trades.entry_dates)
+    in_market = int(np.maximum(bars, 0).sum())
     return in_market / len(equity) * 100
 
 
@@ -467,48 +459,52 @@ def _time_in_market(trades: list[Trade], equity: pd.Series) -> float:
 # Trade rows
 # =============================================================================
 
-def _compute_trade_rows(trades: list[Trade], price_frame: PriceFrame) -> list[TradeRow]:
-    close = price_frame.data["close"]
-    # Build date→integer-position lookup for O(1) early-bar lookups
-    date_to_idx: dict[Any, int] = {ts: i for i, ts in enumerate(close.index)}
+def _compute_trade_rows(trades: TradeTable, price_frame: PriceFrame) -> list[TradeRow]:
+    close = price_frame.close
+    entries, exits = _trade_bars(trades, price_frame)
+    entry_dates = trades.entry_dates.astype(str).tolist()
+    exit_dates = trades.exit_dates.astype(str).tolist()
 
     rows = []
-    for t in trades:
-        mae_price = t.entry_price * (1 + t.mae_pct / 100) if t.mae_pct is not None else None
-        mfe_price = t.entry_price * (1 + t.mfe_pct / 100) if t.mfe_pct is not None else None
+    for k, symbol in enumerate(_symbol_codes(trades).tolist()):
+        entry_price = float(trades.entry_price[k])
+        return_pct = _optional(trades.return_pct[k])
+        mae_pct = _optional(trades.mae_pct[k])
+        mfe_pct = _optional(trades.mfe_pct[k])
+        is_open = bool(trades.is_open[k])
+
+        mae_price = entry_price * (1 + mae_pct / 100) if mae_pct is not None else None
+        mfe_price = entry_price * (1 + mfe_pct / 100) if mfe_pct is not None else None
         retracement: float | None = None
-        if t.mfe_pct is not None and t.return_pct is not None and t.return_pct > 0 and t.mfe_pct != 0:
-            retracement = (t.mfe_pct - t.return_pct) / abs(t.mfe_pct) * 100
+        if mfe_pct is not None and return_pct is not None and return_pct > 0 and mfe_pct != 0:
+            retracement = (mfe_pct - return_pct) / abs(mfe_pct) * 100
 
         # Early-bar min returns — lowest return within first N bars while still open
         early_returns: dict[str, float | None] = {}
-        if t.exit_date is not None and t.entry_price > 0:
-            entry_ts = pd.Timestamp(str(t.entry_date))
-            exit_ts  = pd.Timestamp(str(t.exit_date))
-            entry_idx = date_to_idx.get(entry_ts)
-            exit_idx  = date_to_idx.get(exit_ts)
+        if not is_open and entry_price > 0:
+            entry_idx, exit_idx = int(entries[k]), int(exits[k])
             for n in EARLY_BARS:
                 key = str(n)
                 # Bars from entry+1 up to min(entry+n, exit-1) — must have at least 1 bar open
-                if entry_idx is not None and exit_idx is not None and entry_idx + 1 < exit_idx:
+                if entry_idx >= 0 and exit_idx >= 0 and entry_idx + 1 < exit_idx:
                     end_bar = min(entry_idx + n, exit_idx - 1)
-                    window = close.iloc[entry_idx + 1 : end_bar + 1]
-                    min_price = float(window.min())
-                    early_returns[key] = (min_price / t.entry_price - 1) * 100
+                    min_price = float(np.fmin.reduce(close[entry_idx + 1 : end_bar + 1]))
+                    early_returns[key] = (min_price / entry_price - 1) * 100
                 else:
                     early_returns[key] = None
 
+        held = int(trades.holding_days[k])
         rows.append(TradeRow(
-            symbol=t.symbol,
-            direction=t.direction,
-            entry_date=str(t.entry_date),
-            exit_date=str(t.exit_date) if t.exit_date is not None else None,
-            entry_price=t.entry_price,
-            exit_price=t.exit_price,
-            return_pct=t.return_pct,
-            holding_days=t.holding_days,
-            mae_pct=t.mae_pct,
-            mfe_pct=t.mfe_pct,
+            symbol=symbol,
+            direction="long" if trades.direction[k] > 0 else "short",
+            entry_date=entry_dates[k],
+            exit_date=None if is_open else exit_dates[k],
+            entry_price=entry_price,
+            exit_price=None if is_open else float(trades.exit_price[k]),
+            return_pct=return_pct,
+            holding_days=held if held >= 0 else None,
+            mae_pct=mae_pct,
+            mfe_pct=mfe_pct,
             mae_price=mae_price,
             mfe_price=mfe_price,
             retracement_pct=retracement,
@@ -517,6 +513,29 @@ def _compute_trade_rows(trades: list[Trade], price_frame: PriceFrame) -> list[Tr
     return rows
 
 
+def _trade_bars(trades: TradeTable, price_frame: PriceFrame) -> tuple[np.ndarray, np.ndarray]:
+    """Positions of each trade's entry and exit bars in price_frame; -1 if absent."""
+    days = price_frame.dates
+    if not len(days):
+        return np.full(len(trades), -1), np.full(len(trades), -1)
+    out = []
+    for bar in (trades.entry_bar, trades.exit_bar):
+        wanted = trades.dates[bar]
+        pos = np.minimum(np.searchsorted(days, wanted), len(days) - 1)
+        out.append(np.where((bar >= 0) & (days[pos] == wanted), pos, -1))
+    return out[0], out[1]
+
+
+def _symbol_codes(trades: TradeTable) -> np.ndarray:
+    """Each trade's symbol, as an object array."""
+    return np.array(trades.symbols, dtype=object)[trades.symbol_code]
+
+
+def _optional(value: float) -> float | None:
+    """One TradeTable value, None where missing (NaN)."""
+    return None if np.isnan(value) else float(value)
+
+
 # =============================================================================
 # Return distribution
 # =============================================================================
@@ -585,13 +604,13 @@ def _compute_monthly_stats_by_calendar(equity: pd.Series) -> list[MonthlyStatRow
     return rows
 
 
-def _compute_monthly_stats_by_entry(trades: list[Trade]) -> list[MonthlyStatRow]:
+def _compute_monthly_stats_by_entry(trades: TradeTable) -> list[MonthlyStatRow]:
     """P10-P90 of trade returns grouped by the entry month."""
     by_month: dict[int, list[float]] = defaultdict(list)
-    for t in trades:
-        if t.return_pct is not None:
-            entry_ts = pd.Timestamp(str(t.entry_date))
-            by_month[entry_ts.month].append(t.return_pct)
+    months = trades.entry_dates.astype("datetime64[M]").astype(np.int64) % 12 + 1
+    has_return = ~np.isnan(trades.return_pct)
+    for month, ret in zip(months[has_return].tolist(), trades.return_pct[has_return].tolist()):
+        by_month[month].append(ret)
     rows = []
     for i, name in enumerate(_MONTH_NAMES, 1):
         rows.append(_make_stat_row(name, by_month.get(i, [])))
@@ -602,16 +621,12 @@ def _compute_monthly_stats_by_entry(trades: list[Trade]) -> list[MonthlyStatRow]
 # Year-by-year health
 # =============================================================================
 
-def _compute_health_by_year(trades: list[Trade], equity: pd.Series) -> list[HealthRow]:
-    by_year: dict[int, list[Trade]] = defaultdict(list)
-    for t in trades:
-        entry_ts = pd.Timestamp(str(t.entry_date))
-        by_year[entry_ts.year].append(t)
+def _compute_health_by_year(trades: TradeTable, equity: pd.Series) -> list[HealthRow]:
+    years = trades.entry_dates.astype("datetime64[Y]").astype(np.int64) + 1970
 
     rows = []
-    for year in sorted(by_year.keys()):
-        year_trades = by_year[year]
-        returns = [t.return_pct for t in year_trades if t.return_pct is not None]
+    for year in np.unique(years).tolist():
+        returns = trades.present("return_pct", years == year)
 
         arr = np.array(returns)
         has_data = len(arr) >= 2
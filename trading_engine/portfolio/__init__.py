@@ -1,4 +1,5 @@
 """Portfolio layer — NAV-based simulation with long + short P&L."""
-from trading_engine.portfolio.simulation import run_portfolio
+from trading_engine.portfolio.nav import simulate_nav
+from trading_engine.portfolio.simulation import run_portfolio, run_portfolios
 
-__all__ = ["run_portfolio"]
+__all__ = ["run_portfolio", "run_portfolios", "simulate_nav"]
@@ -0,0 +1,97 @@
+"""NAV kernel — equity curves of many weight matrices over one set of returns.
+
+simulate_nav() takes weights as a (config x time x symbol) tensor and one
+shared (time x symbol) return matrix, and returns every equity curve in a
+single numpy pass:
+
+    NAV_t = NAV_{t-1} * (1 + sum_i w_{t-1, i} * r_{t, i})
+
+with each bar's weights applied to the next bar's return (no look-ahead).
+A 1,000-config sweep over the same symbols and dates is one call rather
+than 1,000 simulations.  run_portfolio() uses it with a single config,
+run_portfolios() (and so run_comparison() sweeps) with one per portfolio.
+
+Memory is dominated by the weight tensor itself: float64 configs x bars x
+symbols (1,000 x 7,500 x 10 is 600 MB), so very large sweeps should be fed
+in chunks of configs.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+
+def asset_returns(close: np.ndarray) -> np.ndarray:
+    """Bar-to-bar returns of a (time x symbol) close matrix.
+
+    Matches DataFrame.pct_change() with its default forward fill: a gap in a
+    symbol's closes has zero return and the bar after it spans the gap; NaN
+    before a symbol's first close.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    returns = np.full(close.shape, np.nan)
+    if len(close) < 2:
+        return returns
+    rows = np.arange(len(close)).reshape((-1,) + (1,) * (close.ndim - 1))
+    last = np.maximum.accumulate(np.where(np.isnan(close), 0, rows), axis=0)
+    filled = np.take_along_axis(close, last, axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns[1:] = filled[1:] / filled[:-1] - 1
+    return returns
+
+
+def leverage_scale(weights: np.ndarray, max_leverage: float) -> np.ndarray:
+    """Per-bar factor (<= 1) bringing sum(abs(weights)) down to max_leverage.
+
+    weights is (..., time, symbol); the result drops the symbol axis.  Bars
+    already within the limit get exactly 1.0.
+    """
+    abs_sum = np.abs(weights).sum(axis=-1)
+    with np.errstate(divide="ignore"):
+        return np.where(abs_sum > max_leverage, max_leverage / abs_sum, 1.0)
+
+
+def simulate_nav(
+    weights: np.ndarray,
+    returns: np.ndarray,
+    initial_capital: float | np.ndarray,
+    max_leverage: float | None = None,
+) -> np.ndarray:
+    """Equity curves of every weight matrix in weights.
+
+    Args:
+        weights: (config x time x symbol) weights, or one (time x symbol)
+            matrix.  NaN is treated as flat.
+        returns: (time x symbol) asset returns shared by every config
+            (asset_returns() of the close matrix).  NaN contributes nothing.
+        initial_capital: NAV on the first bar, or one per config.
+        max_leverage: If given, each bar's weights are first scaled down so
+            their absolute sum stays within it (as run_portfolio() does).
+
+    Returns:
+        (config x time) NAV, or (time,) for a single weight matrix.
+    """
+    weights = np.asarray(weights, dtype=np.float64)
+    single = weights.ndim == 2
+    if single:
+        weights = weights[None]
+    returns = np.asarray(returns, dtype=np.float64)
+    if weights.shape[1:] != returns.shape:
+        raise ValueError(
+            f"Weights of shape {weights.shape[1:]} per config do not match "
+            f"returns of shape {returns.shape}"
+        )
+
+    if np.isnan(weights).any():
+        weights = np.nan_to_num(weights, nan=0.0)
+    returns = np.where(np.isnan(returns), 0.0, returns)
+
+    growth = np.empty(weights.shape[:2])
+    if growth.shape[1]:
+        # Yesterday's weights earn today's return.
+        pnl = np.einsum("ctn,tn->ct", weights[:, :-1], returns[1:])
+        if max_leverage is not None:
+            pnl *= leverage_scale(weights[:, :-1], max_leverage)
+        growth[:, 1:] = 1 + pnl
+        growth[:, 0] = initial_capital
+    nav = np.multiply.accumulate(growth, axis=1)
+    return nav[0] if single else nav
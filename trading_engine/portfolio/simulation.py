@@ -13,6 +13,8 @@ P&L computation:
 """
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import pandas as pd
 
@@ -20,11 +22,14 @@ from trading_engine.types import (
     Portfolio,
     PortfolioResult,
     PriceFrame,
+    PricePanel,
     RegimeSeries,
     StrategySlot,
+    TradeTable,
 )
 from trading_engine.factor_analysis.cross_sectional import analyze_cross_section
 from trading_engine.factor_analysis.regime import detect_regime
+from trading_engine.portfolio.nav import asset_returns, leverage_scale, simulate_nav
 
 
 def run_portfolio(
@@ -41,6 +46,109 @@ def run_portfolio(
         PortfolioResult with equity curve, trades, and applied weights.
     """
     symbols = list(prices.keys())
+    # Aligned once; regime breadth, NAV and trade extraction all read from it.
+    panel = PricePanel.from_frames(prices, symbols, fields=("close",))
+
+    # Steps 1-3: regime, combined slot weights, leverage cap
+    weights = _portfolio_weights(portfolio, prices, panel)
+    if weights is None:
+        return _empty_result()
+
+    # Step 4: Build close price matrix aligned with weights
+    close_matrix = _build_close_matrix(panel, weights.index)
+
+    # Step 5: Simulate NAV
+    equity_curve = _simulate_nav(
+        weights, close_matrix, portfolio.initial_capital
+    )
+
+    # Step 6: Derive trades from combined (leverage-adjusted) weights
+    return _portfolio_result(weights, equity_curve, prices, panel)
+
+
+def run_portfolios(
+    portfolios: list[Portfolio],
+    prices: dict[str, PriceFrame],
+    max_workers: int = 1,
+) -> list[PortfolioResult | Exception]:
+    """run_portfolio() for many portfolios over the same prices.
+
+    Each portfolio's weights are computed on their own (in max_workers
+    threads), then the equity curves of every portfolio on the same calendar
+    are simulated in one simulate_nav() call: a 1,000-config sweep is one
+    numpy pass, not 1,000.  Results match run_portfolio() on each portfolio
+    up to floating-point rounding.
+
+    Returns:
+        One entry per portfolio, in order: its PortfolioResult, or the
+        exception its simulation raised, so one failing portfolio does not
+        sink the batch.
+    """
+    symbols = list(prices.keys())
+    panel = PricePanel.from_frames(prices, symbols, fields=("close",))
+
+    def weights_of(portfolio: Portfolio) -> pd.DataFrame | Exception | None:
+        try:
+            return _portfolio_weights(portfolio, prices, panel)
+        except Exception as e:
+            return e
+
+    if max_workers <= 1:
+        all_weights = [weights_of(p) for p in portfolios]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            all_weights = list(executor.map(weights_of, portfolios))
+
+    # Portfolios whose weights share a calendar share one simulate_nav() call.
+    groups: list[tuple[pd.DatetimeIndex, list[int]]] = []
+    for k, weights in enumerate(all_weights):
+        if not isinstance(weights, pd.DataFrame):
+            continue
+        for index, members in groups:
+            if index.equals(weights.index):
+                members.append(k)
+                break
+        else:
+            groups.append((weights.index, [k]))
+
+    equity_curves: dict[int, pd.Series] = {}
+    for index, members in groups:
+        columns = all_weights[members[0]].columns
+        for k in members[1:]:
+            columns = columns.union(all_weights[k].columns, sort=False)
+        close_matrix = _build_close_matrix(panel, index).reindex(columns=columns)
+        returns = asset_returns(close_matrix.to_numpy(dtype=np.float64))
+        # A symbol a portfolio does not hold is a zero weight.
+        stacked = np.stack([
+            all_weights[k].reindex(columns=columns, fill_value=0.0).to_numpy(dtype=np.float64)
+            for k in members
+        ])
+        capital = np.array([portfolios[k].initial_capital for k in members], dtype=np.float64)
+        nav = simulate_nav(stacked, returns, capital)
+        for row, k in enumerate(members):
+            equity_curves[k] = pd.Series(nav[row], index=index, dtype=float)
+
+    results: list[PortfolioResult | Exception] = []
+    for k, weights in enumerate(all_weights):
+        if weights is None:
+            results.append(_empty_result())
+        elif isinstance(weights, Exception):
+            results.append(weights)
+        else:
+            try:
+                results.append(_portfolio_result(weights, equity_curves[k], prices, panel))
+            except Exception as e:
+                results.append(e)
+    return results
+
+
+def _portfolio_weights(
+    portfolio: Portfolio,
+    prices: dict[str, PriceFrame],
+    panel: PricePanel,
+) -> pd.DataFrame | None:
+    """Combined, leverage-capped weights of every slot; None when empty."""
+    symbols = list(prices.keys())
 
     # Step 1: Compute regime if configured (shared across all slots)
     regime: RegimeSeries | None = None
@@ -51,6 +159,7 @@ def run_portfolio(
             universe=rc.universe,
             prices=prices,
             threshold=rc.threshold,
+            panel=panel,
         )
         regime = detect_regime(cross.breadth, rc.thresholds)
 
@@ -60,37 +169,32 @@ def run_portfolio(
     if total_slot_weight <= 0:
         total_slot_weight = 1.0
 
+    from trading_engine.strategy.base import strategy_weights
     combined_weights: pd.DataFrame | None = None
     for slot in portfolio.slots:
         normalised = slot.weight / total_slot_weight
-        output = slot.strategy.compute(symbols, prices, regime)
-        scaled = output.weights * normalised
+        scaled = strategy_weights(slot.strategy, symbols, prices, regime) * normalised
         if combined_weights is None:
             combined_weights = scaled
         else:
             combined_weights = combined_weights.add(scaled, fill_value=0.0)
 
     if combined_weights is None or combined_weights.empty:
-        return PortfolioResult(
-            equity_curve=pd.Series(dtype=float),
-            trades=[],
-            weights=pd.DataFrame(),
-        )
+        return None
 
     # Step 3: Enforce max_leverage on combined weights
-    weights = _enforce_leverage(combined_weights, portfolio.max_leverage)
+    return _enforce_leverage(combined_weights, portfolio.max_leverage)
 
-    # Step 4: Build close price matrix aligned with weights
-    close_matrix = _build_close_matrix(symbols, prices, weights.index)
 
-    # Step 5: Simulate NAV
-    equity_curve = _simulate_nav(
-        weights, close_matrix, portfolio.initial_capital
-    )
-
-    # Step 6: Derive trades from combined (leverage-adjusted) weights
+def _portfolio_result(
+    weights: pd.DataFrame,
+    equity_curve: pd.Series,
+    prices: dict[str, PriceFrame],
+    panel: PricePanel,
+) -> PortfolioResult:
+    """Wrap a simulated portfolio, deriving its trades from the weights."""
     from trading_engine.strategy.utils import weight_transitions_to_trades
-    trades = weight_transitions_to_trades(weights, prices)
+    trades = weight_transitions_to_trades(weights, prices, panel=panel)
 
     return PortfolioResult(
         equity_curve=equity_curve,
@@ -99,39 +203,35 @@ def run_portfolio(
     )
 
 
+def _empty_result() -> PortfolioResult:
+    return PortfolioResult(
+        equity_curve=pd.Series(dtype=float),
+        trades=TradeTable.empty(),
+        weights=pd.DataFrame(),
+    )
+
+
 def _enforce_leverage(weights: pd.DataFrame, max_leverage: float) -> pd.DataFrame:
     """Scale weights so sum(abs(weights_t)) <= max_leverage at each time step.
 
     If the total absolute weight exceeds max_leverage, all weights are
     scaled proportionally to fit within the constraint.
     """
-    abs_sum = weights.abs().sum(axis=1)
-    scale = (max_leverage / abs_sum).clip(upper=1.0)
-
-    # Only scale rows that exceed the limit
-    needs_scaling = abs_sum > max_leverage
-    if needs_scaling.any():
-        weights = weights.copy()
-        weights.loc[needs_scaling] = weights.loc[needs_scaling].multiply(
-            scale[needs_scaling], axis=0
-        )
-
+    scale = leverage_scale(weights.to_numpy(dtype=np.float64), max_leverage)
+    if (scale < 1).any():
+        weights = weights.multiply(scale, axis=0)
     return weights
 
 
 def _build_close_matrix(
-    symbols: list[str],
-    prices: dict[str, PriceFrame],
+    panel: PricePanel,
     index: pd.DatetimeIndex,
 ) -> pd.DataFrame:
     """Build a DataFrame of close prices aligned with the weight index."""
-    close_data = {}
-    for symbol in symbols:
-        if symbol in prices:
-            close = prices[symbol].data["close"].reindex(index)
-            close_data[symbol] = close
-
-    return pd.DataFrame(close_data)
+    rows = panel.rows(index)
+    close = panel.field("close")[np.maximum(rows, 0)]
+    close[rows < 0] = np.nan
+    return pd.DataFrame(close, index=index, columns=panel.symbols)
 
 
 def _simulate_nav(
@@ -147,20 +247,10 @@ def _simulate_nav(
     For short positions: weight < 0, positive return = loss
     This works naturally because:
       short P&L = weight * return = negative_weight * positive_return = loss
-    """
-    # Daily returns for each symbol
-    returns = close_matrix.pct_change()
-
-    # Portfolio daily return = sum of (weight * asset return) across symbols
-    # Use previous day's weight for today's return
-    shifted_weights = weights.shift(1)
-    portfolio_returns = (shifted_weights * returns).sum(axis=1)
 
-    # Build equity curve
-    nav = pd.Series(index=weights.index, dtype=float)
-    nav.iloc[0] = initial_capital
-
-    for i in range(1, len(nav)):
-        nav.iloc[i] = nav.iloc[i - 1] * (1 + portfolio_returns.iloc[i])
-
-    return nav
+    Closes are matched to weights by symbol, not by column position.
+    """
+    close_matrix = close_matrix.reindex(columns=weights.columns)
+    returns = asset_returns(close_matrix.to_numpy(dtype=np.float64))
+    nav = simulate_nav(weights.to_numpy(dtype=np.float64), returns, initial_capital)
+    return pd.Series(nav, index=weights.index, dtype=float)
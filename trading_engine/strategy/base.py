@@ -3,6 +3,7 @@
 Strategy implementations only need to override _compute_weights().
 BaseStrategy.compute() auto-calls _compute_weights() then
 weight_transitions_to_trades() — no duplication across implementations.
+Trades are derived lazily, and compute_weights() skips them entirely.
 """
 from __future__ import annotations
 
@@ -13,8 +14,10 @@ import pandas as pd
 from trading_engine.types import (
     PriceFrame,
     RegimeSeries,
+    Strategy,
     StrategyOutput,
     StrategyOutputError,
+    WeightsStrategy,
 )
 from trading_engine.strategy.utils import weight_transitions_to_trades
 
@@ -26,7 +29,10 @@ class BaseStrategy(ABC):
     The compute() method handles:
     1. Calling _compute_weights()
     2. Validating the output (no NaN)
-    3. Converting weight transitions to Trade records
+    3. Converting weight transitions to Trade records (on first access
+       of StrategyOutput.trades)
+    compute_weights() does 1-2 only.  Implements the Strategy and
+    WeightsStrategy protocols.
     """
 
     def compute(
@@ -35,6 +41,20 @@ class BaseStrategy(ABC):
         prices: dict[str, PriceFrame],
         regime: RegimeSeries | None = None,
     ) -> StrategyOutput:
+        weights = self.compute_weights(symbols, prices, regime)
+        prices = dict(prices)  # later edits to the caller's dict must not change the trades
+        return StrategyOutput(
+            weights=weights,
+            derive_trades=lambda: weight_transitions_to_trades(weights, prices),
+        )
+
+    def compute_weights(
+        self,
+        symbols: list[str],
+        prices: dict[str, PriceFrame],
+        regime: RegimeSeries | None = None,
+    ) -> pd.DataFrame:
+        """The validated, clamped weight matrix of compute(), without trades."""
         weights = self._compute_weights(symbols, prices, regime)
 
         # Validate: no NaN allowed in output
@@ -45,10 +65,7 @@ class BaseStrategy(ABC):
             )
 
         # Clamp to [-1, 1]
-        weights = weights.clip(-1.0, 1.0)
-
-        trades = weight_transitions_to_trades(weights, prices)
-        return StrategyOutput(weights=weights, trades=trades)
+        return weights.clip(-1.0, 1.0)
 
     @abstractmethod
     def _compute_weights(
@@ -69,3 +86,15 @@ class BaseStrategy(ABC):
             Index = DatetimeIndex, columns = symbol names.
         """
         ...
+
+
+def strategy_weights(
+    strategy: Strategy,
+    symbols: list[str],
+    prices: dict[str, PriceFrame],
+    regime: RegimeSeries | None = None,
+) -> pd.DataFrame:
+    """strategy's weight matrix, without deriving trades where it can."""
+    if isinstance(strategy, WeightsStrategy):
+        return strategy.compute_weights(symbols, prices, regime)
+    return strategy.compute(symbols, prices, regime).weights
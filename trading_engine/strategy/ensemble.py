@@ -4,7 +4,7 @@ from __future__ import annotations
 import pandas as pd
 
 from trading_engine.types import PriceFrame, RegimeSeries, Strategy
-from trading_engine.strategy.base import BaseStrategy
+from trading_engine.strategy.base import BaseStrategy, strategy_weights
 
 
 class EnsembleStrategy(BaseStrategy):
@@ -46,8 +46,7 @@ class EnsembleStrategy(BaseStrategy):
         combined: pd.DataFrame | None = None
 
         for strategy, sw in zip(self.strategies, self.strategy_weights):
-            output = strategy.compute(symbols, prices, regime)
-            weighted = output.weights * sw
+            weighted = strategy_weights(strategy, symbols, prices, regime) * sw
 
             if combined is None:
                 combined = weighted
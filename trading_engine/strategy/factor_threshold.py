@@ -23,6 +23,7 @@ Price vs EMA(20), both with 1-day confirmation:
 """
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
 
 from trading_engine.types import Factor, PriceFrame, RegimeSeries
@@ -69,7 +70,7 @@ class FactorThresholdStrategy(BaseStrategy):
         prices: dict[str, PriceFrame],
         regime: RegimeSeries | None = None,
     ) -> pd.DataFrame:
-        all_weights: dict[str, pd.Series] = {}
+        factor_values: dict[str, pd.Series] = {}
 
         for symbol in symbols:
             if symbol not in prices:
@@ -81,61 +82,83 @@ class FactorThresholdStrategy(BaseStrategy):
             # Compute factor, then reindex to the full price range.
             # Bars before the factor warm-up period become NaN → weight 0.
             factor_series = self.factor.compute(price_frame)
-            values = factor_series.values.reindex(full_index)
+            factor_values[symbol] = factor_series.values.reindex(full_index)
 
-            all_weights[symbol] = self._signal_to_weights(values)
-
-        if not all_weights:
+        if not factor_values:
             return pd.DataFrame()
 
-        return pd.DataFrame(all_weights).fillna(0.0)
+        # One column per symbol, each on its own calendar and NaN-padded at
+        # the end: the state machine is causal, so the padding never reaches
+        # back into a symbol's bars, and every symbol runs in one call.
+        length = max(len(values) for values in factor_values.values())
+        matrix = np.full((length, len(factor_values)), np.nan)
+        for j, values in enumerate(factor_values.values()):
+            matrix[: len(values), j] = values.to_numpy(dtype=np.float64)
+        weights = threshold_weights(matrix, self.threshold, self.buy_lag, self.sell_lag)
+
+        return pd.DataFrame({
+            symbol: pd.Series(weights[: len(values), j], index=values.index)
+            for j, (symbol, values) in enumerate(factor_values.items())
+        }).fillna(0.0)
 
     def _signal_to_weights(self, factor_values: pd.Series) -> pd.Series:
         """State machine: factor values → binary weights with confirmation lag.
 
-        State transitions
-        -----------------
-        FLAT → CONFIRMING_ENTRY  : factor first crosses above threshold
-        CONFIRMING_ENTRY → LONG  : buy_lag + 1 consecutive bars above threshold
-        CONFIRMING_ENTRY → FLAT  : any bar below threshold resets counter
-        LONG → CONFIRMING_EXIT   : factor first crosses below threshold
-        CONFIRMING_EXIT → FLAT   : sell_lag + 1 consecutive bars below threshold
-        CONFIRMING_EXIT → LONG   : any bar above threshold resets counter
+        See threshold_weights() for the vectorized implementation.
         """
-        weights = pd.Series(0.0, index=factor_values.index)
-        in_position = False
-        consec_above = 0  # consecutive confirming-entry bars
-        consec_below = 0  # consecutive confirming-exit bars
-
-        for i, v in enumerate(factor_values):
-            # NaN = factor warm-up period; treat as "no signal", reset counters
-            if pd.isna(v):
-                consec_above = 0
-                consec_below = 0
-                weights.iloc[i] = 0.0
-                continue
-
-            above = v > self.threshold
-
-            if not in_position:
-                if above:
-                    consec_above += 1
-                    # Enter once we have buy_lag + 1 consecutive bars above
-                    if consec_above >= self.buy_lag + 1:
-                        in_position = True
-                        consec_above = 0
-                else:
-                    consec_above = 0  # reversal resets — no memory of partial runs
-            else:
-                if not above:
-                    consec_below += 1
-                    # Exit once we have sell_lag + 1 consecutive bars below
-                    if consec_below >= self.sell_lag + 1:
-                        in_position = False
-                        consec_below = 0
-                else:
-                    consec_below = 0  # recovery resets the exit countdown
-
-            weights.iloc[i] = 1.0 if in_position else 0.0
-
-        return weights
+        weights = threshold_weights(
+            factor_values.to_numpy(dtype=np.float64),
+            self.threshold,
+            self.buy_lag,
+            self.sell_lag,
+        )
+        return pd.Series(weights, index=factor_values.index)
+
+
+def threshold_weights(
+    values: np.ndarray,
+    threshold: float,
+    buy_lag: int = 0,
+    sell_lag: int = 0,
+) -> np.ndarray:
+    """Binary weights from factor values, one series or each column of a
+    (time x symbol) matrix, with FactorThresholdStrategy's confirmation lags.
+
+    State transitions
+    -----------------
+    FLAT → CONFIRMING_ENTRY  : factor first crosses above threshold
+    CONFIRMING_ENTRY → LONG  : buy_lag + 1 consecutive bars above threshold
+    CONFIRMING_ENTRY → FLAT  : any bar below threshold resets counter
+    LONG → CONFIRMING_EXIT   : factor first crosses below threshold
+    CONFIRMING_EXIT → FLAT   : sell_lag + 1 consecutive bars below threshold
+    CONFIRMING_EXIT → LONG   : any bar above threshold resets counter
+
+    NaN (factor warm-up or gap) has weight 0 and resets both counters, but
+    does not close the position: it resumes on the next valid bar.
+
+    Entry can only complete on an above bar and exit on a below bar, so the
+    counters are just run lengths of above / below streaks (NaN breaking
+    both).  A streak reaching buy_lag + 1 is an entry and one reaching
+    sell_lag + 1 an exit — ignored when already long / flat, which is the
+    same as saying the state is whichever of the two happened last.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    above = values > threshold
+    below = present & ~above
+
+    entry = _run_lengths(above) == max(buy_lag, 0) + 1
+    exit_ = _run_lengths(below) == max(sell_lag, 0) + 1
+
+    # Forward-fill the latest event: LONG after an entry, FLAT after an exit.
+    bar = np.arange(len(values)).reshape((-1,) + (1,) * (values.ndim - 1))
+    last = np.maximum.accumulate(np.where(entry | exit_, bar, -1), axis=0)
+    long = np.take_along_axis(entry, np.maximum(last, 0), axis=0) & (last >= 0)
+    return (long & present).astype(np.float64)
+
+
+def _run_lengths(flags: np.ndarray) -> np.ndarray:
+    """Length of the streak of True ending at each bar (0 where False), along axis 0."""
+    bar = np.arange(len(flags)).reshape((-1,) + (1,) * (flags.ndim - 1))
+    last_break = np.maximum.accumulate(np.where(flags, -1, bar), axis=0)
+    return bar - last_break
@@ -1,7 +1,8 @@
 """Strategy utilities — weight-to-trade conversion.
 
 The core function weight_transitions_to_trades() converts a weight matrix
-into a list of Trade records. Called automatically by BaseStrategy.compute().
+into Trade records, held as a columnar TradeTable. Called automatically by
+BaseStrategy.compute().
 
 Zero-crossing rule:
   weight 0.5 -> -0.3 produces 2 Trade records (exit long + enter short)
@@ -13,27 +14,32 @@ Partial weight changes:
 """
 from __future__ import annotations
 
-import math
-from datetime import date as date_type
-
 import numpy as np
 import pandas as pd
 
-from trading_engine.types import PriceFrame, StrategyOutputError, Trade, WeightEvent
+from trading_engine.types import (
+    PriceFrame,
+    PricePanel,
+    StrategyOutputError,
+    TradeTable,
+)
 
 
 def weight_transitions_to_trades(
     weights: pd.DataFrame,
     prices: dict[str, PriceFrame],
-) -> list[Trade]:
+    panel: PricePanel | None = None,
+) -> TradeTable:
     """Convert a weight matrix into Trade records.
 
     Args:
         weights: DataFrame of shape (time x symbols), values in [-1, 1].
         prices: Dict mapping symbol -> PriceFrame for close prices.
+        panel: Optional PricePanel with a "close" field.  When given, close
+            prices are read from it instead of re-aligning each symbol.
 
     Returns:
-        List of Trade records representing all positions.
+        TradeTable of all positions, on the calendar of weights.index.
 
     Raises:
         StrategyOutputError: If weights contain NaN values.
@@ -46,143 +52,116 @@ def weight_transitions_to_trades(
             f"symbol={first_nan[1]}. NaN weights are never allowed."
         )
 
-    trades: list[Trade] = []
+    parts: list[dict[str, np.ndarray]] = []
+    symbols: list[str] = []
+    rows = panel.rows(weights.index) if panel is not None else None
 
     for symbol in weights.columns:
         if symbol not in prices:
             continue
 
-        close = prices[symbol].data["close"]
-        symbol_weights = weights[symbol]
-
         # Align weight dates with available price dates
-        common_dates = symbol_weights.index.intersection(close.index)
-        if common_dates.empty:
+        if rows is not None and symbol in panel:
+            j = panel.column(symbol)
+            on_calendar = rows >= 0
+            has_bar = on_calendar.copy()
+            has_bar[on_calendar] = panel.valid[rows[on_calendar], j]
+            bars = np.flatnonzero(has_bar)
+            close = panel.field("close")[rows[has_bar], j]
+            symbol_weights = weights[symbol].to_numpy(dtype=np.float64)[has_bar]
+        else:
+            close_series = prices[symbol].data["close"]
+            common_dates = weights.index.intersection(close_series.index)
+            bars = weights.index.get_indexer(common_dates)
+            close = close_series.loc[common_dates].to_numpy(dtype=np.float64)
+            symbol_weights = weights[symbol].loc[common_dates].to_numpy(dtype=np.float64)
+        if not len(bars):
             continue
 
-        symbol_weights = symbol_weights.loc[common_dates]
-        close = close.loc[common_dates]
-
-        open_trade: Trade | None = None
-
-        for i, dt in enumerate(common_dates):
-            w = float(symbol_weights.iloc[i])
-            p = float(close.iloc[i])
-            prev_w = float(symbol_weights.iloc[i - 1]) if i > 0 else 0.0
-
-            d = _to_date(dt)
-
-            # No change
-            if w == prev_w:
-                continue
-
-            # Determine if this is a zero-crossing (direction change)
-            crosses_zero = (prev_w > 0 and w < 0) or (prev_w < 0 and w > 0)
-
-            if crosses_zero:
-                # Atomic: close existing trade, then open new one
-                if open_trade is not None:
-                    open_trade = _close_trade(open_trade, d, p, close, common_dates)
-                    trades.append(open_trade)
-                    open_trade = None
-
-                # Open new trade in opposite direction
-                direction = "long" if w > 0 else "short"
-                open_trade = Trade(
-                    symbol=symbol,
-                    direction=direction,
-                    entry_date=d,
-                    entry_price=p,
-                    entry_weight=w,
-                    weight_history=[WeightEvent(date=d, weight=w, price=p)],
-                )
-
-            elif prev_w == 0 and w != 0:
-                # New position from flat
-                direction = "long" if w > 0 else "short"
-                open_trade = Trade(
-                    symbol=symbol,
-                    direction=direction,
-                    entry_date=d,
-                    entry_price=p,
-                    entry_weight=w,
-                    weight_history=[WeightEvent(date=d, weight=w, price=p)],
-                )
-
-            elif w == 0 and prev_w != 0:
-                # Close position to flat
-                if open_trade is not None:
-                    open_trade = _close_trade(open_trade, d, p, close, common_dates)
-                    trades.append(open_trade)
-                    open_trade = None
-
-            else:
-                # Same direction, partial weight change (scaling in/out)
-                if open_trade is not None:
-                    open_trade.weight_history.append(
-                        WeightEvent(date=d, weight=w, price=p)
-                    )
-
-        # Leave any remaining open trade with exit_date=None.
-        # Compute unrealized MAE/MFE and holding days up to the last bar
-        # so callers can display current-position stats without closing the trade.
-        if open_trade is not None:
-            entry_loc = common_dates.get_loc(pd.Timestamp(open_trade.entry_date))
-            trade_prices = close.iloc[entry_loc:]
-            if len(trade_prices) > 0 and open_trade.entry_price > 0:
-                price_returns = trade_prices / open_trade.entry_price - 1
-                if open_trade.direction == "long":
-                    open_trade.mae_pct = float(price_returns.min() * 100)
-                    open_trade.mfe_pct = float(price_returns.max() * 100)
-                else:
-                    open_trade.mae_pct = float(-price_returns.max() * 100)
-                    open_trade.mfe_pct = float(-price_returns.min() * 100)
-                open_trade.holding_days = int(len(trade_prices) - 1)
-            trades.append(open_trade)
-
-    return trades
-
-
-def _close_trade(
-    trade: Trade,
-    exit_date: date_type,
-    exit_price: float,
-    close: pd.Series,
-    dates: pd.DatetimeIndex,
-) -> Trade:
-    """Fill in exit fields and compute return/MAE/MFE for a trade."""
-    trade.exit_date = exit_date
-    trade.exit_price = exit_price
-
-    # Holding days (trading days)
-    entry_loc = dates.get_loc(pd.Timestamp(trade.entry_date))
-    exit_loc = dates.get_loc(pd.Timestamp(exit_date))
-    trade.holding_days = int(exit_loc - entry_loc)
-
-    # Compute return, MAE, MFE over the trade window
-    trade_prices = close.iloc[entry_loc:exit_loc + 1]
-
-    if len(trade_prices) > 0 and trade.entry_price > 0:
-        price_returns = trade_prices / trade.entry_price - 1
-
-        if trade.direction == "long":
-            trade.return_pct = float(
-                (exit_price / trade.entry_price - 1) * 100
-            )
-            trade.mae_pct = float(price_returns.min() * 100)
-            trade.mfe_pct = float(price_returns.max() * 100)
-        else:  # short
-            trade.return_pct = float(
-                (1 - exit_price / trade.entry_price) * 100
-            )
-            trade.mae_pct = float(-price_returns.max() * 100)
-            trade.mfe_pct = float(-price_returns.min() * 100)
-
-    return trade
-
-
-def _to_date(dt) -> date_type:
-    """Convert a pandas Timestamp or datetime to a date object."""
-    if hasattr(dt, "date"):
-        return dt.date() if callable(dt.date) else dt.date
-    return dt
+        part = _symbol_trades(bars, symbol_weights, close)
+        if part is not None:
+            part["symbol_code"] = np.full(len(part["entry_bar"]), len(symbols), dtype=np.int32)
+            symbols.append(symbol)
+            parts.append(part)
+
+    if not parts:
+        return TradeTable.empty()
+
+    # Renumber each symbol's event_trade to rows of the combined table.
+    offset = 0
+    for part in parts:
+        part["event_trade"] = part["event_trade"] + offset
+        offset += len(part["entry_bar"])
+    columns = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    dates = pd.DatetimeIndex(weights.index).values.astype("datetime64[D]").astype(np.int64)
+    return TradeTable(dates=dates, symbols=symbols, **columns)
+
+
+def _symbol_trades(
+    bars: np.ndarray,
+    weights: np.ndarray,
+    close: np.ndarray,
+) -> dict[str, np.ndarray] | None:
+    """TradeTable columns of one symbol, from its weights and closes on its
+    own bars (at calendar positions bars); None when it never trades.
+
+    Every bar where the weight changes is classified in bulk:
+      open   — from flat, or the entering half of a zero crossing
+      close  — to flat, or the exiting half of a zero crossing
+      scale  — same direction, new size (a weight event of the open trade)
+    Trades never overlap, so the k-th close ends the k-th open; a trade
+    still open at the last bar has unrealized MAE/MFE and holding days up
+    to that bar.
+    """
+    n = len(weights)
+    prev = np.concatenate(([0.0], weights[:-1]))
+    changed = weights != prev
+    crosses = ((prev > 0) & (weights < 0)) | ((prev < 0) & (weights > 0))
+    opens = np.flatnonzero(changed & (weights != 0) & ((prev == 0) | crosses))
+    closes = np.flatnonzero(changed & (prev != 0) & ((weights == 0) | crosses))
+    scales = np.flatnonzero(changed & (weights != 0) & (prev != 0) & ~crosses)
+    if not len(opens):
+        return None
+
+    # Each trade spans bars [entry, exit] (the last bar while still open).
+    ends = np.append(closes, n - 1)[:len(opens)]
+    closed = np.arange(len(opens)) < len(closes)
+    bounds = np.empty(2 * len(opens), dtype=np.int64)
+    bounds[0::2] = opens
+    bounds[1::2] = ends + 1
+    padded = np.append(close, np.nan)  # so a trade may end on the last bar
+    low = np.fmin.reduceat(padded, bounds)[0::2]
+    high = np.fmax.reduceat(padded, bounds)[0::2]
+
+    entry_price = close[opens]
+    long = weights[opens] > 0
+    priced = entry_price > 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mae = np.where(long, low / entry_price - 1, -(high / entry_price - 1)) * 100
+        mfe = np.where(long, high / entry_price - 1, -(low / entry_price - 1)) * 100
+        exit_ratio = close[ends] / entry_price
+        return_pct = np.where(long, exit_ratio - 1, 1 - exit_ratio) * 100
+
+    # Weight events: each trade's entry, then its scalings, in bar order.
+    events = np.concatenate((opens, scales))
+    owner = np.concatenate((np.arange(len(opens)), np.searchsorted(opens, scales, side="right") - 1))
+    order = np.lexsort((events, owner))
+    events, owner = events[order], owner[order]
+
+    return {
+        "direction": np.where(long, 1, -1).astype(np.int8),
+        "entry_bar": bars[opens],
+        "exit_bar": np.where(closed, bars[ends], -1),
+        "entry_price": entry_price,
+        "exit_price": np.where(closed, close[ends], np.nan),
+        "entry_weight": weights[opens],
+        "return_pct": np.where(closed & priced, return_pct, np.nan),
+        "holding_days": np.where(closed | priced, ends - opens, -1),
+        "mae_pct": np.where(priced, mae, np.nan),
+        "mfe_pct": np.where(priced, mfe, np.nan),
+        "event_trade": owner,
+        "event_bar": bars[events],
+        "event_weight": weights[events],
+        "event_price": close[events],
+    }
+
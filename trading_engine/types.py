@@ -5,10 +5,12 @@ Every layer imports from this single file — no scattered type definitions.
 """
 from __future__ import annotations
 
+import hashlib
 from dataclasses import dataclass, field
 from datetime import date
-from typing import Any, Literal, Protocol, runtime_checkable
+from typing import Any, Callable, Literal, Mapping, Protocol, runtime_checkable
 
+import numpy as np
 import pandas as pd
 
 
@@ -20,6 +22,28 @@ class DataLoadError(Exception):
     """Raised when a data source fails to load after retries."""
 
 
+class NoDataError(DataLoadError):
+    """Raised when a data source has no bars in the requested date range.
+
+    Unlike other DataLoadErrors this is an answer, not a failure: the symbol
+    had not listed yet, was delisted or suspended, or the range holds no
+    trading days.  Retrying it cannot help.
+    """
+
+
+class PartialLoadError(DataLoadError):
+    """Raised when only part of a requested date range could be loaded.
+
+    frame holds the bars that did load for the contiguous range covered;
+    callers that persist data (CachedLoader) can keep it and re-fetch the rest.
+    """
+
+    def __init__(self, message: str, frame: "PriceFrame", covered: tuple[date, date]):
+        super().__init__(message)
+        self.frame = frame
+        self.covered = covered
+
+
 class FactorComputeError(Exception):
     """Raised when a factor computation fails (e.g., division by zero price)."""
 
@@ -40,26 +64,268 @@ class ConfigError(Exception):
 # Layer 1: Data
 # =============================================================================
 
-@dataclass
 class PriceFrame:
     """Unified OHLCV container for a single symbol.
 
     data columns: open, high, low, close, volume
-    Index: DatetimeIndex (daily bars).
+    Index: DatetimeIndex (daily bars), sorted ascending.
+
+    Backed by contiguous numpy columns plus an int64 epoch-day index, so
+    date-range slicing (slice()) returns views instead of copies.  A frame
+    built from a DataFrame keeps it and extracts the arrays on first use; a
+    frame built with from_arrays() only builds .data when something asks.
     """
-    symbol: str
-    data: pd.DataFrame
-    source: str  # "yfinance" | "vnstock" | "csv"
 
-    def __post_init__(self) -> None:
-        required = {"open", "high", "low", "close"}
-        actual = set(self.data.columns.str.lower())
-        missing = required - actual
+    _REQUIRED = frozenset({"open", "high", "low", "close"})
+
+    def __init__(self, symbol: str, data: pd.DataFrame, source: str):
+        self.symbol = symbol
+        self.source = source  # "yfinance" | "vnstock" | "csv"
+        self._data: pd.DataFrame | None = data
+        self._dates: np.ndarray | None = None
+        self._columns: dict[str, np.ndarray] | None = None
+        self._fingerprint: str | None = None
+        self._validate(data.columns.str.lower())
+
+    @classmethod
+    def from_arrays(
+        cls,
+        symbol: str,
+        dates: np.ndarray,
+        columns: dict[str, np.ndarray],
+        source: str,
+    ) -> PriceFrame:
+        """Build a frame from an int64 epoch-day index and column arrays.
+
+        The arrays are used as given (no copy), so memory-mapped or shared
+        buffers stay shared.
+        """
+        pf = cls.__new__(cls)
+        pf.symbol = symbol
+        pf.source = source
+        pf._data = None
+        pf._dates = np.asarray(dates, dtype=np.int64)
+        pf._columns = dict(columns)
+        pf._fingerprint = None
+        pf._validate(pf._columns)
+        return pf
+
+    def _validate(self, columns) -> None:
+        missing = self._REQUIRED - set(columns)
         if missing:
             raise ValueError(
                 f"PriceFrame for {self.symbol} missing columns: {missing}"
             )
 
+    @property
+    def data(self) -> pd.DataFrame:
+        if self._data is None:
+            self._data = pd.DataFrame(
+                self._columns, index=_days_to_index(self._dates), copy=False
+            )
+        return self._data
+
+    @property
+    def dates(self) -> np.ndarray:
+        """Bar dates as int64 days since 1970-01-01."""
+        self._ensure_arrays()
+        return self._dates
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.column("close")
+
+    def column(self, name: str) -> np.ndarray:
+        """One column as a numpy array (a view, not a copy)."""
+        self._ensure_arrays()
+        return self._columns[name]
+
+    def fingerprint(self) -> str:
+        """Content hash of the bars (dates and every column).
+
+        Equal bars give equal fingerprints regardless of symbol, source or
+        how the frame was built, so results derived from the bars can be
+        cached by content.  Computed once per frame: frames are treated as
+        immutable once built.
+        """
+        if self._fingerprint is None:
+            self._ensure_arrays()
+            h = hashlib.blake2b(digest_size=16)
+            h.update(np.ascontiguousarray(self._dates).data)
+            for name in sorted(self._columns, key=str):
+                col = self._columns[name]
+                if col.dtype == object:
+                    col = col.astype(str)
+                h.update(str(name).encode())
+                h.update(np.ascontiguousarray(col).data)
+            self._fingerprint = h.hexdigest()
+        return self._fingerprint
+
+    def slice(self, start: date, end: date) -> PriceFrame:
+        """Bars with start <= date <= end, as views of this frame's arrays."""
+        dates = self.dates
+        lo = int(np.searchsorted(dates, _epoch_day(start), side="left"))
+        hi = int(np.searchsorted(dates, _epoch_day(end), side="right"))
+        return self._rows(lo, hi)
+
+    def tail(self, n: int) -> PriceFrame:
+        """The last n bars, as views of this frame's arrays."""
+        total = len(self)
+        return self._rows(max(total - max(n, 0), 0), total)
+
+    def _rows(self, lo: int, hi: int) -> PriceFrame:
+        self._ensure_arrays()
+        pf = PriceFrame.from_arrays(
+            self.symbol,
+            self._dates[lo:hi],
+            {name: col[lo:hi] for name, col in self._columns.items()},
+            self.source,
+        )
+        if self._data is not None:
+            pf._data = self._data.iloc[lo:hi]
+        return pf
+
+    def __len__(self) -> int:
+        return len(self._data) if self._data is not None else len(self._dates)
+
+    def __repr__(self) -> str:
+        return f"PriceFrame(symbol={self.symbol!r}, bars={len(self)}, source={self.source!r})"
+
+    def _ensure_arrays(self) -> None:
+        if self._columns is not None:
+            return
+        df = self._data
+        if not df.index.is_monotonic_increasing:
+            df = self._data = df.sort_index(kind="stable")
+        columns: dict[str, np.ndarray] = {}
+        for name in df.columns:
+            col = df[name]
+            if str(name).lower() in self._REQUIRED or pd.api.types.is_float_dtype(col):
+                columns[name] = col.to_numpy(dtype=np.float64, copy=False)
+            else:
+                columns[name] = col.to_numpy()
+        self._dates = df.index.values.astype("datetime64[D]").astype(np.int64)
+        self._columns = columns
+
+
+def _epoch_day(d: date) -> int:
+    return int(np.datetime64(d, "D").astype(np.int64))
+
+
+def _days_to_index(days: np.ndarray) -> pd.DatetimeIndex:
+    return pd.DatetimeIndex(
+        days.astype("datetime64[D]").astype("datetime64[ns]"), name="date"
+    )
+
+
+PANEL_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+@dataclass
+class PricePanel:
+    """Many symbols' prices aligned on one trading calendar.
+
+    values is indexed [field, time, symbol], so each field is one contiguous
+    (time x symbol) block.  valid[t, n] is False where symbol n has no bar on
+    dates[t]; values there are NaN.  Build it once per universe with
+    from_frames() and hand it to every universe-wide computation instead of
+    re-aligning per-symbol Series with reindex/intersection.
+    """
+    dates: np.ndarray          # int64 epoch days, sorted, shape (T,)
+    symbols: list[str]
+    fields: tuple[str, ...]
+    values: np.ndarray         # float64, shape (F, T, N)
+    valid: np.ndarray          # bool, shape (T, N)
+
+    @classmethod
+    def from_frames(
+        cls,
+        prices: dict[str, PriceFrame],
+        symbols: list[str] | None = None,
+        fields: tuple[str, ...] = PANEL_FIELDS,
+    ) -> PricePanel:
+        """Align prices[symbols] on the union of their dates.
+
+        Symbols without a PriceFrame are skipped.  Pass only the fields you
+        need: a 2,000-symbol, 20-year panel costs ~80 MB per field.
+        """
+        if symbols is None:
+            symbols = list(prices)
+        symbols = [s for s in symbols if s in prices]
+        frames = [prices[s] for s in symbols]
+
+        if frames:
+            dates = np.unique(np.concatenate([pf.dates for pf in frames]))
+        else:
+            dates = np.empty(0, dtype=np.int64)
+        values = np.full((len(fields), len(dates), len(symbols)), np.nan)
+        valid = np.zeros((len(dates), len(symbols)), dtype=bool)
+
+        for j, pf in enumerate(frames):
+            rows = np.searchsorted(dates, pf.dates)
+            valid[rows, j] = True
+            for k, name in enumerate(fields):
+                try:
+                    values[k, rows, j] = pf.column(name)
+                except KeyError:
+                    continue  # optional column (volume) absent for this symbol
+
+        return cls(
+            dates=dates, symbols=symbols, fields=tuple(fields), values=values, valid=valid
+        )
+
+    def __post_init__(self) -> None:
+        self._positions = {s: j for j, s in enumerate(self.symbols)}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        return _days_to_index(self.dates)
+
+    def field(self, name: str) -> np.ndarray:
+        """One field as a (time x symbol) view."""
+        return self.values[self.fields.index(name)]
+
+    def column(self, symbol: str) -> int:
+        """Position of symbol along the symbol axis."""
+        return self._positions[symbol]
+
+    def rows(self, index: pd.Index) -> np.ndarray:
+        """Calendar row of each date in index, or -1 where it is off-calendar."""
+        days = pd.DatetimeIndex(index).values.astype("datetime64[D]").astype(np.int64)
+        if len(self.dates) == 0:
+            return np.full(len(days), -1)
+        pos = np.minimum(np.searchsorted(self.dates, days), len(self.dates) - 1)
+        return np.where(self.dates[pos] == days, pos, -1)
+
+    def to_frame(self, name: str = "close") -> pd.DataFrame:
+        """One field as a (time x symbol) DataFrame, NaN where invalid."""
+        return pd.DataFrame(self.field(name), index=self.index, columns=self.symbols)
+
+    def select(self, symbols: list[str]) -> PricePanel:
+        """A panel of just these symbols, on the same calendar."""
+        if symbols == self.symbols:
+            return self
+        cols = [self._positions[s] for s in symbols]
+        return PricePanel(
+            dates=self.dates,
+            symbols=list(symbols),
+            fields=self.fields,
+            values=self.values[:, :, cols],
+            valid=self.valid[:, cols],
+        )
+
+
+@dataclass(frozen=True)
+class CatalogEntry:
+    """Stored history of one symbol in a local data lake (see ParquetLoader)."""
+    symbol: str
+    first_date: date
+    last_date: date
+    bars: int
+
 
 @runtime_checkable
 class DataLoader(Protocol):
@@ -67,6 +333,26 @@ class DataLoader(Protocol):
     def load(self, symbol: str, start: date, end: date) -> PriceFrame: ...
 
 
+@runtime_checkable
+class BatchDataLoader(Protocol):
+    """Optional DataLoader extension: fetch many symbols in one batched call.
+
+    Returns (prices, errors) — per-symbol failures never raise.
+    """
+    def load_many(
+        self, symbols: list[str], start: date, end: date
+    ) -> tuple[dict[str, PriceFrame], dict[str, DataLoadError]]: ...
+
+
+@runtime_checkable
+class AsyncDataLoader(Protocol):
+    """Async counterpart of DataLoader, for concurrent multi-symbol fetching.
+
+    Wrap any blocking DataLoader with trading_engine.data.as_async().
+    """
+    async def load(self, symbol: str, start: date, end: date) -> PriceFrame: ...
+
+
 # =============================================================================
 # Layer 2: Factor
 # =============================================================================
@@ -85,6 +371,56 @@ class Factor(Protocol):
     def compute(self, prices: PriceFrame) -> FactorSeries: ...
 
 
+@dataclass
+class FactorPanel:
+    """Result of computing a factor over a whole PricePanel at once.
+
+    values[t, n] is the factor for symbols[n] on dates[t]; NaN where the
+    symbol has no bar or the factor is still warming up.  Column n equals
+    compute() on that symbol's PriceFrame, placed on the panel calendar.
+    """
+    name: str
+    dates: np.ndarray          # int64 epoch days, shape (T,)
+    symbols: list[str]
+    values: np.ndarray         # float64, shape (T, N)
+    metadata: dict = field(default_factory=dict)
+
+    def to_frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=_days_to_index(self.dates), columns=self.symbols)
+
+
+@runtime_checkable
+class PanelFactor(Protocol):
+    """Optional Factor extension: compute every symbol in one 2D pass.
+
+    panel_fields names the PricePanel fields compute_panel() reads.
+    """
+    panel_fields: tuple[str, ...]
+
+    def compute(self, prices: PriceFrame) -> FactorSeries: ...
+    def compute_panel(self, panel: PricePanel) -> FactorPanel: ...
+
+
+@runtime_checkable
+class FactorStream(Protocol):
+    """Incremental state of one factor over one symbol or a universe.
+
+    init() starts from history; each update(bar) then costs O(1) per symbol
+    and returns the value compute() would give on the last bar seen.
+    state() is plain data that the stream's from_state() restores.
+    """
+    def init(self, history: PriceFrame | PricePanel) -> None: ...
+    def update(self, bar: Mapping[str, Any]) -> float | np.ndarray: ...
+    def state(self) -> dict[str, Any]: ...
+
+
+@runtime_checkable
+class StreamingFactor(Protocol):
+    """Optional Factor extension: per-bar updates for live monitoring."""
+    def compute(self, prices: PriceFrame) -> FactorSeries: ...
+    def stream(self) -> FactorStream: ...
+
+
 # =============================================================================
 # Layer 3: Factor Analysis
 # =============================================================================
@@ -248,11 +584,259 @@ class Trade:
     explain: ExplainRecord | None = None
 
 
-@dataclass
+@dataclass(eq=False)
+class TradeTable:
+    """Trades as columns (struct of arrays): row k is trade k.
+
+    Analytics read the numpy columns directly instead of one Trade object
+    (and its WeightEvent list) per trade.  The table still behaves like the
+    list[Trade] it replaces — len(), iteration, indexing and == — building
+    the Trade objects on first use and keeping them, so edits to them (an
+    explain record) persist.
+
+    Bars index dates.  An open trade has exit_bar -1 and NaN exit_price and
+    return_pct; a missing MAE/MFE is NaN and missing holding_days is -1.
+    Weight events (the entry included) are the event_* columns, grouped by
+    trade in bar order.
+    """
+    dates: np.ndarray          # int64 epoch days: the bar calendar
+    symbols: list[str]         # symbol_code -> symbol
+    symbol_code: np.ndarray    # int32
+    direction: np.ndarray      # int8: 1 = long, -1 = short
+    entry_bar: np.ndarray      # int64
+    exit_bar: np.ndarray       # int64, -1 while open
+    entry_price: np.ndarray    # float64 (this and below)
+    exit_price: np.ndarray
+    entry_weight: np.ndarray
+    return_pct: np.ndarray
+    holding_days: np.ndarray   # int64
+    mae_pct: np.ndarray
+    mfe_pct: np.ndarray
+    event_trade: np.ndarray    # int64: row of the trade each weight event belongs to
+    event_bar: np.ndarray      # int64
+    event_weight: np.ndarray
+    event_price: np.ndarray
+    _trades: list[Trade] | None = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def empty(cls) -> TradeTable:
+        ints, floats = np.empty(0, dtype=np.int64), np.empty(0)
+        return cls(
+            dates=ints, symbols=[], symbol_code=np.empty(0, dtype=np.int32),
+            direction=np.empty(0, dtype=np.int8), entry_bar=ints, exit_bar=ints,
+            entry_price=floats, exit_price=floats, entry_weight=floats,
+            return_pct=floats, holding_days=ints, mae_pct=floats, mfe_pct=floats,
+            event_trade=ints, event_bar=ints, event_weight=floats, event_price=floats,
+        )
+
+    @classmethod
+    def of(cls, trades: TradeTable | list[Trade]) -> TradeTable:
+        """trades as a TradeTable: itself, or built from a list of Trades."""
+        return trades if isinstance(trades, TradeTable) else cls.from_trades(trades)
+
+    @classmethod
+    def from_trades(cls, trades: list[Trade]) -> TradeTable:
+        """Columns of existing Trade objects, which the table keeps as its rows."""
+        trades = list(trades)
+        if not trades:
+            return cls.empty()
+
+        def days(values: list[date | None]) -> np.ndarray:
+            return np.array(
+                [np.datetime64("NaT") if v is None else v for v in values], dtype="datetime64[D]"
+            )
+
+        entry_days = days([t.entry_date for t in trades])
+        exit_days = days([t.exit_date for t in trades])
+        events = [(k, e) for k, t in enumerate(trades) for e in t.weight_history]
+        event_days = days([e.date for _, e in events])
+        every_day = np.concatenate((entry_days, exit_days, event_days))
+        calendar = np.unique(every_day[~np.isnat(every_day)]).astype(np.int64)
+
+        def bars(values: np.ndarray) -> np.ndarray:
+            found = np.searchsorted(calendar, values.astype(np.int64))
+            return np.where(np.isnat(values), -1, found)
+
+        def optional(values: list[float | None]) -> np.ndarray:
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+        symbols = list(dict.fromkeys(t.symbol for t in trades))
+        code = {s: i for i, s in enumerate(symbols)}
+        table = cls(
+            dates=calendar,
+            symbols=symbols,
+            symbol_code=np.array([code[t.symbol] for t in trades], dtype=np.int32),
+            direction=np.array([1 if t.direction == "long" else -1 for t in trades], dtype=np.int8),
+            entry_bar=bars(entry_days),
+            exit_bar=bars(exit_days),
+            entry_price=optional([t.entry_price for t in trades]),
+            exit_price=optional([t.exit_price for t in trades]),
+            entry_weight=optional([t.entry_weight for t in trades]),
+            return_pct=optional([t.return_pct for t in trades]),
+            holding_days=np.array(
+                [-1 if t.holding_days is None else t.holding_days for t in trades], dtype=np.int64
+            ),
+            mae_pct=optional([t.mae_pct for t in trades]),
+            mfe_pct=optional([t.mfe_pct for t in trades]),
+            event_trade=np.array([k for k, _ in events], dtype=np.int64),
+            event_bar=bars(event_days),
+            event_weight=optional([e.weight for _, e in events]),
+            event_price=optional([e.price for _, e in events]),
+        )
+        table._trades = trades
+        return table
+
+    @property
+    def is_open(self) -> np.ndarray:
+        return self.exit_bar < 0
+
+    @property
+    def entry_dates(self) -> np.ndarray:
+        """Entry dates as datetime64[D]."""
+        return self.dates[self.entry_bar].astype("datetime64[D]")
+
+    @property
+    def exit_dates(self) -> np.ndarray:
+        """Exit dates as datetime64[D]; NaT while open."""
+        out = self.dates[self.exit_bar].astype("datetime64[D]")
+        out[self.is_open] = np.datetime64("NaT")
+        return out
+
+    def present(self, column: str, rows: np.ndarray | None = None) -> list[float]:
+        """A float column's values (at rows, if given), skipping missing (NaN) ones."""
+        values = getattr(self, column)
+        if rows is not None:
+            values = values[rows]
+        return values[~np.isnan(values)].tolist()
+
+    def take(self, rows: np.ndarray) -> TradeTable:
+        """The trades at rows (indices or a boolean mask), in that order."""
+        rows = np.arange(len(self))[rows]
+        remap = np.full(len(self), -1)
+        remap[rows] = np.arange(len(rows))
+        # Regroup the kept trades' events in the new row order.
+        events = np.flatnonzero(remap[self.event_trade] >= 0)
+        events = events[np.argsort(remap[self.event_trade[events]], kind="stable")]
+        table = TradeTable(
+            dates=self.dates,
+            symbols=self.symbols,
+            symbol_code=self.symbol_code[rows],
+            direction=self.direction[rows],
+            entry_bar=self.entry_bar[rows],
+            exit_bar=self.exit_bar[rows],
+            entry_price=self.entry_price[rows],
+            exit_price=self.exit_price[rows],
+            entry_weight=self.entry_weight[rows],
+            return_pct=self.return_pct[rows],
+            holding_days=self.holding_days[rows],
+            mae_pct=self.mae_pct[rows],
+            mfe_pct=self.mfe_pct[rows],
+            event_trade=remap[self.event_trade[events]],
+            event_bar=self.event_bar[events],
+            event_weight=self.event_weight[events],
+            event_price=self.event_price[events],
+        )
+        if self._trades is not None:
+            table._trades = [self._trades[k] for k in rows.tolist()]
+        return table
+
+    def to_list(self) -> list[Trade]:
+        """The trades as Trade objects (built once, then kept)."""
+        if self._trades is None:
+            self._trades = self._materialize()
+        return self._trades
+
+    def _materialize(self) -> list[Trade]:
+        days = self.dates.astype("datetime64[D]")
+        history: list[list[WeightEvent]] = [[] for _ in range(len(self))]
+        for k, d, w, p in zip(
+            self.event_trade.tolist(), days[self.event_bar].tolist(),
+            self.event_weight.tolist(), self.event_price.tolist(),
+        ):
+            history[k].append(WeightEvent(date=d, weight=w, price=p))
+
+        def optional(values: np.ndarray) -> list[float | None]:
+            return [None if v != v else v for v in values.tolist()]
+
+        open_ = self.is_open.tolist()
+        exit_days = days[self.exit_bar].tolist()
+        return [
+            Trade(
+                symbol=self.symbols[code],
+                direction="long" if direction > 0 else "short",
+                entry_date=entry,
+                entry_price=entry_price,
+                entry_weight=weight,
+                exit_date=None if is_open else exit_,
+                exit_price=None if is_open else exit_price,
+                weight_history=events,
+                return_pct=ret,
+                holding_days=None if held < 0 else held,
+                mae_pct=mae,
+                mfe_pct=mfe,
+            )
+            for code, direction, entry, entry_price, weight, is_open, exit_, exit_price,
+                events, ret, held, mae, mfe in zip(
+                self.symbol_code.tolist(), self.direction.tolist(),
+                days[self.entry_bar].tolist(), self.entry_price.tolist(),
+                self.entry_weight.tolist(), open_, exit_days, self.exit_price.tolist(),
+                history, optional(self.return_pct), self.holding_days.tolist(),
+                optional(self.mae_pct), optional(self.mfe_pct),
+            )
+        ]
+
+    def __len__(self) -> int:
+        return len(self.entry_bar)
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def __getitem__(self, index):
+        return self.to_list()[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (TradeTable, list)):
+            return self.to_list() == list(other)
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+
 class StrategyOutput:
-    """What a Strategy.compute() returns."""
-    weights: pd.DataFrame     # shape: (time x symbols), values in [-1, 1]
-    trades: list[Trade]       # derived from weight transitions
+    """What a Strategy.compute() returns.
+
+    weights: shape (time x symbols), values in [-1, 1].
+    trades: derived from weight transitions.  Built with derive_trades
+    instead, they are derived on first access (then kept), so callers that
+    only read the weights never pay for them.
+    """
+
+    def __init__(
+        self,
+        weights: pd.DataFrame,
+        trades: TradeTable | list[Trade] | None = None,
+        derive_trades: Callable[[], TradeTable] | None = None,
+    ):
+        if trades is None and derive_trades is None:
+            raise ValueError("StrategyOutput needs trades or derive_trades")
+        self.weights = weights
+        self._trades = trades
+        self._derive_trades = derive_trades
+
+    @property
+    def trades(self) -> TradeTable | list[Trade]:
+        if self._trades is None:
+            self._trades = self._derive_trades()
+            self._derive_trades = None
+        return self._trades
+
+    @trades.setter
+    def trades(self, value: TradeTable | list[Trade]) -> None:
+        self._trades = value
+
+    def __repr__(self) -> str:
+        trades = "not derived" if self._trades is None else len(self._trades)
+        return f"StrategyOutput(weights={self.weights.shape}, trades={trades})"
 
 
 @runtime_checkable
@@ -266,6 +850,29 @@ class Strategy(Protocol):
     ) -> StrategyOutput: ...
 
 
+@runtime_checkable
+class WeightsStrategy(Protocol):
+    """Optional Strategy extension: the weight matrix alone, without trades.
+
+    compute_weights() returns exactly compute().weights.  Callers that only
+    combine or compare weights (ensembles, portfolios, leakage checks) use
+    it to skip trade derivation.
+    """
+    def compute(
+        self,
+        symbols: list[str],
+        prices: dict[str, PriceFrame],
+        regime: RegimeSeries | None = None,
+    ) -> StrategyOutput: ...
+
+    def compute_weights(
+        self,
+        symbols: list[str],
+        prices: dict[str, PriceFrame],
+        regime: RegimeSeries | None = None,
+    ) -> pd.DataFrame: ...
+
+
 # =============================================================================
 # Layer 5: Portfolio
 # =============================================================================
@@ -301,7 +908,7 @@ class Portfolio:
 class PortfolioResult:
     """Output of run_portfolio()."""
     equity_curve: pd.Series    # NAV over time
-    trades: list[Trade]
+    trades: TradeTable | list[Trade]
     weights: pd.DataFrame      # the weight matrix that was applied
 
 